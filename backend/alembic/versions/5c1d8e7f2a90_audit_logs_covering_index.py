@@ -0,0 +1,31 @@
+"""Make the per-user audit history index cover the action column
+
+Revision ID: 5c1d8e7f2a90
+Revises: a3f6e9c2d714
+Create Date: 2026-10-16 16:42:31.207114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1d8e7f2a90'
+down_revision: Union[str, None] = 'a3f6e9c2d714'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Same leading columns, so it replaces the old index for history pages too
+    op.create_index('ix_audit_logs_user_id_timestamp_action', 'audit_logs',
+                    ['user_id', sa.text('timestamp DESC'), 'action'])
+    op.drop_index('ix_audit_logs_user_id_timestamp', table_name='audit_logs')
+
+
+def downgrade() -> None:
+    op.create_index('ix_audit_logs_user_id_timestamp', 'audit_logs',
+                    ['user_id', sa.text('timestamp DESC')])
+    op.drop_index('ix_audit_logs_user_id_timestamp_action', table_name='audit_logs')
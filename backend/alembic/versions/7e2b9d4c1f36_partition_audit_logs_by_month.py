@@ -0,0 +1,91 @@
+"""Partition audit_logs by month on timestamp
+
+Revision ID: 7e2b9d4c1f36
+Revises: 5c1d8e7f2a90
+Create Date: 2026-10-16 17:08:54.613290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2b9d4c1f36'
+down_revision: Union[str, None] = '5c1d8e7f2a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Months of partitions created ahead of the current one; after this the
+# maintain_audit_partitions task keeps them ahead
+PARTITION_MONTHS_AHEAD = 3
+
+
+def _create_indexes() -> None:
+    op.create_index('ix_audit_logs_timestamp', 'audit_logs', ['timestamp'])
+    op.create_index('ix_audit_logs_user_id_timestamp_action', 'audit_logs',
+                    ['user_id', sa.text('timestamp DESC'), 'action'])
+
+
+def _move_aside(old_name: str) -> None:
+    op.execute(f"ALTER TABLE audit_logs RENAME TO {old_name}")
+    op.execute(f"ALTER TABLE {old_name} RENAME CONSTRAINT audit_logs_pkey TO {old_name}_pkey")
+    op.drop_index('ix_audit_logs_timestamp', table_name=old_name)
+    op.drop_index('ix_audit_logs_user_id_timestamp_action', table_name=old_name)
+
+
+def upgrade() -> None:
+    _move_aside('audit_logs_unpartitioned')
+    
+    # The partition key has to be part of the primary key
+    op.execute("""
+        CREATE TABLE audit_logs (LIKE audit_logs_unpartitioned INCLUDING DEFAULTS)
+        PARTITION BY RANGE ("timestamp")
+    """)
+    op.create_primary_key('audit_logs_pkey', 'audit_logs', ['id', 'timestamp'])
+    
+    # Monthly partitions (audit_logs_pYYYYMM) from the oldest row through the
+    # months ahead, plus a default partition so an insert never fails
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month date := date_trunc('month', LEAST(
+                (SELECT min("timestamp") FROM audit_logs_unpartitioned),
+                timezone('utc', now())
+            ))::date;
+            last_month date := (date_trunc('month', timezone('utc', now()))
+                                + interval '{PARTITION_MONTHS_AHEAD} months')::date;
+        BEGIN
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE audit_logs_p%s PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                    to_char(month, 'YYYYMM'), month, (month + interval '1 month')::date
+                );
+                month := (month + interval '1 month')::date;
+            END LOOP;
+        END $$;
+    """)
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+    
+    op.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_unpartitioned")
+    op.drop_table('audit_logs_unpartitioned')
+    
+    op.create_foreign_key('audit_logs_user_id_fkey', 'audit_logs', 'users',
+                          ['user_id'], ['id'], ondelete='SET NULL')
+    _create_indexes()
+
+
+def downgrade() -> None:
+    _move_aside('audit_logs_partitioned')
+    
+    op.execute("CREATE TABLE audit_logs (LIKE audit_logs_partitioned INCLUDING DEFAULTS)")
+    op.create_primary_key('audit_logs_pkey', 'audit_logs', ['id'])
+    op.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_partitioned")
+    # Drops the partitions with it
+    op.drop_table('audit_logs_partitioned')
+    
+    op.create_foreign_key('audit_logs_user_id_fkey', 'audit_logs', 'users',
+                          ['user_id'], ['id'], ondelete='SET NULL')
+    _create_indexes()
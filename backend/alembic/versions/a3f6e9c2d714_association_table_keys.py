@@ -0,0 +1,49 @@
+"""Composite primary keys and reverse indexes on association tables
+
+Revision ID: a3f6e9c2d714
+Revises: f7b4d2a9e861
+Create Date: 2026-10-16 15:26:47.819350
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f6e9c2d714'
+down_revision: Union[str, None] = 'f7b4d2a9e861'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, first column, second column)
+ASSOCIATION_TABLES = [
+    ('user_groups', 'user_id', 'group_id'),
+    ('user_roles', 'user_id', 'role_id'),
+    ('group_roles', 'group_id', 'role_id'),
+    ('role_permissions', 'role_id', 'permission_id'),
+]
+
+
+def upgrade() -> None:
+    for table, first, second in ASSOCIATION_TABLES:
+        # Drop incomplete and duplicate links so the primary key can be created
+        op.execute(f"DELETE FROM {table} WHERE {first} IS NULL OR {second} IS NULL")
+        op.execute(f"""
+            DELETE FROM {table} a USING {table} b
+            WHERE a.ctid > b.ctid AND a.{first} = b.{first} AND a.{second} = b.{second}
+        """)
+        op.alter_column(table, first, existing_type=sa.UUID(), nullable=False)
+        op.alter_column(table, second, existing_type=sa.UUID(), nullable=False)
+        op.create_primary_key(f'{table}_pkey', table, [first, second])
+        op.create_index(f'ix_{table}_{second}', table, [second, first])
+
+
+def downgrade() -> None:
+    for table, first, second in ASSOCIATION_TABLES:
+        op.drop_index(f'ix_{table}_{second}', table_name=table)
+        op.drop_constraint(f'{table}_pkey', table, type_='primary')
+        op.alter_column(table, second, existing_type=sa.UUID(), nullable=True)
+        op.alter_column(table, first, existing_type=sa.UUID(), nullable=True)
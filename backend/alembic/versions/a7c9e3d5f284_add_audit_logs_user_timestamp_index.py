@@ -0,0 +1,27 @@
+"""Add composite index for per-user audit history
+
+Revision ID: a7c9e3d5f284
+Revises: f13a5d8e2c69
+Create Date: 2026-10-16 11:20:08.336915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c9e3d5f284'
+down_revision: Union[str, None] = 'f13a5d8e2c69'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_audit_logs_user_id_timestamp', 'audit_logs',
+                    ['user_id', sa.text('timestamp DESC')])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_logs_user_id_timestamp', table_name='audit_logs')
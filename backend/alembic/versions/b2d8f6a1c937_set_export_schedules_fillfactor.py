@@ -0,0 +1,30 @@
+"""Set fillfactor on export_schedules
+
+Revision ID: b2d8f6a1c937
+Revises: a7c9e3d5f284
+Create Date: 2026-10-16 11:58:34.104672
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d8f6a1c937'
+down_revision: Union[str, None] = 'a7c9e3d5f284'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Room on each page for the row versions written by every run (not HOT -
+    # next_run is indexed - but kept on the same page when space allows).
+    # Applies to newly written pages; existing pages pick it up on the next
+    # table rewrite (VACUUM FULL cannot run inside the migration transaction)
+    op.execute("ALTER TABLE export_schedules SET (fillfactor = 85)")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE export_schedules RESET (fillfactor)")
@@ -0,0 +1,44 @@
+"""Store audit log details as JSONB and bound user_agent
+
+Revision ID: c6e1a4b9d053
+Revises: b2d8f6a1c937
+Create Date: 2026-10-16 12:31:05.771942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e1a4b9d053'
+down_revision: Union[str, None] = 'b2d8f6a1c937'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('audit_logs', 'details',
+               existing_type=sa.Text(),
+               type_=postgresql.JSONB(astext_type=sa.Text()),
+               existing_nullable=True,
+               postgresql_using='details::jsonb')
+    op.alter_column('audit_logs', 'user_agent',
+               existing_type=sa.Text(),
+               type_=sa.String(length=512),
+               existing_nullable=True,
+               postgresql_using='left(user_agent, 512)')
+
+
+def downgrade() -> None:
+    op.alter_column('audit_logs', 'user_agent',
+               existing_type=sa.String(length=512),
+               type_=sa.Text(),
+               existing_nullable=True)
+    op.alter_column('audit_logs', 'details',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               type_=sa.Text(),
+               existing_nullable=True,
+               postgresql_using='details::text')
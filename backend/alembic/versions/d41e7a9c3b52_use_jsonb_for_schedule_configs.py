@@ -0,0 +1,48 @@
+"""Use JSONB for schedule configuration columns
+
+Revision ID: d41e7a9c3b52
+Revises: c50b7fbad72f
+Create Date: 2026-10-16 09:12:41.218503
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41e7a9c3b52'
+down_revision: Union[str, None] = 'c50b7fbad72f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, nullable)
+JSONB_COLUMNS = [
+    ('export_schedules', 'schedule_config', False),
+    ('export_schedules', 'distribution_config', False),
+    ('export_schedules', 'filter_config', True),
+    ('export_schedules', 'export_config', True),
+    ('schedule_executions', 'distribution_results', True),
+    ('distribution_templates', 'config', False),
+]
+
+
+def upgrade() -> None:
+    for table, column, nullable in JSONB_COLUMNS:
+        op.alter_column(table, column,
+                   existing_type=sa.JSON(),
+                   type_=postgresql.JSONB(astext_type=sa.Text()),
+                   existing_nullable=nullable,
+                   postgresql_using=f'{column}::jsonb')
+
+
+def downgrade() -> None:
+    for table, column, nullable in JSONB_COLUMNS:
+        op.alter_column(table, column,
+                   existing_type=postgresql.JSONB(astext_type=sa.Text()),
+                   type_=sa.JSON(),
+                   existing_nullable=nullable,
+                   postgresql_using=f'{column}::json')
@@ -0,0 +1,34 @@
+"""Add schedule_secrets table for encrypted distribution credentials
+
+Revision ID: d94f2b7e6a18
+Revises: c6e1a4b9d053
+Create Date: 2026-10-16 13:47:22.590418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd94f2b7e6a18'
+down_revision: Union[str, None] = 'c6e1a4b9d053'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Credentials still inline in distribution_config keep working and move
+    # here the next time the schedule's distribution settings are saved
+    op.create_table('schedule_secrets',
+        sa.Column('schedule_id', sa.UUID(), nullable=False),
+        sa.Column('secret', sa.Text(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['schedule_id'], ['export_schedules.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('schedule_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('schedule_secrets')
@@ -0,0 +1,31 @@
+"""Add trigram indexes on users.username and users.email
+
+Revision ID: e5a3c8f1b472
+Revises: d94f2b7e6a18
+Create Date: 2026-10-16 14:15:39.028113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a3c8f1b472'
+down_revision: Union[str, None] = 'd94f2b7e6a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_users_username_trgm', 'users', ['username'],
+                    postgresql_using='gin', postgresql_ops={'username': 'gin_trgm_ops'})
+    op.create_index('ix_users_email_trgm', 'users', ['email'],
+                    postgresql_using='gin', postgresql_ops={'email': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_email_trgm', table_name='users')
+    op.drop_index('ix_users_username_trgm', table_name='users')
@@ -0,0 +1,51 @@
+"""Store export enum values instead of member names
+
+Revision ID: e8b2c4f61a07
+Revises: d41e7a9c3b52
+Create Date: 2026-10-16 10:03:17.554129
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b2c4f61a07'
+down_revision: Union[str, None] = 'd41e7a9c3b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ENUM_LABELS = {
+    'exportstatus': ['pending', 'processing', 'completed', 'failed', 'cancelled'],
+    'exportformat': ['csv', 'excel', 'pdf', 'json'],
+}
+
+
+def _rename_labels(type_name: str, labels, to_upper: bool) -> None:
+    for label in labels:
+        old, new = (label, label.upper()) if to_upper else (label.upper(), label)
+        # The exports table is created from model metadata, so the type may not exist yet
+        op.execute(f"""
+            DO $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM pg_enum e JOIN pg_type t ON t.oid = e.enumtypid
+                    WHERE t.typname = '{type_name}' AND e.enumlabel = '{old}'
+                ) THEN
+                    ALTER TYPE {type_name} RENAME VALUE '{old}' TO '{new}';
+                END IF;
+            END $$;
+        """)
+
+
+def upgrade() -> None:
+    for type_name, labels in ENUM_LABELS.items():
+        _rename_labels(type_name, labels, to_upper=False)
+
+
+def downgrade() -> None:
+    for type_name, labels in ENUM_LABELS.items():
+        _rename_labels(type_name, labels, to_upper=True)
@@ -0,0 +1,32 @@
+"""Add partial index for due schedules
+
+Revision ID: f13a5d8e2c69
+Revises: e8b2c4f61a07
+Create Date: 2026-10-16 10:41:52.907316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f13a5d8e2c69'
+down_revision: Union[str, None] = 'e8b2c4f61a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Only active, unpaused schedules are scanned by the scheduler. The partial
+    # index replaces the full one on next_run, which nothing else queries, so
+    # each run maintains one B-tree on the column instead of two
+    op.create_index('ix_export_schedules_due', 'export_schedules', ['next_run'],
+                    postgresql_where=sa.text('is_active AND NOT is_paused'))
+    op.drop_index('ix_export_schedules_next_run', table_name='export_schedules')
+
+
+def downgrade() -> None:
+    op.create_index('ix_export_schedules_next_run', 'export_schedules', ['next_run'])
+    op.drop_index('ix_export_schedules_due', table_name='export_schedules')
@@ -0,0 +1,47 @@
+"""Server-side timestamp defaults for user and audit tables
+
+Revision ID: f7b4d2a9e861
+Revises: e5a3c8f1b472
+Create Date: 2026-10-16 14:52:10.463287
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7b4d2a9e861'
+down_revision: Union[str, None] = 'e5a3c8f1b472'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, nullable) - all naive timestamp columns holding UTC
+TIMESTAMP_COLUMNS = [
+    ('users', 'created_at', False),
+    ('users', 'updated_at', True),
+    ('groups', 'created_at', False),
+    ('groups', 'updated_at', True),
+    ('roles', 'created_at', False),
+    ('roles', 'updated_at', True),
+    ('permissions', 'created_at', False),
+    ('audit_logs', 'timestamp', False),
+]
+
+
+def upgrade() -> None:
+    for table, column, nullable in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column,
+                   existing_type=sa.DateTime(),
+                   existing_nullable=nullable,
+                   server_default=sa.text("timezone('utc', now())"))
+
+
+def downgrade() -> None:
+    for table, column, nullable in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column,
+                   existing_type=sa.DateTime(),
+                   existing_nullable=nullable,
+                   server_default=None)
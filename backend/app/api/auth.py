@@ -4,9 +4,9 @@ Handles user login, registration, and token management
 """
 
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -16,6 +16,7 @@ from passlib.context import CryptContext
 from app.core.config import settings
 from app.core.database import get_db
 from app.schemas.auth import Token, TokenData, User as UserSchema, UserCreate, UserInDB
+from app.schemas.user import AuditLogEntry
 from app.services.user_service import UserService
 from app.models.user import User
 
@@ -189,6 +190,20 @@ async def read_users_me(
     return user_info
 
 
+@router.get("/me/audit-logs", response_model=List[AuditLogEntry])
+async def read_my_audit_logs(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the current user's audit history, newest first
+    """
+    user_service = UserService(db)
+    return await user_service.list_audit_logs(current_user.id, skip=skip, limit=limit)
+
+
 @router.post("/refresh", response_model=Token)
 async def refresh_token(current_user: User = Depends(get_current_user)):
     """
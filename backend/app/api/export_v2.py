@@ -25,7 +25,8 @@ from app.schemas.export import (
     ExportResponse, 
     ExportListResponse,
     ExportStatus,
-    ExportFormat
+    ExportFormat,
+    EXPORT_LIST_ADAPTER
 )
 from app.services.export_service import ExportService
 from app.services.security_service import SecurityService
@@ -136,23 +137,26 @@ async def list_exports(
     result = await db.execute(query)
     exports = result.scalars().all()
     
-    export_responses = []
-    for export in exports:
-        export_responses.append(ExportResponse(
-            export_id=export.id,
-            status=ExportStatus(export.status),
-            format=ExportFormat(export.format),
-            created_at=export.created_at,
-            started_at=export.started_at,
-            completed_at=export.completed_at,
-            expires_at=export.expires_at,
-            download_url=f"/api/v1/export/{export.id}/download" if export.status == "completed" else None,
-            file_size=export.file_size,
-            error_message=export.error_message,
-            progress=export.progress
-        ))
-    
-    return ExportListResponse(
+    # Validate the whole page in one pass instead of constructing models row by row
+    export_responses = EXPORT_LIST_ADAPTER.validate_python([
+        {
+            "export_id": str(export.id),
+            "status": export.status,
+            "format": export.format,
+            "created_at": export.created_at,
+            "started_at": export.started_at,
+            "completed_at": export.completed_at,
+            "expires_at": export.expires_at,
+            "download_url": f"/api/v1/export/{export.id}/download" if export.status == "completed" else None,
+            "file_size": export.file_size,
+            "error_message": export.error_message,
+            "progress": export.progress
+        }
+        for export in exports
+    ])
+    
+    # Items are already validated, so skip re-validating them on the wrapper
+    return ExportListResponse.model_construct(
         exports=export_responses,
         total=total,
         skip=skip,
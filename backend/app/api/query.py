@@ -12,7 +12,7 @@ import asyncio
 
 from app.core.database import get_db
 from app.models import Field, DataTable, DataSource, FieldRelationship, User
-from app.schemas.report import QueryRequest, QueryResponse
+from app.schemas.report import QueryRequest, QueryResponse, QueryResponseColumnar
 from app.api.auth import get_current_user
 from app.services.query_builder import QueryBuilder
 
@@ -26,36 +26,39 @@ class QueryExecutor:
         self.db = db
         self.query_builder = QueryBuilder(db)
     
+    async def _run_query(self, request: QueryRequest):
+        """Build and run a query, returning column names, raw row tuples and counts"""
+        start_time = datetime.utcnow()
+        
+        # Build SQL query from request
+        sql_query = await self.query_builder.build_query(request)
+        
+        # Execute query (sql_query is already a Select object)
+        result = await self.db.execute(sql_query)
+        columns = list(result.keys())
+        rows = result.fetchall()
+        
+        # Calculate execution time
+        duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        
+        # Get total count (without limit)
+        count_query = await self.query_builder.build_count_query(request)
+        count_result = await self.db.execute(count_query)
+        total_rows = count_result.scalar() or 0
+        
+        return sql_query, columns, rows, total_rows, start_time, duration_ms
+    
     async def execute_query(
         self,
         request: QueryRequest,
         user: User
     ) -> QueryResponse:
         """Execute a query and return results"""
-        start_time = datetime.utcnow()
-        
         try:
-            # Build SQL query from request
-            sql_query = await self.query_builder.build_query(request)
-            
-            # Execute query (sql_query is already a Select object)
-            result = await self.db.execute(sql_query)
-            rows = result.fetchall()
+            sql_query, columns, rows, total_rows, start_time, duration_ms = await self._run_query(request)
             
             # Convert rows to dict format
-            data = []
-            if rows:
-                columns = result.keys()
-                for row in rows:
-                    data.append(dict(zip(columns, row)))
-            
-            # Calculate execution time
-            duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            
-            # Get total count (without limit)
-            count_query = await self.query_builder.build_count_query(request)
-            count_result = await self.db.execute(count_query)
-            total_rows = count_result.scalar() or 0
+            data = [dict(zip(columns, row)) for row in rows]
             
             return QueryResponse(
                 data=data,
@@ -70,6 +73,31 @@ class QueryExecutor:
                 status_code=500,
                 detail=f"Query execution failed: {str(e)}"
             )
+    
+    async def execute_query_columnar(
+        self,
+        request: QueryRequest,
+        user: User
+    ) -> QueryResponseColumnar:
+        """Execute a query and return results as a column header plus row arrays"""
+        try:
+            sql_query, columns, rows, total_rows, start_time, duration_ms = await self._run_query(request)
+            
+            # Row tuples are used as-is - no per-row dict or key hashing
+            return QueryResponseColumnar.model_construct(
+                columns=columns,
+                rows=[list(row) for row in rows],
+                total_rows=total_rows,
+                executed_at=start_time,
+                duration_ms=duration_ms,
+                query=str(sql_query) if user.is_superuser else None
+            )
+            
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Query execution failed: {str(e)}"
+            )
 
 
 @router.post("/execute", response_model=QueryResponse)
@@ -83,6 +111,17 @@ async def execute_query(
     return await executor.execute_query(request, current_user)
 
 
+@router.post("/execute/columnar", response_model=QueryResponseColumnar)
+async def execute_query_columnar(
+    request: QueryRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Execute a query and return results in columnar form (shared header, row arrays)"""
+    executor = QueryExecutor(db)
+    return await executor.execute_query_columnar(request, current_user)
+
+
 @router.post("/preview", response_model=QueryResponse)
 async def preview_query(
     request: QueryRequest,
@@ -68,6 +68,14 @@ async def create_schedule(
             detail="Schedule limit reached. Maximum 10 schedules per user."
         )
     
+    # Credentials are stored encrypted in schedule_secrets, not on the schedule row
+    distribution_config, distribution_secrets = credential_service.split_distribution_secrets(
+        request.distribution_config.model_dump() if request.distribution_config else {}
+    )
+    export_config, export_secrets = credential_service.split_export_secrets(
+        request.export_config.model_dump()
+    )
+    
     # Create schedule
     schedule = ExportSchedule(
         report_id=request.report_id,
@@ -82,9 +90,9 @@ async def create_schedule(
             "start_date": request.schedule_config.start_date.isoformat() if request.schedule_config.start_date else None,
             "end_date": request.schedule_config.end_date.isoformat() if request.schedule_config.end_date else None
         },
-        distribution_config=request.distribution_config.dict() if request.distribution_config else {},
+        distribution_config=distribution_config,
         filter_config=request.filter_config,
-        export_config=request.export_config.dict(),
+        export_config=export_config,
         is_active=request.is_active,
         is_paused=False
     )
@@ -93,6 +101,8 @@ async def create_schedule(
     schedule.next_run = schedule.calculate_next_run()
     
     db.add(schedule)
+    await db.flush()
+    await credential_service.store_schedule_secrets(db, schedule.id, distribution_secrets, export_secrets)
     await db.commit()
     await db.refresh(schedule)
     
@@ -101,6 +111,7 @@ async def create_schedule(
     response_dict['distribution_config'] = credential_service.sanitize_distribution_config(
         response_dict.get('distribution_config', {})
     )
+    response_dict['export_config'] = credential_service.sanitize_export_config(response_dict.get('export_config'))
     return ScheduleResponse(**response_dict)
 
 
@@ -149,6 +160,7 @@ async def list_schedules(
         sched_dict['distribution_config'] = credential_service.sanitize_distribution_config(
             sched_dict.get('distribution_config', {})
         )
+        sched_dict['export_config'] = credential_service.sanitize_export_config(sched_dict.get('export_config'))
         sanitized_schedules.append(ScheduleResponse(**sched_dict))
     
     return ScheduleListResponse(
@@ -180,6 +192,7 @@ async def get_schedule(
     response_dict['distribution_config'] = credential_service.sanitize_distribution_config(
         response_dict.get('distribution_config', {})
     )
+    response_dict['export_config'] = credential_service.sanitize_export_config(response_dict.get('export_config'))
     return ScheduleResponse(**response_dict)
 
 
@@ -215,12 +228,20 @@ async def update_schedule(
         }
         # Recalculate next run
         schedule.next_run = schedule.calculate_next_run()
+    distribution_secrets = export_secrets = None
     if request.distribution_config is not None:
-        schedule.distribution_config = request.distribution_config.dict()
+        schedule.distribution_config, distribution_secrets = credential_service.split_distribution_secrets(
+            request.distribution_config.model_dump()
+        )
     if request.filter_config is not None:
         schedule.filter_config = request.filter_config
     if request.export_config is not None:
-        schedule.export_config = request.export_config.dict()
+        schedule.export_config, export_secrets = credential_service.split_export_secrets(
+            request.export_config.model_dump()
+        )
+    if distribution_secrets is not None or export_secrets is not None:
+        # Only the parts sent in this request are replaced
+        await credential_service.store_schedule_secrets(db, schedule.id, distribution_secrets, export_secrets)
     if request.is_active is not None:
         schedule.is_active = request.is_active
     if request.is_paused is not None:
@@ -236,6 +257,7 @@ async def update_schedule(
     response_dict['distribution_config'] = credential_service.sanitize_distribution_config(
         response_dict.get('distribution_config', {})
     )
+    response_dict['export_config'] = credential_service.sanitize_export_config(response_dict.get('export_config'))
     return ScheduleResponse(**response_dict)
 
 
@@ -286,6 +308,7 @@ async def pause_schedule(
     response_dict['distribution_config'] = credential_service.sanitize_distribution_config(
         response_dict.get('distribution_config', {})
     )
+    response_dict['export_config'] = credential_service.sanitize_export_config(response_dict.get('export_config'))
     return ScheduleResponse(**response_dict)
 
 
@@ -319,6 +342,7 @@ async def resume_schedule(
     response_dict['distribution_config'] = credential_service.sanitize_distribution_config(
         response_dict.get('distribution_config', {})
     )
+    response_dict['export_config'] = credential_service.sanitize_export_config(response_dict.get('export_config'))
     return ScheduleResponse(**response_dict)
 
 
@@ -447,8 +471,8 @@ async def test_schedule_config(
     
     # Run the test asynchronously
     result = test_schedule_configuration(
-        request.schedule_config.dict(),
-        request.distribution_config.dict()
+        {**request.schedule_config.model_dump(), "cron": request.schedule_config.to_cron_expression()},
+        request.distribution_config.model_dump()
     )
     
     return ScheduleTestResponse(**result)
@@ -46,6 +46,11 @@ celery_app.conf.update(
             "schedule": crontab(minute='*/5'),  # Every 5 minutes
             "options": {"queue": "schedules"}
         },
+        # Keep audit log partitions created ahead and drop expired ones daily
+        "maintain-audit-partitions": {
+            "task": "app.tasks.audit_tasks.maintain_audit_partitions",
+            "schedule": crontab(hour=3, minute=15),  # Daily at 03:15 UTC
+        },
     },
     # Task routing
     task_routes={
@@ -22,6 +22,7 @@ class Settings(BaseSettings):
     VERSION: str = "0.29.0"
     API_PREFIX: str = "/api/v1"
     DEBUG: bool = False
+    ENVIRONMENT: str = "development"  # dev/staging/prod, tagged on audit documents
 
     # CORS settings
     ALLOWED_ORIGINS: List[str] = [
@@ -94,6 +95,16 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"  # or "text"
 
+    # Audit logging
+    AUDIT_BULK_SIZE: int = 500  # Max rows per bulk INSERT from the audit writer
+    AUDIT_FLUSH_MS: int = 500  # Max time an entry waits in the buffer
+    AUDIT_QUEUE_MAX_SIZE: int = 10000  # When full, rows are written inline at the caller's commit
+    AUDIT_RETENTION_DAYS: int = 90  # Whole monthly partitions older than this are dropped
+    AUDIT_PARTITION_MONTHS_AHEAD: int = 3  # Monthly partitions kept created in advance
+    AUDIT_LOG_SAMPLE_RATE: float = 1.0  # Fraction of audit events echoed to the application log
+    ELASTICSEARCH_BULK_BATCH_SIZE: int = 1000  # Documents per bulk request
+    ELASTICSEARCH_BULK_MAX_BYTES: int = 10 * 1024 * 1024  # 10MB per bulk request
+
     # Email settings (for notifications and report distribution)
     MAIL_USERNAME: Optional[str] = None
     MAIL_PASSWORD: Optional[str] = None
@@ -111,6 +122,7 @@ class Settings(BaseSettings):
     MAIL_MAX_PER_HOUR_USER: int = 50  # Per-user rate limit
     MAIL_MAX_RECIPIENTS: int = 50  # Max recipients per email
     MAIL_MAX_ATTACHMENT_SIZE: int = 10 * 1024 * 1024  # 10MB max for direct attachment
+    MAIL_MAX_CONCURRENT_SENDS: int = 5  # SMTP sessions open at once per process (provider caps)
     
     # Email retry settings
     MAIL_MAX_RETRIES: int = 5
@@ -0,0 +1,61 @@
+"""
+Process-local cache for parsed cron expressions
+Schedules are re-evaluated on every scheduler tick, so parsing is done once
+per (cron_expression, timezone) pair and reused
+"""
+
+import copy
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from croniter import croniter
+
+
+def get_timezone(timezone_str: str) -> ZoneInfo:
+    """Return the timezone for a name (ZoneInfo caches instances per key itself)"""
+    return ZoneInfo(timezone_str)
+
+
+@lru_cache(maxsize=4096)
+def _parsed_template(cron_expr: str, timezone_str: str) -> croniter:
+    """Parse and validate a cron expression once"""
+    return croniter(cron_expr, datetime.now(get_timezone(timezone_str)))
+
+
+@lru_cache(maxsize=512)
+def is_valid(cron_expr: str) -> bool:
+    """Syntax-check a cron expression (results are cached per expression)"""
+    try:
+        croniter(cron_expr)
+    except Exception:
+        return False
+    return True
+
+
+def parsed(cron_expr: str, timezone_str: str = "UTC", start_time: Optional[datetime] = None) -> croniter:
+    """
+    Get an iterator for a cron expression positioned at start_time
+
+    croniter instances are stateful (get_next advances them), so callers
+    receive a shallow copy of the cached template rather than the template itself.
+
+    Raises:
+        ValueError/KeyError: If the expression or timezone is invalid
+    """
+    tz = get_timezone(timezone_str)
+    if start_time is None:
+        start_time = datetime.now(tz)
+    elif start_time.tzinfo is None:
+        start_time = start_time.replace(tzinfo=tz)
+
+    cron = copy.copy(_parsed_template(cron_expr, timezone_str))
+    cron.set_current(start_time, force=True)
+    return cron
+
+
+def clear_cache() -> None:
+    """Drop all cached expressions"""
+    _parsed_template.cache_clear()
+    is_valid.cache_clear()
@@ -3,13 +3,25 @@ Database configuration and session management
 Using SQLAlchemy with async support
 """
 
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
+import orjson
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
+
+# JSON/JSONB columns (audit details, schedule and export configs) are encoded
+# once with orjson on the way in and decoded with it on the way out
+def json_serializer(value: Any) -> str:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+json_deserializer = orjson.loads
+
 # Create async engine
 if settings.DEBUG:
     # Use NullPool in debug mode (no pooling)
@@ -19,6 +31,10 @@ if settings.DEBUG:
         future=True,
         pool_pre_ping=True,
         poolclass=NullPool,
+        insertmanyvalues_page_size=1000,
+        query_cache_size=1200,
+        json_serializer=json_serializer,
+        json_deserializer=json_deserializer,
     )
 else:
     # Use default pool in production
@@ -29,6 +45,13 @@ else:
         pool_size=20,
         max_overflow=40,
         pool_pre_ping=True,
+        # executemany INSERTs are batched into multi-VALUES statements of this size
+        insertmanyvalues_page_size=1000,
+        # Compiled statement cache; dynamically filtered queries (e.g. audit
+        # log search) cache one entry per filter combination
+        query_cache_size=1200,
+        json_serializer=json_serializer,
+        json_deserializer=json_deserializer,
     )
 
 # Create async session factory
@@ -40,9 +63,39 @@ AsyncSessionLocal = async_sessionmaker(
     autocommit=False,
 )
 
+
+def create_seed_engine():
+    """
+    Engine for bulk load scripts such as app.seed_data
+    A small fixed pool (the seed runs one transaction at a time) and a larger
+    asyncpg prepared statement cache, so the seed's repeated INSERTs are
+    parsed once per connection instead of once per execute
+    """
+    url = make_url(str(settings.DATABASE_URL))
+    connect_args = {}
+    if url.get_driver_name() == "asyncpg":
+        url = url.update_query_dict({"prepared_statement_cache_size": "2048"})
+        connect_args["statement_cache_size"] = 2048
+    return create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        pool_size=10,
+        max_overflow=0,
+        pool_pre_ping=True,
+        connect_args=connect_args,
+        insertmanyvalues_page_size=1000,
+        json_serializer=json_serializer,
+        json_deserializer=json_deserializer,
+    )
+
+
 # Create declarative base for models
 Base = declarative_base()
 
+# Server-side "current UTC time" for naive DateTime columns
+# (timezone-aware columns use func.now() directly)
+UTC_NOW = text("timezone('utc', now())")
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -0,0 +1,15 @@
+"""
+Input validation rules shared by the request schemas and services
+"""
+
+import re
+
+# Local part, a single '@' and a dotted domain ending in a 2+ letter TLD.
+# Deliberately looser than email-validator, which rejects the .local
+# domains used by internal accounts (e.g. admin@boe-system.local)
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+
+def is_valid_email(address: str) -> bool:
+    """Syntax-check an email address (no DNS lookups)"""
+    return _EMAIL_RE.fullmatch(address) is not None
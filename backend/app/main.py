@@ -6,13 +6,15 @@ Main application entry point
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy import text
 import structlog
 
 from app.core.config import settings
 from app.core.database import engine, Base
 from app.api import auth, reports, query, export, schedule, fields
+from app.services.audit_service import audit_writer
+from app.services.distribution_service import DistributionService
 
 # Configure structured logging
 structlog.configure(
@@ -49,10 +51,15 @@ async def lifespan(app: FastAPI):
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
     
+    audit_writer.start()
+    DistributionService.open_http_client()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down BOE Backend")
+    await audit_writer.stop()
+    await DistributionService.close_http_client()
     await engine.dispose()
 
 
@@ -64,6 +71,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_PREFIX}/openapi.json",
     docs_url=f"{settings.API_PREFIX}/docs",
     redoc_url=f"{settings.API_PREFIX}/redoc",
+    default_response_class=ORJSONResponse,  # datetime-heavy list responses
     lifespan=lifespan
 )
 
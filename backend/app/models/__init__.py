@@ -9,7 +9,7 @@ from app.models.field import (
     DecodeTable, FieldType, AggregationType
 )
 from app.models.schedule import (
-    ExportSchedule, ScheduleExecution, DistributionTemplate
+    ExportSchedule, ScheduleSecret, ScheduleExecution, DistributionTemplate
 )
 from app.models.export import Export, ExportStatus, ExportFormat
 
@@ -25,7 +25,7 @@ __all__ = [
     'DecodeTable', 'FieldType', 'AggregationType',
     
     # Schedule models
-    'ExportSchedule', 'ScheduleExecution', 'DistributionTemplate',
+    'ExportSchedule', 'ScheduleSecret', 'ScheduleExecution', 'DistributionTemplate',
     
     # Export models
     'Export', 'ExportStatus', 'ExportFormat'
@@ -9,9 +9,9 @@ from typing import Optional, Dict, Any
 
 from sqlalchemy import (
     Column, String, ForeignKey, DateTime, 
-    Enum as SQLEnum, Text, BigInteger, JSON
+    Enum as SQLEnum, Text, BigInteger
 )
-from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, JSONB
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -34,6 +34,11 @@ class ExportFormat(str, Enum):
     JSON = "json"
 
 
+def _enum_values(enum_cls) -> list:
+    """Persist enum values (e.g. 'pending') rather than member names"""
+    return [member.value for member in enum_cls]
+
+
 class Export(Base):
     """Export job tracking model"""
     __tablename__ = "exports"
@@ -43,11 +48,18 @@ class Export(Base):
     user_id = Column(PGUUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
     # Export configuration
-    format = Column(SQLEnum(ExportFormat), nullable=False)
-    parameters = Column(JSON, nullable=True)  # Stores filters, options, etc.
+    format = Column(
+        SQLEnum(ExportFormat, name="exportformat", native_enum=True, values_callable=_enum_values),
+        nullable=False
+    )
+    parameters = Column(JSONB, nullable=True)  # Stores filters, options, etc.
     
     # Status tracking
-    status = Column(SQLEnum(ExportStatus), default=ExportStatus.PENDING, nullable=False)
+    status = Column(
+        SQLEnum(ExportStatus, name="exportstatus", native_enum=True, values_callable=_enum_values),
+        default=ExportStatus.PENDING,
+        nullable=False
+    )
     task_id = Column(String(255), nullable=True)  # Celery task ID
     
     # File information
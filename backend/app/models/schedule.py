@@ -2,21 +2,30 @@
 Schedule models for the export scheduling system
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any, List
 import uuid
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, JSON, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, ForeignKey, Text, Index, text, func, update, Update
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
-from croniter import croniter
-import pytz
 
+from app.core import cron_cache
 from app.core.database import Base
 
 
 class ExportSchedule(Base):
     """Model for scheduled export configurations"""
     __tablename__ = "export_schedules"
+    __table_args__ = (
+        # Partial index covering only the schedules the scheduler scan can pick up
+        Index("ix_export_schedules_due", "next_run", postgresql_where=text("is_active AND NOT is_paused")),
+        # Rows are rewritten on every run (last_run/next_run/counters). These
+        # updates are not HOT (next_run is indexed), but the page headroom lets
+        # the new row version usually land on the same heap page instead of
+        # spreading the table across freshly extended pages
+        {"postgresql_with": {"fillfactor": 85}},
+    )
+    __mapper_args__ = {"eager_defaults": True}  # fetch server-side timestamps on flush
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     report_id = Column(UUID(as_uuid=True), ForeignKey("reports.id", ondelete="CASCADE"), nullable=False)
@@ -27,10 +36,10 @@ class ExportSchedule(Base):
     description = Column(Text, nullable=True)
     
     # Schedule configuration
-    schedule_config = Column(JSON, nullable=False)  # {cron: "0 0 * * *", timezone: "UTC"}
-    distribution_config = Column(JSON, nullable=False)  # {local: {path: "/exports"}, email: {...}}
-    filter_config = Column(JSON, nullable=True)  # Report filters/parameters
-    export_config = Column(JSON, nullable=True)  # {format: "excel", options: {...}}
+    schedule_config = Column(JSONB, nullable=False)  # {cron: "0 0 * * *", timezone: "UTC"}
+    distribution_config = Column(JSONB, nullable=False)  # {local: {path: "/exports"}, email: {...}}
+    filter_config = Column(JSONB, nullable=True)  # Report filters/parameters
+    export_config = Column(JSONB, nullable=True)  # {format: "excel", options: {...}}
     
     # Status fields
     is_active = Column(Boolean, default=True, nullable=False)
@@ -44,15 +53,25 @@ class ExportSchedule(Base):
     failure_count = Column(Integer, default=0, nullable=False)
     
     # Metadata
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime(timezone=True), nullable=True, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=True, onupdate=func.now())
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     
     # Relationships
     report = relationship("Report", foreign_keys=[report_id])
     user = relationship("User", foreign_keys=[user_id])
     creator = relationship("User", foreign_keys=[created_by])
-    executions = relationship("ScheduleExecution", back_populates="schedule", cascade="all, delete-orphan")
+    # Unbounded history - callers must opt into loading it explicitly (selectinload).
+    # passive_deletes leaves child cleanup to the FK's ON DELETE CASCADE.
+    executions = relationship(
+        "ScheduleExecution", back_populates="schedule", cascade="all, delete-orphan",
+        lazy="raise_on_sql", passive_deletes=True
+    )
+    # Distribution credentials are only needed at send time - never loaded implicitly
+    secret = relationship(
+        "ScheduleSecret", uselist=False, cascade="all, delete-orphan",
+        lazy="noload", passive_deletes=True
+    )
     
     def calculate_next_run(self, from_time: Optional[datetime] = None) -> Optional[datetime]:
         """Calculate the next run time based on cron expression"""
@@ -66,14 +85,7 @@ class ExportSchedule(Base):
             return None
             
         try:
-            tz = pytz.timezone(timezone_str)
-            base_time = from_time or datetime.now(tz)
-            
-            # Convert to timezone-aware if needed
-            if base_time.tzinfo is None:
-                base_time = tz.localize(base_time)
-            
-            cron = croniter(cron_expr, base_time)
+            cron = cron_cache.parsed(cron_expr, timezone_str, from_time)
             next_time = cron.get_next(datetime)
             
             return next_time
@@ -89,20 +101,26 @@ class ExportSchedule(Base):
             return False
             
         # Add a small buffer (1 minute) to handle timing discrepancies
-        return datetime.now(pytz.UTC) >= self.next_run - timedelta(minutes=1)
+        return datetime.now(timezone.utc) >= self.next_run - timedelta(minutes=1)
     
-    def update_after_execution(self, success: bool):
-        """Update schedule statistics after execution"""
-        self.last_run = datetime.now(pytz.UTC)
-        self.run_count += 1
-        
-        if success:
-            self.success_count += 1
-        else:
-            self.failure_count += 1
+    def record_execution(self, success: bool) -> Update:
+        """
+        Build the UPDATE recording an execution
+        Counters are incremented in SQL so concurrent runs don't lose updates
+        """
+        last_run = datetime.now(timezone.utc)
         
-        # Calculate next run
-        self.next_run = self.calculate_next_run(from_time=self.last_run)
+        return (
+            update(ExportSchedule)
+            .where(ExportSchedule.id == self.id)
+            .values(
+                last_run=last_run,
+                next_run=self.calculate_next_run(from_time=last_run),
+                run_count=ExportSchedule.run_count + 1,
+                success_count=ExportSchedule.success_count + (1 if success else 0),
+                failure_count=ExportSchedule.failure_count + (0 if success else 1),
+            )
+        )
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for API responses"""
@@ -129,6 +147,17 @@ class ExportSchedule(Base):
         }
 
 
+class ScheduleSecret(Base):
+    """Encrypted distribution credentials, kept off the frequently scanned export_schedules row"""
+    __tablename__ = "schedule_secrets"
+    
+    schedule_id = Column(
+        UUID(as_uuid=True), ForeignKey("export_schedules.id", ondelete="CASCADE"), primary_key=True
+    )
+    secret = Column(Text, nullable=False)  # Output of credential_service.encrypt_credentials
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
 class ScheduleExecution(Base):
     """Model for tracking schedule execution history"""
     __tablename__ = "schedule_executions"
@@ -145,7 +174,7 @@ class ScheduleExecution(Base):
     retry_count = Column(Integer, default=0, nullable=False)
     
     # Distribution results
-    distribution_results = Column(JSON, nullable=True)  # {channel: {status, message, details}}
+    distribution_results = Column(JSONB, nullable=True)  # {channel: {status, message, details}}
     
     # Celery task tracking
     task_id = Column(String, nullable=True)
@@ -203,15 +232,16 @@ class ScheduleExecution(Base):
 class DistributionTemplate(Base):
     """Model for reusable distribution configurations"""
     __tablename__ = "distribution_templates"
+    __mapper_args__ = {"eager_defaults": True}  # fetch server-side timestamps on flush
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     name = Column(String, nullable=False)
     type = Column(String(50), nullable=False)  # email, sftp, webhook, cloud, local
-    config = Column(JSON, nullable=False)  # Type-specific configuration
+    config = Column(JSONB, nullable=False)  # Type-specific configuration
     is_default = Column(Boolean, default=False, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime(timezone=True), nullable=True, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=True, onupdate=func.now())
     
     # Relationships
     user = relationship("User", foreign_keys=[user_id])
@@ -2,46 +2,59 @@
 User and authentication related models
 """
 
-from datetime import datetime
 from uuid import uuid4
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Table, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import DDL, Column, String, Boolean, DateTime, ForeignKey, Table, Text, Index, event
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
-from app.core.database import Base
+from app.core.database import Base, UTC_NOW
 
 
 # Association tables for many-to-many relationships
+# The composite primary key serves lookups from the first column; the extra
+# index covers the reverse direction so both sides get index-only scans
 user_groups = Table(
     'user_groups',
     Base.metadata,
-    Column('user_id', UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE')),
-    Column('group_id', UUID(as_uuid=True), ForeignKey('groups.id', ondelete='CASCADE'))
+    Column('user_id', UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+    Column('group_id', UUID(as_uuid=True), ForeignKey('groups.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_user_groups_group_id', 'group_id', 'user_id')
 )
 
 user_roles = Table(
     'user_roles',
     Base.metadata,
-    Column('user_id', UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE')),
-    Column('role_id', UUID(as_uuid=True), ForeignKey('roles.id', ondelete='CASCADE'))
+    Column('user_id', UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+    Column('role_id', UUID(as_uuid=True), ForeignKey('roles.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_user_roles_role_id', 'role_id', 'user_id')
 )
 
 group_roles = Table(
     'group_roles',
     Base.metadata,
-    Column('group_id', UUID(as_uuid=True), ForeignKey('groups.id', ondelete='CASCADE')),
-    Column('role_id', UUID(as_uuid=True), ForeignKey('roles.id', ondelete='CASCADE'))
+    Column('group_id', UUID(as_uuid=True), ForeignKey('groups.id', ondelete='CASCADE'), primary_key=True),
+    Column('role_id', UUID(as_uuid=True), ForeignKey('roles.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_group_roles_role_id', 'role_id', 'group_id')
 )
 
 role_permissions = Table(
     'role_permissions',
     Base.metadata,
-    Column('role_id', UUID(as_uuid=True), ForeignKey('roles.id', ondelete='CASCADE')),
-    Column('permission_id', UUID(as_uuid=True), ForeignKey('permissions.id', ondelete='CASCADE'))
+    Column('role_id', UUID(as_uuid=True), ForeignKey('roles.id', ondelete='CASCADE'), primary_key=True),
+    Column('permission_id', UUID(as_uuid=True), ForeignKey('permissions.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_role_permissions_permission_id', 'permission_id', 'role_id')
 )
 
 
 class User(Base):
     __tablename__ = 'users'
+    __mapper_args__ = {'eager_defaults': True}  # fetch server-side timestamps on flush
+    __table_args__ = (
+        # Trigram indexes for ILIKE '%...%' search (requires the pg_trgm extension)
+        Index('ix_users_username_trgm', 'username', postgresql_using='gin',
+              postgresql_ops={'username': 'gin_trgm_ops'}),
+        Index('ix_users_email_trgm', 'email', postgresql_using='gin',
+              postgresql_ops={'email': 'gin_trgm_ops'}),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     email = Column(String(255), unique=True, nullable=False, index=True)
@@ -50,26 +63,29 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     is_superuser = Column(Boolean, default=False, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW, nullable=False)
+    updated_at = Column(DateTime, server_default=UTC_NOW, onupdate=UTC_NOW)
     last_login = Column(DateTime)
     
     # Relationships
     groups = relationship('Group', secondary=user_groups, back_populates='users')
     roles = relationship('Role', secondary=user_roles, back_populates='users')
-    reports = relationship('Report', back_populates='owner')
-    audit_logs = relationship('AuditLog', back_populates='user')
-    exports = relationship('Export', back_populates='user')
+    # Unbounded collections - load explicitly or query with pagination
+    # (passive_deletes: the FKs' ON DELETE rules handle children without loading them)
+    reports = relationship('Report', back_populates='owner', lazy='raise_on_sql', passive_deletes=True)
+    audit_logs = relationship('AuditLog', back_populates='user', lazy='raise', viewonly=True)
+    exports = relationship('Export', back_populates='user', lazy='raise_on_sql', passive_deletes=True)
 
 
 class Group(Base):
     __tablename__ = 'groups'
+    __mapper_args__ = {'eager_defaults': True}  # fetch server-side timestamps on flush
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     name = Column(String(100), unique=True, nullable=False)
     description = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW, nullable=False)
+    updated_at = Column(DateTime, server_default=UTC_NOW, onupdate=UTC_NOW)
     
     # Relationships
     users = relationship('User', secondary=user_groups, back_populates='groups')
@@ -78,13 +94,14 @@ class Group(Base):
 
 class Role(Base):
     __tablename__ = 'roles'
+    __mapper_args__ = {'eager_defaults': True}  # fetch server-side timestamps on flush
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     name = Column(String(100), unique=True, nullable=False)
     description = Column(Text)
     is_system = Column(Boolean, default=False, nullable=False)  # System roles cannot be deleted
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=UTC_NOW, nullable=False)
+    updated_at = Column(DateTime, server_default=UTC_NOW, onupdate=UTC_NOW)
     
     # Relationships
     users = relationship('User', secondary=user_roles, back_populates='roles')
@@ -99,24 +116,45 @@ class Permission(Base):
     resource = Column(String(100), nullable=False)  # e.g., 'reports', 'users', 'fields'
     action = Column(String(50), nullable=False)  # e.g., 'create', 'read', 'update', 'delete'
     description = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=UTC_NOW, nullable=False)
     
     # Relationships
     roles = relationship('Role', secondary=role_permissions, back_populates='permissions')
 
 
+USER_AGENT_MAX_LENGTH = 512
+
+
 class AuditLog(Base):
     __tablename__ = 'audit_logs'
+    # Monthly range partitions (audit_logs_pYYYYMM) so retention drops whole
+    # partitions; see AuditService.create_partitions / cleanup_old_logs
+    __table_args__ = {'postgresql_partition_by': 'RANGE (timestamp)'}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='SET NULL'))
     action = Column(String(100), nullable=False)
     resource_type = Column(String(100))
     resource_id = Column(UUID(as_uuid=True))
-    details = Column(Text)  # JSON string for additional details
+    details = Column(JSONB)  # Additional details
     ip_address = Column(String(45))
-    user_agent = Column(Text)
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    user_agent = Column(String(USER_AGENT_MAX_LENGTH))
+    # Part of the primary key because it is the partition key
+    timestamp = Column(DateTime, primary_key=True, server_default=UTC_NOW, nullable=False, index=True)
     
     # Relationships
-    user = relationship('User', back_populates='audit_logs')
\ No newline at end of file
+    user = relationship('User', back_populates='audit_logs')
+
+
+# Tables created from metadata (AUTO_CREATE_TABLES, tests) get a catch-all
+# partition; the monthly ones are added by AuditService.create_partitions
+event.listen(
+    AuditLog.__table__,
+    'after_create',
+    DDL("CREATE TABLE IF NOT EXISTS audit_logs_default PARTITION OF audit_logs DEFAULT")
+)
+
+
+# Supports per-user audit history pages ordered newest first; action is
+# included so per-user activity summaries are index-only scans
+Index('ix_audit_logs_user_id_timestamp_action', AuditLog.user_id, AuditLog.timestamp.desc(), AuditLog.action)
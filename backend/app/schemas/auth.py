@@ -8,6 +8,8 @@ from datetime import datetime
 from uuid import UUID
 from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_validator
 
+from app.core.validators import is_valid_email
+
 
 class Token(BaseModel):
     """JWT token response"""
@@ -31,7 +33,7 @@ class UserBase(BaseModel):
     @classmethod
     def validate_email(cls, v: str) -> str:
         """Basic email validation that allows .local domains"""
-        if '@' not in v or len(v.split('@')) != 2:
+        if not is_valid_email(v):
             raise ValueError('Invalid email format')
         return v
 
@@ -51,7 +53,7 @@ class UserUpdate(BaseModel):
     @classmethod
     def validate_email(cls, v: Optional[str]) -> Optional[str]:
         """Basic email validation that allows .local domains"""
-        if v is not None and ('@' not in v or len(v.split('@')) != 2):
+        if v is not None and not is_valid_email(v):
             raise ValueError('Invalid email format')
         return v
 
@@ -5,26 +5,12 @@ Export schemas for request/response validation
 from uuid import UUID
 from datetime import datetime
 from typing import Optional, Dict, Any, List
-from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
-
-class ExportStatus(str, Enum):
-    """Export job status"""
-    PENDING = "pending"
-    PROCESSING = "processing"
-    COMPLETED = "completed"
-    FAILED = "failed"
-    CANCELLED = "cancelled"
-
-
-class ExportFormat(str, Enum):
-    """Supported export formats"""
-    CSV = "csv"
-    EXCEL = "excel"
-    PDF = "pdf"
-    JSON = "json"
+# Share the enums with the ORM model so the wire format and the stored
+# enum labels are always the same value set
+from app.models.export import ExportStatus, ExportFormat
 
 
 class ExportOptions(BaseModel):
@@ -57,8 +43,8 @@ class ExportRequest(BaseModel):
     filters: Optional[List[Dict[str, Any]]] = Field(None, description="Optional filters to apply")
     options: Optional[ExportOptions] = Field(None, description="Format-specific options")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "report_id": "123e4567-e89b-12d3-a456-426614174000",
                 "format": "excel",
@@ -71,6 +57,7 @@ class ExportRequest(BaseModel):
                 }
             }
         }
+    )
 
 
 class ExportResponse(BaseModel):
@@ -87,8 +74,10 @@ class ExportResponse(BaseModel):
     error_message: Optional[str] = Field(None, description="Error message if failed")
     progress: Optional[int] = Field(None, description="Progress percentage (0-100)")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        extra='ignore',
+        json_schema_extra={
             "example": {
                 "export_id": "550e8400-e29b-41d4-a716-446655440000",
                 "status": "completed",
@@ -99,10 +88,13 @@ class ExportResponse(BaseModel):
                 "file_size": 2048576
             }
         }
+    )
 
 
 class ExportListResponse(BaseModel):
     """List of exports"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     exports: List[ExportResponse]
     total: int
     skip: int
@@ -111,8 +103,14 @@ class ExportListResponse(BaseModel):
 
 class ExportProgress(BaseModel):
     """WebSocket message for export progress"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     export_id: str
     status: ExportStatus
     progress: int  # 0-100
     message: Optional[str] = None
-    estimated_time_remaining: Optional[int] = None  # seconds
\ No newline at end of file
+    estimated_time_remaining: Optional[int] = None  # seconds
+
+
+# Module-level adapter so list payloads are validated in a single pydantic-core call
+EXPORT_LIST_ADAPTER = TypeAdapter(List[ExportResponse])
@@ -3,16 +3,22 @@ Field and metadata schemas
 """
 
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from uuid import UUID
 from pydantic import BaseModel, ConfigDict, Field
 from app.models.field import FieldType, AggregationType
 
 
+# Closed value sets - validated by membership instead of a regex
+ConnectionType = Literal['postgresql', 'mysql', 'oracle', 'mssql', 'sqlite']
+RelationshipType = Literal['one-to-one', 'one-to-many', 'many-to-many']
+JoinType = Literal['INNER', 'LEFT', 'RIGHT', 'FULL']
+
+
 class DataSourceBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     description: Optional[str] = None
-    connection_type: str = Field(..., pattern="^(postgresql|mysql|oracle|mssql|sqlite)$")
+    connection_type: ConnectionType
     connection_string: str
     is_active: bool = True
 
@@ -127,8 +133,8 @@ class FieldWithRelationships(Field):
 class FieldRelationshipBase(BaseModel):
     source_field_id: UUID
     target_field_id: UUID
-    relationship_type: str = Field(..., pattern="^(one-to-one|one-to-many|many-to-many)$")
-    join_type: str = Field(default="INNER", pattern="^(INNER|LEFT|RIGHT|FULL)$")
+    relationship_type: RelationshipType
+    join_type: JoinType = "INNER"
     is_active: bool = True
 
 
@@ -137,8 +143,8 @@ class FieldRelationshipCreate(FieldRelationshipBase):
 
 
 class FieldRelationshipUpdate(BaseModel):
-    relationship_type: Optional[str] = Field(None, pattern="^(one-to-one|one-to-many|many-to-many)$")
-    join_type: Optional[str] = Field(None, pattern="^(INNER|LEFT|RIGHT|FULL)$")
+    relationship_type: Optional[RelationshipType] = None
+    join_type: Optional[JoinType] = None
     is_active: Optional[bool] = None
 
 
@@ -3,7 +3,7 @@ Report schemas for API validation
 """
 
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Generic, TypeVar
+from typing import Optional, List, Dict, Any, Generic, TypeVar, Literal
 from uuid import UUID
 from pydantic import BaseModel, ConfigDict, Field
 from app.models.report import ReportType
@@ -103,7 +103,7 @@ class FolderWithReports(Folder):
 class ReportExecutionBase(BaseModel):
     report_id: UUID
     schedule_id: Optional[UUID] = None
-    output_format: str = Field(..., pattern="^(csv|xlsx|pdf|json)$")
+    output_format: Literal['csv', 'xlsx', 'pdf', 'json']
     parameters: Optional[Dict[str, Any]] = None
 
 
@@ -136,8 +136,7 @@ class PaginatedResponse(BaseModel, Generic[T]):
     skip: int
     limit: int
     
-    class Config:
-        arbitrary_types_allowed = True
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
 class ReportVersionBase(BaseModel):
@@ -171,6 +170,8 @@ class QueryRequest(BaseModel):
 
 class QueryResponse(BaseModel):
     """Response from query execution"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     data: List[Dict[str, Any]]
     total_rows: int
     executed_at: datetime
@@ -178,6 +179,18 @@ class QueryResponse(BaseModel):
     query: Optional[str] = None  # SQL for debugging
 
 
+class QueryResponseColumnar(BaseModel):
+    """Column-oriented query response: one header plus one value list per row"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
+    columns: List[str]
+    rows: List[List[Any]]
+    total_rows: int
+    executed_at: datetime
+    duration_ms: int
+    query: Optional[str] = None  # SQL for debugging
+
+
 # Avoid circular imports by using strings for forward references
 from app.schemas.user import UserBase
 ReportWithDetails.model_rebuild()
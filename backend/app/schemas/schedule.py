@@ -2,12 +2,15 @@
 Pydantic schemas for scheduling system
 """
 
+import sys
 from datetime import datetime
 from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator, model_validator
 from enum import Enum
-from croniter import croniter
-import pytz
+from types import MappingProxyType
+
+from app.core import cron_cache
+from app.core.validators import is_valid_email
 
 
 class ExportFormat(str, Enum):
@@ -41,6 +44,26 @@ class ExecutionStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+# Accepted raw values, checked before enum coercion
+_EXPORT_FORMAT_VALUES = frozenset(f.value for f in ExportFormat)
+_FREQUENCY_VALUES = frozenset(f.value for f in ScheduleFrequency)
+
+
+def _check_enum_value(v: Any, allowed: frozenset, label: str) -> Any:
+    """Reject unknown enum values up front with the list of accepted ones"""
+    if isinstance(v, str) and v not in allowed:
+        raise ValueError(f"Invalid {label} '{v}', expected one of: {', '.join(sorted(allowed))}")
+    return v
+
+
+# Cron expressions for the preset frequencies
+_FREQ_TO_CRON = MappingProxyType({
+    ScheduleFrequency.DAILY: "0 0 * * *",    # Daily at midnight
+    ScheduleFrequency.WEEKLY: "0 0 * * 0",   # Weekly on Sunday
+    ScheduleFrequency.MONTHLY: "0 0 1 * *",  # Monthly on the 1st
+})
+
+
 # Schedule Configuration Schemas
 class ScheduleConfig(BaseModel):
     """Configuration for schedule timing"""
@@ -50,37 +73,37 @@ class ScheduleConfig(BaseModel):
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     
-    @validator('cron')
-    def validate_cron(cls, v, values):
-        if values.get('frequency') == ScheduleFrequency.CUSTOM and not v:
+    @field_validator('frequency', mode='before')
+    @classmethod
+    def validate_frequency(cls, v: Any) -> Any:
+        return _check_enum_value(v, _FREQUENCY_VALUES, 'frequency')
+    
+    @field_validator('cron')
+    @classmethod
+    def validate_cron(cls, v: Optional[str], info: ValidationInfo) -> Optional[str]:
+        if info.data.get('frequency') is not ScheduleFrequency.CUSTOM:
+            # Presets always use the fixed expressions from to_cron_expression
+            return None
+        if not v:
             raise ValueError("Cron expression required for custom frequency")
-        if v:
-            try:
-                croniter(v)
-            except Exception:
-                raise ValueError("Invalid cron expression")
+        if not cron_cache.is_valid(v):
+            raise ValueError("Invalid cron expression")
         return v
     
-    @validator('timezone')
-    def validate_timezone(cls, v):
+    @field_validator('timezone')
+    @classmethod
+    def validate_timezone(cls, v: str) -> str:
         try:
-            pytz.timezone(v)
+            cron_cache.get_timezone(v)
         except Exception:
             raise ValueError(f"Invalid timezone: {v}")
         return v
     
     def to_cron_expression(self) -> str:
         """Convert frequency to cron expression"""
-        if self.frequency == ScheduleFrequency.CUSTOM:
+        if self.frequency is ScheduleFrequency.CUSTOM:
             return self.cron
-        elif self.frequency == ScheduleFrequency.DAILY:
-            return "0 0 * * *"  # Daily at midnight
-        elif self.frequency == ScheduleFrequency.WEEKLY:
-            return "0 0 * * 0"  # Weekly on Sunday
-        elif self.frequency == ScheduleFrequency.MONTHLY:
-            return "0 0 1 * *"  # Monthly on the 1st
-        else:
-            return None
+        return _FREQ_TO_CRON.get(self.frequency)
 
 
 # Distribution Configuration Schemas
@@ -95,8 +118,8 @@ class LocalDistributionConfig(BaseModel):
 class EmailDistributionConfig(BaseModel):
     """Configuration for email distribution"""
     recipients: List[str] = Field(..., description="Email recipients (To)")
-    cc: Optional[List[str]] = Field(default=[], description="CC recipients")
-    bcc: Optional[List[str]] = Field(default=[], description="BCC recipients")
+    cc: Optional[List[str]] = Field(default_factory=list, description="CC recipients")
+    bcc: Optional[List[str]] = Field(default_factory=list, description="BCC recipients")
     subject: str = Field(
         "Report: {report_name} - {date}",
         description="Email subject with template variables"
@@ -126,27 +149,25 @@ class EmailDistributionConfig(BaseModel):
         description="Reply-to email address"
     )
     
-    @validator('recipients')
-    def validate_recipients(cls, v):
+    @field_validator('recipients')
+    @classmethod
+    def validate_recipients(cls, v: List[str]) -> List[str]:
         """Validate email addresses"""
         if not v:
             raise ValueError("At least one recipient is required")
         # Basic email validation
-        import re
-        email_pattern = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
-        invalid = [email for email in v if not email_pattern.match(email)]
+        invalid = [email for email in v if not is_valid_email(email)]
         if invalid:
             raise ValueError(f"Invalid email addresses: {', '.join(invalid)}")
         return v
     
-    @validator('cc', 'bcc')
-    def validate_cc_bcc(cls, v):
+    @field_validator('cc', 'bcc')
+    @classmethod
+    def validate_cc_bcc(cls, v: Optional[List[str]]) -> Optional[List[str]]:
         """Validate CC and BCC email addresses"""
         if not v:
             return v
-        import re
-        email_pattern = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
-        invalid = [email for email in v if not email_pattern.match(email)]
+        invalid = [email for email in v if not is_valid_email(email)]
         if invalid:
             raise ValueError(f"Invalid email addresses: {', '.join(invalid)}")
         return v
@@ -156,7 +177,7 @@ class WebhookDistributionConfig(BaseModel):
     """Configuration for webhook distribution"""
     url: str = Field(..., description="Webhook URL")
     method: str = Field("POST", description="HTTP method")
-    headers: Optional[Dict[str, str]] = {}
+    headers: Optional[Dict[str, str]] = Field(default_factory=dict)
     auth_type: Optional[str] = None  # bearer, basic, api_key
     auth_value: Optional[str] = None
     include_file: bool = Field(True, description="Include file in request")
@@ -169,12 +190,12 @@ class DistributionConfig(BaseModel):
     email: Optional[EmailDistributionConfig] = None
     webhook: Optional[WebhookDistributionConfig] = None
     
-    @validator('*', pre=True)
-    def at_least_one_channel(cls, v, values):
-        if not any([values.get('local'), values.get('email'), values.get('webhook')]):
+    @model_validator(mode='after')
+    def at_least_one_channel(self) -> 'DistributionConfig':
+        if not (self.local or self.email or self.webhook):
             # Default to local storage
-            values['local'] = LocalDistributionConfig()
-        return v
+            self.local = LocalDistributionConfig()
+        return self
 
 
 # Export Configuration
@@ -186,6 +207,25 @@ class ExportConfig(BaseModel):
     compress: bool = False
     password_protect: bool = False
     password: Optional[str] = None
+    
+    @field_validator('format', mode='before')
+    @classmethod
+    def validate_format(cls, v: Any) -> Any:
+        return _check_enum_value(v, _EXPORT_FORMAT_VALUES, 'export format')
+
+
+def _intern_config_keys(config: Any, depth: int = 2) -> Any:
+    """
+    Intern the keys of a stored config dict (and its per-channel sub-dicts)
+    Only the top levels are walked: their keys come from the schemas above,
+    while deeper dicts (e.g. webhook headers) hold user-supplied keys
+    """
+    if not isinstance(config, dict) or depth == 0:
+        return config
+    return {
+        sys.intern(key) if isinstance(key, str) else key: _intern_config_keys(value, depth - 1)
+        for key, value in config.items()
+    }
 
 
 # Schedule CRUD Schemas
@@ -215,6 +255,8 @@ class ScheduleUpdateRequest(BaseModel):
 
 class ScheduleResponse(BaseModel):
     """Response for schedule operations"""
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='forbid')
+    
     id: str
     report_id: str
     user_id: str
@@ -235,12 +277,16 @@ class ScheduleResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
     
-    class Config:
-        orm_mode = True
+    @field_validator('schedule_config', 'distribution_config', 'export_config', mode='before')
+    @classmethod
+    def intern_config_keys(cls, v: Any) -> Any:
+        return _intern_config_keys(v)
 
 
 class ScheduleListResponse(BaseModel):
     """Response for listing schedules"""
+    model_config = ConfigDict(frozen=True)
+    
     schedules: List[ScheduleResponse]
     total: int
     skip: int
@@ -250,6 +296,8 @@ class ScheduleListResponse(BaseModel):
 # Execution History Schemas
 class ExecutionResponse(BaseModel):
     """Response for execution history"""
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='forbid')
+    
     id: str
     schedule_id: str
     export_id: Optional[str]
@@ -261,13 +309,12 @@ class ExecutionResponse(BaseModel):
     distribution_results: Optional[Dict[str, Any]]
     task_id: Optional[str]
     duration_seconds: Optional[float]
-    
-    class Config:
-        orm_mode = True
 
 
 class ExecutionListResponse(BaseModel):
     """Response for listing executions"""
+    model_config = ConfigDict(frozen=True)
+    
     executions: List[ExecutionResponse]
     total: int
     skip: int
@@ -285,6 +332,8 @@ class DistributionTemplateCreateRequest(BaseModel):
 
 class DistributionTemplateResponse(BaseModel):
     """Response for distribution template operations"""
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='forbid')
+    
     id: str
     user_id: str
     name: str
@@ -293,9 +342,6 @@ class DistributionTemplateResponse(BaseModel):
     is_default: bool
     created_at: datetime
     updated_at: Optional[datetime]
-    
-    class Config:
-        orm_mode = True
 
 
 # Test/Preview Schemas
@@ -307,8 +353,10 @@ class ScheduleTestRequest(BaseModel):
     
 class ScheduleTestResponse(BaseModel):
     """Response for schedule test"""
+    model_config = ConfigDict(frozen=True)
+    
     valid: bool
     next_runs: List[datetime] = Field(..., description="Next 5 scheduled runs")
     distribution_test: Dict[str, Dict[str, Any]] = Field(..., description="Test results for each channel")
-    warnings: List[str] = []
-    errors: List[str] = []
\ No newline at end of file
+    warnings: List[str] = Field(default_factory=list)
+    errors: List[str] = Field(default_factory=list)
\ No newline at end of file
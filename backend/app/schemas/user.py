@@ -3,9 +3,10 @@ User and authentication schemas
 """
 
 from datetime import datetime
-from typing import Optional, List
-from uuid import UUID
-from pydantic import BaseModel, EmailStr, ConfigDict, Field, field_validator
+from typing import Any, Dict, Optional, List
+from pydantic import BaseModel, EmailStr, ConfigDict, Field, UUID4, field_validator
+
+from app.core.validators import is_valid_email
 
 
 class UserBase(BaseModel):
@@ -18,7 +19,7 @@ class UserBase(BaseModel):
     @classmethod
     def validate_email(cls, v: str) -> str:
         """Basic email validation that allows .local domains"""
-        if '@' not in v or len(v.split('@')) != 2:
+        if not is_valid_email(v):
             raise ValueError('Invalid email format')
         return v
 
@@ -38,15 +39,15 @@ class UserUpdate(BaseModel):
     @classmethod
     def validate_email(cls, v: Optional[str]) -> Optional[str]:
         """Basic email validation that allows .local domains"""
-        if v is not None and ('@' not in v or len(v.split('@')) != 2):
+        if v is not None and not is_valid_email(v):
             raise ValueError('Invalid email format')
         return v
 
 
 class UserInDB(UserBase):
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
     
-    id: UUID
+    id: UUID4
     is_superuser: bool
     created_at: datetime
     updated_at: datetime
@@ -58,8 +59,8 @@ class User(UserInDB):
 
 
 class UserWithGroups(User):
-    groups: List['GroupBase'] = []
-    roles: List['RoleBase'] = []
+    groups: List['GroupBase'] = Field(default_factory=list)
+    roles: List['RoleBase'] = Field(default_factory=list)
 
 
 class GroupBase(BaseModel):
@@ -68,28 +69,28 @@ class GroupBase(BaseModel):
 
 
 class GroupCreate(GroupBase):
-    user_ids: List[UUID] = []
-    role_ids: List[UUID] = []
+    user_ids: List[UUID4] = Field(default_factory=list)
+    role_ids: List[UUID4] = Field(default_factory=list)
 
 
 class GroupUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     description: Optional[str] = None
-    user_ids: Optional[List[UUID]] = None
-    role_ids: Optional[List[UUID]] = None
+    user_ids: Optional[List[UUID4]] = None
+    role_ids: Optional[List[UUID4]] = None
 
 
 class Group(GroupBase):
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
     
-    id: UUID
+    id: UUID4
     created_at: datetime
     updated_at: datetime
 
 
 class GroupWithUsers(Group):
-    users: List[UserBase] = []
-    roles: List['RoleBase'] = []
+    users: List[UserBase] = Field(default_factory=list)
+    roles: List['RoleBase'] = Field(default_factory=list)
 
 
 class RoleBase(BaseModel):
@@ -99,31 +100,31 @@ class RoleBase(BaseModel):
 
 
 class RoleCreate(RoleBase):
-    permission_ids: List[UUID] = []
+    permission_ids: List[UUID4] = Field(default_factory=list)
 
 
 class RoleUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     description: Optional[str] = None
-    permission_ids: Optional[List[UUID]] = None
+    permission_ids: Optional[List[UUID4]] = None
 
 
 class Role(RoleBase):
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
     
-    id: UUID
+    id: UUID4
     created_at: datetime
     updated_at: datetime
 
 
 class RoleWithPermissions(Role):
-    permissions: List['Permission'] = []
+    permissions: List['Permission'] = Field(default_factory=list)
 
 
 class Permission(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
     
-    id: UUID
+    id: UUID4
     resource: str
     action: str
     description: Optional[str] = None
@@ -150,4 +151,23 @@ class PasswordChange(BaseModel):
 
 class PasswordReset(BaseModel):
     token: str
-    new_password: str = Field(..., min_length=8, max_length=100)
\ No newline at end of file
+    new_password: str = Field(..., min_length=8, max_length=100)
+
+
+class AuditLogEntry(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+    
+    id: UUID4
+    action: str
+    resource_type: Optional[str] = None
+    resource_id: Optional[UUID4] = None
+    details: Optional[Dict[str, Any]] = None
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    timestamp: datetime
+
+
+# Resolve forward references at import instead of on first validation
+UserWithGroups.model_rebuild()
+GroupWithUsers.model_rebuild()
+RoleWithPermissions.model_rebuild()
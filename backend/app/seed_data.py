@@ -2,19 +2,172 @@
 Seed data script for populating the database with test data
 """
 
+import argparse
 import asyncio
+import gzip
+import hashlib
 import json
-from datetime import datetime, timedelta
+import os
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import repeat
+from pathlib import Path
+from typing import Optional, Tuple
 from uuid import uuid4
-from passlib.context import CryptContext
-from sqlalchemy.ext.asyncio import AsyncSession
+import bcrypt
+import numpy as np
+from sqlalchemy import Column, Date, Integer, MetaData, Numeric, String, Table, insert, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.database import AsyncSessionLocal, engine
-from app.models.user import User, Group, Role, Permission
+from app.core.config import settings
+from app.core.database import Base, create_seed_engine
+from app.models.user import User, Group, Role, Permission, group_roles, role_permissions, user_groups
 from app.models.field import DataSource, DataTable, Field, FieldRelationship, FieldType, AggregationType
 from app.models.report import Report, ReportType, Folder
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Seed fixtures don't need production bcrypt cost; verification reads the rounds from the hash
+SEED_BCRYPT_ROUNDS = 4
+
+# Permission scopes for the built-in report roles
+REPORT_RESOURCES = frozenset({'reports', 'fields'})
+REPORT_CREATOR_ACTIONS = frozenset({'create', 'read', 'update', 'execute'})
+REPORT_VIEWER_ACTIONS = frozenset({'read', 'execute'})
+
+# Directory for cached seed dumps (see seed_cache_path); unset disables the cache
+SEED_CACHE_DIR = os.getenv("SEED_CACHE_DIR")
+
+# Random seed for the generated fund sample data
+SAMPLE_DATA_SEED = 42
+
+# Sample warehouse tables the seeded data sources point at. Kept on their own
+# MetaData: they are demo data, not part of the application schema
+sample_metadata = MetaData()
+
+funds_table = Table(
+    'funds', sample_metadata,
+    Column('fund_id', String, primary_key=True),
+    Column('fund_name', String),
+    Column('fund_type', String),
+    Column('inception_date', Date),
+    Column('manager', String)
+)
+
+fund_time_series_table = Table(
+    'fund_time_series', sample_metadata,
+    Column('fund_id', String, primary_key=True),
+    Column('date', Date, primary_key=True),
+    Column('nav', Numeric(10, 2)),
+    Column('return_1d', Numeric(10, 4)),
+    Column('aum', Numeric(15, 2))
+)
+
+benchmarks_table = Table(
+    'benchmarks', sample_metadata,
+    Column('benchmark_id', String, primary_key=True),
+    Column('benchmark_name', String),
+    Column('asset_class', String)
+)
+
+transactions_table = Table(
+    'transactions', sample_metadata,
+    Column('transaction_id', Integer, primary_key=True),
+    Column('fund_id', String),
+    Column('transaction_date', Date),
+    Column('transaction_type', String),
+    Column('amount', Numeric(15, 2))
+)
+
+# The seed gets its own engine (see create_seed_engine) rather than the app's
+seed_engine = create_seed_engine()
+SeedSessionLocal = async_sessionmaker(seed_engine, expire_on_commit=False, autoflush=False)
+
+# Fund Performance Dashboard
+DASHBOARD_DEFINITION = {
+    "sections": [
+        {
+            "id": "header",
+            "type": "text",
+            "title": "Fund Performance Dashboard",
+            "content": "Monthly performance overview of all funds"
+        },
+        {
+            "id": "table1",
+            "type": "table",
+            "title": "Fund Performance Table",
+            "fields": ["fund_name", "fund_type", "aum", "return_1d", "return_mtd", "return_ytd"],
+            "filters": [
+                {"field": "fund_type", "operator": "IN", "value": ["Equity", "Bond"]}
+            ],
+            "sort": [{"field": "return_ytd", "direction": "DESC"}]
+        }
+    ],
+    "parameters": [
+        {"name": "date", "type": "date", "default": "today", "required": True}
+    ]
+}
+
+# Top Performers Report
+TOP_PERFORMERS_DEFINITION = {
+    "sections": [
+        {
+            "id": "table1",
+            "type": "table",
+            "title": "Top 10 Performers",
+            "fields": ["fund_name", "fund_type", "return_ytd", "aum"],
+            "filters": [
+                {"field": "return_ytd", "operator": ">", "value": 0}
+            ],
+            "sort": [{"field": "return_ytd", "direction": "DESC"}],
+            "limit": 10
+        }
+    ]
+}
+
+# Fund Detail Template
+DETAIL_TEMPLATE_DEFINITION = {
+    "sections": [
+        {
+            "id": "params",
+            "type": "parameters",
+            "parameters": [
+                {"name": "fund_id", "type": "string", "required": True}
+            ]
+        },
+        {
+            "id": "detail",
+            "type": "detail",
+            "title": "Fund Details",
+            "fields": ["fund_name", "fund_type", "inception_date", "aum"],
+            "filters": [
+                {"field": "fund_id", "operator": "=", "value": "${fund_id}"}
+            ]
+        },
+        {
+            "id": "performance",
+            "type": "table",
+            "title": "Historical Performance",
+            "fields": ["date", "nav", "return_1d", "return_mtd", "return_ytd"],
+            "filters": [
+                {"field": "fund_id", "operator": "=", "value": "${fund_id}"}
+            ],
+            "sort": [{"field": "date", "direction": "DESC"}],
+            "limit": 30
+        }
+    ]
+}
+
+# Test users: (email, username, full_name, password, is_superuser, group index)
+SEED_USERS = [
+    ("admin@boe-system.local", "admin", "System Administrator", "admin123", True, 0),  # Admin group
+    ("creator@boe-system.local", "creator", "Report Creator", "creator123", False, 1),  # Creators group
+    ("viewer@boe-system.local", "viewer", "Report Viewer", "viewer123", False, 2),  # Viewers group
+] + [
+    # Additional test users, defaulting to the viewers group
+    (f"user{i}@boe-system.local", f"user{i}", f"Test User {i}", f"password{i}", False, 2)
+    for i in range(1, 6)
+]
 
 
 async def create_permissions(db: AsyncSession):
@@ -22,19 +175,16 @@ async def create_permissions(db: AsyncSession):
     resources = ['reports', 'users', 'fields', 'schedules', 'admin']
     actions = ['create', 'read', 'update', 'delete', 'execute']
     
-    permissions = []
-    for resource in resources:
-        for action in actions:
-            permission = Permission(
-                resource=resource,
-                action=action,
-                description=f"Can {action} {resource}"
-            )
-            permissions.append(permission)
-    
-    db.add_all(permissions)
-    await db.commit()
-    return permissions
+    # One bulk INSERT ... RETURNING instead of a unit-of-work insert per object
+    result = await db.scalars(
+        insert(Permission).returning(Permission),
+        [
+            {'resource': resource, 'action': action, 'description': f"Can {action} {resource}"}
+            for resource in resources
+            for action in actions
+        ]
+    )
+    return result.all()
 
 
 async def create_roles(db: AsyncSession, permissions):
@@ -46,7 +196,6 @@ async def create_roles(db: AsyncSession, permissions):
         description="Full system access",
         is_system=True
     )
-    admin_role.permissions = permissions
     
     # Report Creator role
     report_creator_role = Role(
@@ -54,8 +203,6 @@ async def create_roles(db: AsyncSession, permissions):
         description="Can create and manage reports",
         is_system=True
     )
-    report_creator_perms = [p for p in permissions if p.resource in ['reports', 'fields'] and p.action in ['create', 'read', 'update', 'execute']]
-    report_creator_role.permissions = report_creator_perms
     
     # Report Viewer role
     viewer_role = Role(
@@ -63,12 +210,24 @@ async def create_roles(db: AsyncSession, permissions):
         description="Can view and execute reports",
         is_system=True
     )
-    viewer_perms = [p for p in permissions if p.resource in ['reports', 'fields'] and p.action in ['read', 'execute']]
-    viewer_role.permissions = viewer_perms
     
     roles = [admin_role, report_creator_role, viewer_role]
     db.add_all(roles)
-    await db.commit()
+    await db.flush()
+    
+    # Admin gets every permission; the report-scoped ones are split between
+    # the other two roles in the same pass. The association rows go in as one
+    # executemany instead of through relationship collections
+    role_permission_rows = []
+    for p in permissions:
+        role_permission_rows.append({"role_id": admin_role.id, "permission_id": p.id})
+        if p.resource not in REPORT_RESOURCES:
+            continue
+        if p.action in REPORT_CREATOR_ACTIONS:
+            role_permission_rows.append({"role_id": report_creator_role.id, "permission_id": p.id})
+        if p.action in REPORT_VIEWER_ACTIONS:
+            role_permission_rows.append({"role_id": viewer_role.id, "permission_id": p.id})
+    await db.execute(insert(role_permissions), role_permission_rows)
     return roles
 
 
@@ -80,84 +239,69 @@ async def create_groups(db: AsyncSession, roles):
         name="Administrators",
         description="System administrators"
     )
-    admin_group.roles = [roles[0]]  # Admin role
     
     # Report Creators group
     creators_group = Group(
         name="Report Creators",
         description="Users who can create reports"
     )
-    creators_group.roles = [roles[1]]  # Report Creator role
     
     # Report Viewers group
     viewers_group = Group(
         name="Report Viewers",
         description="Users who can view reports"
     )
-    viewers_group.roles = [roles[2]]  # Viewer role
     
     groups = [admin_group, creators_group, viewers_group]
     db.add_all(groups)
-    await db.commit()
+    await db.flush()
+    
+    # Each group gets the role at the same position (admin, creator, viewer)
+    await db.execute(insert(group_roles), [
+        {"group_id": group.id, "role_id": role.id}
+        for group, role in zip(groups, roles)
+    ])
     return groups
 
 
-async def create_users(db: AsyncSession, groups):
+def hash_password(password: str) -> str:
+    """bcrypt hash in the same $2b$ format passlib produces and verifies"""
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=SEED_BCRYPT_ROUNDS)).decode()
+
+
+async def hash_user_passwords():
+    """
+    Hash the test users' passwords
+    bcrypt is CPU-bound and releases the GIL, so the hashes run concurrently
+    on worker threads and can overlap the seed's database work
+    """
+    return await asyncio.gather(*(
+        asyncio.to_thread(hash_password, password)
+        for _, _, _, password, _, _ in SEED_USERS
+    ))
+
+
+async def create_users(db: AsyncSession, groups, hashed_passwords):
     """Create test users"""
     
     users = []
-    
-    # Admin user
-    admin_user = User(
-        email="admin@boe-system.local",
-        username="admin",
-        full_name="System Administrator",
-        hashed_password=pwd_context.hash("admin123"),
-        is_active=True,
-        is_superuser=True
-    )
-    admin_user.groups = [groups[0]]  # Admin group
-    users.append(admin_user)
-    
-    # Report creator user
-    creator_user = User(
-        email="creator@boe-system.local",
-        username="creator",
-        full_name="Report Creator",
-        hashed_password=pwd_context.hash("creator123"),
-        is_active=True,
-        is_superuser=False
-    )
-    creator_user.groups = [groups[1]]  # Creators group
-    users.append(creator_user)
-    
-    # Report viewer user
-    viewer_user = User(
-        email="viewer@boe-system.local",
-        username="viewer",
-        full_name="Report Viewer",
-        hashed_password=pwd_context.hash("viewer123"),
-        is_active=True,
-        is_superuser=False
-    )
-    viewer_user.groups = [groups[2]]  # Viewers group
-    users.append(viewer_user)
-    
-    # Additional test users
-    for i in range(1, 6):
+    memberships = []
+    for (email, username, full_name, _, is_superuser, group_index), hashed_password in zip(SEED_USERS, hashed_passwords):
         user = User(
-            email=f"user{i}@boe-system.local",
-            username=f"user{i}",
-            full_name=f"Test User {i}",
-            hashed_password=pwd_context.hash(f"password{i}"),
+            id=uuid4(),
+            email=email,
+            username=username,
+            full_name=full_name,
+            hashed_password=hashed_password,
             is_active=True,
-            is_superuser=False
+            is_superuser=is_superuser
         )
-        user.groups = [groups[2]]  # Default to viewers group
         users.append(user)
+        memberships.append({"user_id": user.id, "group_id": groups[group_index].id})
     
     db.add_all(users)
-    await db.commit()
+    await db.flush()
+    await db.execute(insert(user_groups), memberships)
     return users
 
 
@@ -184,7 +328,7 @@ async def create_data_sources(db: AsyncSession):
     
     data_sources = [main_ds, analytics_ds]
     db.add_all(data_sources)
-    await db.commit()
+    await db.flush()
     return data_sources
 
 
@@ -234,7 +378,7 @@ async def create_data_tables(db: AsyncSession, data_sources):
     tables.append(transaction_table)
     
     db.add_all(tables)
-    await db.commit()
+    await db.flush()
     return tables
 
 
@@ -245,7 +389,7 @@ async def create_fields(db: AsyncSession, tables):
     
     # Fund fields
     fund_fields = [
-        Field(
+        dict(
             column_name="fund_id",
             display_name="Fund ID",
             table_id=tables[0].id,
@@ -253,7 +397,7 @@ async def create_fields(db: AsyncSession, tables):
             is_dimension=True,
             description="Unique fund identifier"
         ),
-        Field(
+        dict(
             column_name="fund_name",
             display_name="Fund Name",
             table_id=tables[0].id,
@@ -261,7 +405,7 @@ async def create_fields(db: AsyncSession, tables):
             is_dimension=True,
             description="Fund display name"
         ),
-        Field(
+        dict(
             column_name="fund_type",
             display_name="Fund Type",
             table_id=tables[0].id,
@@ -269,7 +413,7 @@ async def create_fields(db: AsyncSession, tables):
             is_dimension=True,
             description="Type of fund (Equity, Bond, Mixed)"
         ),
-        Field(
+        dict(
             column_name="inception_date",
             display_name="Inception Date",
             table_id=tables[0].id,
@@ -277,7 +421,7 @@ async def create_fields(db: AsyncSession, tables):
             is_dimension=True,
             description="Fund inception date"
         ),
-        Field(
+        dict(
             column_name="aum",
             display_name="AUM",
             table_id=tables[0].id,
@@ -294,7 +438,7 @@ async def create_fields(db: AsyncSession, tables):
     
     # Time series fields
     ts_fields = [
-        Field(
+        dict(
             column_name="fund_id",
             display_name="Fund ID",
             table_id=tables[1].id,
@@ -302,7 +446,7 @@ async def create_fields(db: AsyncSession, tables):
             is_dimension=True,
             description="Fund identifier"
         ),
-        Field(
+        dict(
             column_name="date",
             display_name="Date",
             table_id=tables[1].id,
@@ -310,7 +454,7 @@ async def create_fields(db: AsyncSession, tables):
             is_dimension=True,
             description="Value date"
         ),
-        Field(
+        dict(
             column_name="nav",
             display_name="NAV",
             table_id=tables[1].id,
@@ -320,7 +464,7 @@ async def create_fields(db: AsyncSession, tables):
             is_restricted=True,
             required_role="Report Creator"
         ),
-        Field(
+        dict(
             column_name="return_1d",
             display_name="1 Day Return",
             table_id=tables[1].id,
@@ -329,7 +473,7 @@ async def create_fields(db: AsyncSession, tables):
             default_aggregation=AggregationType.AVG,
             description="1-day return percentage"
         ),
-        Field(
+        dict(
             column_name="return_mtd",
             display_name="MTD Return",
             table_id=tables[1].id,
@@ -338,7 +482,7 @@ async def create_fields(db: AsyncSession, tables):
             default_aggregation=AggregationType.AVG,
             description="Month-to-date return"
         ),
-        Field(
+        dict(
             column_name="return_ytd",
             display_name="YTD Return",
             table_id=tables[1].id,
@@ -350,72 +494,73 @@ async def create_fields(db: AsyncSession, tables):
     ]
     fields.extend(ts_fields)
     
-    db.add_all(fields)
-    await db.commit()
-    return fields
+    # Only the ids are needed downstream, so skip building ORM objects and
+    # return a (column_name, table_id) -> id lookup
+    result = await db.execute(
+        insert(Field).returning(Field.id, Field.column_name, Field.table_id),
+        fields
+    )
+    return {(row.column_name, row.table_id): row.id for row in result}
 
 
-async def create_field_relationships(db: AsyncSession, fields):
+async def create_field_relationships(db: AsyncSession, field_ids, tables):
     """Create relationships between fields"""
     
-    # Find fund_id fields from different tables
-    fund_id_fields = [f for f in fields if f.column_name == "fund_id"]
+    # Join fund time series back to the fund master on fund_id
+    source_id = field_ids.get(("fund_id", tables[0].id))
+    target_id = field_ids.get(("fund_id", tables[1].id))
     
-    if len(fund_id_fields) >= 2:
+    if source_id and target_id:
         relationship = FieldRelationship(
-            source_field_id=fund_id_fields[0].id,
-            target_field_id=fund_id_fields[1].id,
+            source_field_id=source_id,
+            target_field_id=target_id,
             relationship_type="foreign_key",
             join_type="inner"
         )
         db.add(relationship)
-        await db.commit()
 
 
 async def create_folders(db: AsyncSession, users):
     """Create report folders"""
     
-    folders = []
-    
-    # Root folders
+    # Ids are assigned up front so the subfolders can reference their parent
+    # and all five folders go in with a single flush
     public_folder = Folder(
+        id=uuid4(),
         name="Public Reports",
         owner_id=users[0].id  # Admin owns public folder
     )
-    folders.append(public_folder)
     
     finance_folder = Folder(
+        id=uuid4(),
         name="Finance Reports",
         owner_id=users[1].id  # Creator owns finance folder
     )
-    folders.append(finance_folder)
     
     operations_folder = Folder(
+        id=uuid4(),
         name="Operations Reports",
         owner_id=users[1].id
     )
-    folders.append(operations_folder)
-    
-    db.add_all(folders)
-    await db.commit()
     
-    # Create subfolders
+    # Subfolders
     monthly_folder = Folder(
+        id=uuid4(),
         name="Monthly Reports",
         parent_id=finance_folder.id,
         owner_id=users[1].id
     )
     
     quarterly_folder = Folder(
+        id=uuid4(),
         name="Quarterly Reports",
         parent_id=finance_folder.id,
         owner_id=users[1].id
     )
     
-    db.add_all([monthly_folder, quarterly_folder])
-    await db.commit()
-    
-    folders.extend([monthly_folder, quarterly_folder])
+    folders = [public_folder, finance_folder, operations_folder, monthly_folder, quarterly_folder]
+    db.add_all(folders)
+    await db.flush()
     return folders
 
 
@@ -425,111 +570,39 @@ async def create_reports(db: AsyncSession, users, folders, fields):
     reports = []
     
     # Fund Performance Dashboard
-    dashboard_def = {
-        "sections": [
-            {
-                "id": "header",
-                "type": "text",
-                "title": "Fund Performance Dashboard",
-                "content": "Monthly performance overview of all funds"
-            },
-            {
-                "id": "table1",
-                "type": "table",
-                "title": "Fund Performance Table",
-                "fields": ["fund_name", "fund_type", "aum", "return_1d", "return_mtd", "return_ytd"],
-                "filters": [
-                    {"field": "fund_type", "operator": "IN", "value": ["Equity", "Bond"]}
-                ],
-                "sort": [{"field": "return_ytd", "direction": "DESC"}]
-            }
-        ],
-        "parameters": [
-            {"name": "date", "type": "date", "default": "today", "required": True}
-        ]
-    }
-    
     dashboard = Report(
         name="Fund Performance Dashboard",
         description="Comprehensive fund performance overview",
         report_type=ReportType.DASHBOARD,
         owner_id=users[1].id,  # Creator user
         folder_id=folders[1].id,  # Finance folder
-        definition=dashboard_def,
+        definition=DASHBOARD_DEFINITION,
         version=1,
         is_published=True
     )
     reports.append(dashboard)
     
     # Top Performers Report
-    top_performers_def = {
-        "sections": [
-            {
-                "id": "table1",
-                "type": "table",
-                "title": "Top 10 Performers",
-                "fields": ["fund_name", "fund_type", "return_ytd", "aum"],
-                "filters": [
-                    {"field": "return_ytd", "operator": ">", "value": 0}
-                ],
-                "sort": [{"field": "return_ytd", "direction": "DESC"}],
-                "limit": 10
-            }
-        ]
-    }
-    
     top_performers = Report(
         name="Top Performers Report",
         description="Top 10 performing funds by YTD return",
         report_type=ReportType.STANDARD,
         owner_id=users[1].id,
         folder_id=folders[3].id,  # Monthly folder
-        definition=top_performers_def,
+        definition=TOP_PERFORMERS_DEFINITION,
         version=1,
         is_published=True
     )
     reports.append(top_performers)
     
     # Fund Detail Template
-    detail_template_def = {
-        "sections": [
-            {
-                "id": "params",
-                "type": "parameters",
-                "parameters": [
-                    {"name": "fund_id", "type": "string", "required": True}
-                ]
-            },
-            {
-                "id": "detail",
-                "type": "detail",
-                "title": "Fund Details",
-                "fields": ["fund_name", "fund_type", "inception_date", "aum"],
-                "filters": [
-                    {"field": "fund_id", "operator": "=", "value": "${fund_id}"}
-                ]
-            },
-            {
-                "id": "performance",
-                "type": "table",
-                "title": "Historical Performance",
-                "fields": ["date", "nav", "return_1d", "return_mtd", "return_ytd"],
-                "filters": [
-                    {"field": "fund_id", "operator": "=", "value": "${fund_id}"}
-                ],
-                "sort": [{"field": "date", "direction": "DESC"}],
-                "limit": 30
-            }
-        ]
-    }
-    
     detail_template = Report(
         name="Fund Detail Template",
         description="Template for detailed fund analysis",
         report_type=ReportType.TEMPLATE,
         owner_id=users[0].id,  # Admin user
         folder_id=folders[0].id,  # Public folder
-        definition=detail_template_def,
+        definition=DETAIL_TEMPLATE_DEFINITION,
         version=1,
         is_published=True,
         is_template=True
@@ -537,178 +610,316 @@ async def create_reports(db: AsyncSession, users, folders, fields):
     reports.append(detail_template)
     
     db.add_all(reports)
-    await db.commit()
     return reports
 
 
+@lru_cache(maxsize=None)
+def bulk_load_statements(table_name: str, columns: Tuple[str, ...]):
+    """
+    Build the bulk load statements for a table once per process
+    Returns (staging table, CREATE TEMP TABLE, INSERT ... SELECT merge, executemany INSERT)
+    """
+    column_list = ", ".join(columns)
+    placeholders = ", ".join(f":{column}" for column in columns)
+    staging_table = f"seed_{table_name}"
+    
+    create_staging = text(f"CREATE TEMP TABLE {staging_table} (LIKE {table_name}) ON COMMIT DROP")
+    merge_staging = text(f"""
+        INSERT INTO {table_name} ({column_list})
+        SELECT {column_list} FROM {staging_table}
+        ON CONFLICT DO NOTHING
+    """)
+    insert_batch = text(f"""
+        INSERT INTO {table_name} ({column_list})
+        VALUES ({placeholders})
+        ON CONFLICT DO NOTHING
+    """)
+    return staging_table, create_staging, merge_staging, insert_batch
+
+
+async def copy_rows(db: AsyncSession, sample_table: Table, records):
+    """
+    Bulk load rows with COPY on the session's asyncpg connection
+    COPY has no ON CONFLICT, so rows are staged in a temp table and merged
+    with a single INSERT ... SELECT ... ON CONFLICT DO NOTHING
+    Other drivers fall back to one executemany INSERT
+    """
+    columns = tuple(column.name for column in sample_table.columns)
+    staging_table, create_staging, merge_staging, insert_batch = bulk_load_statements(sample_table.name, columns)
+    connection = await db.connection()
+    
+    if connection.dialect.driver != "asyncpg":
+        await db.execute(insert_batch, [dict(zip(columns, record)) for record in records])
+        return
+    
+    await db.execute(create_staging)
+    
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        staging_table, records=records, columns=columns
+    )
+    
+    await db.execute(merge_staging)
+
+
+async def insert_rows(db: AsyncSession, sample_table: Table, records):
+    """Insert a small batch of rows as one multi-VALUES INSERT ... ON CONFLICT DO NOTHING"""
+    columns = [column.name for column in sample_table.columns]
+    await db.execute(
+        pg_insert(sample_table)
+        .values([dict(zip(columns, record)) for record in records])
+        .on_conflict_do_nothing()
+    )
+
+
+async def create_sample_tables(db: AsyncSession):
+    """Create the sample warehouse tables the seeded data sources point at"""
+    await db.run_sync(lambda session: sample_metadata.create_all(session.connection()))
+
+
+async def index_and_analyze_sample_tables(db: AsyncSession):
+    """
+    Build the secondary indexes after the bulk load (one sorted build instead
+    of maintaining the btree row by row) and refresh planner statistics, so
+    the first queries against the fresh data don't get empty-table plans
+    """
+    await db.execute(text("CREATE INDEX IF NOT EXISTS ix_transactions_fund_id ON transactions (fund_id)"))
+    for sample_table in sample_metadata.sorted_tables:
+        await db.execute(text(f"ANALYZE {sample_table.name}"))
+
+
+def fund_time_series_rows(rng: np.random.Generator, fund_ids, trade_dates):
+    """
+    Yield (fund_id, date, nav, return_1d, aum) rows one fund at a time
+    Each fund's NAV is a vectorized random walk (previous day's +/- 2%), so
+    only one fund's arrays are in memory however far the seed is scaled up
+    """
+    n_days = len(trade_dates)
+    for fund_id in fund_ids:
+        nav = (100.0 + rng.uniform(-20, 50)) * np.cumprod(1 + rng.uniform(-0.02, 0.02, size=n_days))
+        return_1d = rng.uniform(-0.02, 0.02, size=n_days)
+        aum = nav * rng.uniform(1_000_000, 10_000_000, size=n_days)
+        yield from zip(repeat(fund_id), trade_dates, nav.tolist(), return_1d.tolist(), aum.tolist())
+
+
 async def create_actual_data_tables(db: AsyncSession):
     """Create actual data tables with sample data for testing"""
-    from sqlalchemy import text
     import random
     from datetime import date, timedelta
     
-    # Create funds table
-    await db.execute(text("""
-        CREATE TABLE IF NOT EXISTS funds (
-            fund_id VARCHAR PRIMARY KEY,
-            fund_name VARCHAR,
-            fund_type VARCHAR,
-            inception_date DATE,
-            manager VARCHAR
-        )
-    """))
-    
-    # Create fund_time_series table
-    await db.execute(text("""
-        CREATE TABLE IF NOT EXISTS fund_time_series (
-            fund_id VARCHAR,
-            date DATE,
-            nav DECIMAL(10,2),
-            return_1d DECIMAL(10,4),
-            aum DECIMAL(15,2),
-            PRIMARY KEY (fund_id, date)
-        )
-    """))
-    
-    # Create benchmarks table
-    await db.execute(text("""
-        CREATE TABLE IF NOT EXISTS benchmarks (
-            benchmark_id VARCHAR PRIMARY KEY,
-            benchmark_name VARCHAR,
-            asset_class VARCHAR
-        )
-    """))
-    
-    # Create transactions table
-    await db.execute(text("""
-        CREATE TABLE IF NOT EXISTS transactions (
-            transaction_id SERIAL PRIMARY KEY,
-            fund_id VARCHAR,
-            transaction_date DATE,
-            transaction_type VARCHAR,
-            amount DECIMAL(15,2)
-        )
-    """))
+    await create_sample_tables(db)
     
-    # Insert sample funds
+    # Generate sample funds
     fund_types = ['Equity', 'Fixed Income', 'Balanced', 'Money Market', 'Alternative']
     managers = ['Alpha Investments', 'Beta Capital', 'Gamma Partners', 'Delta Advisors']
+    n_funds, n_days = 20, 30
+    
+    # Seeded so the sample data is identical between runs
+    sample_random = random.Random(SAMPLE_DATA_SEED)
+    choice, randint = sample_random.choice, sample_random.randint
+    
+    fund_ids = [f'FUND{i:03d}' for i in range(1, n_funds + 1)]
+    fund_rows = [
+        (
+            fund_id,
+            f'Fund {i}',
+            choice(fund_types),
+            date(2020, 1, 1) + timedelta(days=randint(0, 365)),
+            choice(managers)
+        )
+        for i, fund_id in enumerate(fund_ids, start=1)
+    ]
     
-    for i in range(1, 21):  # Create 20 funds
-        fund_id = f'FUND{i:03d}'
-        await db.execute(text("""
-            INSERT INTO funds (fund_id, fund_name, fund_type, inception_date, manager)
-            VALUES (:fund_id, :fund_name, :fund_type, :inception_date, :manager)
-            ON CONFLICT (fund_id) DO NOTHING
-        """), {
-            'fund_id': fund_id,
-            'fund_name': f'Fund {i}',
-            'fund_type': random.choice(fund_types),
-            'inception_date': date(2020, 1, 1) + timedelta(days=random.randint(0, 365)),
-            'manager': random.choice(managers)
-        })
-        
-        # Insert time series data for each fund (last 30 days)
-        base_nav = 100.0 + random.uniform(-20, 50)
-        for days_ago in range(30):
-            trade_date = date.today() - timedelta(days=days_ago)
-            nav = base_nav * (1 + random.uniform(-0.02, 0.02))  # Daily fluctuation
-            return_1d = random.uniform(-0.02, 0.02)
-            aum = nav * random.uniform(1000000, 10000000)
-            
-            await db.execute(text("""
-                INSERT INTO fund_time_series (fund_id, date, nav, return_1d, aum)
-                VALUES (:fund_id, :date, :nav, :return_1d, :aum)
-                ON CONFLICT (fund_id, date) DO NOTHING
-            """), {
-                'fund_id': fund_id,
-                'date': trade_date,
-                'nav': nav,
-                'return_1d': return_1d,
-                'aum': aum
-            })
-            base_nav = nav  # Use previous NAV as base for next day
-    
-    # Insert sample benchmarks
-    benchmarks = [
+    # Time series for the last n_days, yielded lazily so COPY streams it
+    trade_dates = [date.today() - timedelta(days=days_ago) for days_ago in range(n_days)]
+    ts_rows = fund_time_series_rows(np.random.default_rng(SAMPLE_DATA_SEED), fund_ids, trade_dates)
+    
+    # Sample benchmarks
+    benchmark_rows = [
         ('SP500', 'S&P 500 Index', 'Equity'),
         ('AGG', 'Bloomberg Aggregate Bond Index', 'Fixed Income'),
         ('MSCI', 'MSCI World Index', 'Equity')
     ]
     
-    for bench_id, bench_name, asset_class in benchmarks:
-        await db.execute(text("""
-            INSERT INTO benchmarks (benchmark_id, benchmark_name, asset_class)
-            VALUES (:benchmark_id, :benchmark_name, :asset_class)
-            ON CONFLICT (benchmark_id) DO NOTHING
-        """), {
-            'benchmark_id': bench_id,
-            'benchmark_name': bench_name,
-            'asset_class': asset_class
-        })
+    # The small fixed row sets go in as single multi-VALUES INSERTs, which is
+    # one round trip versus three for COPY staging; the time series is COPYed
+    await insert_rows(db, funds_table, fund_rows)
+    await copy_rows(db, fund_time_series_table, ts_rows)
+    await insert_rows(db, benchmarks_table, benchmark_rows)
+    
+    await index_and_analyze_sample_tables(db)
+
+
+def seed_cache_path(cache_dir: str) -> Path:
+    """
+    Dump file for the current seed
+    Keyed on the models and this script, so changing either invalidates it,
+    and on today's date: the fund time series ends at date.today(), so a
+    dump from an earlier day would restore stale trade dates
+    """
+    digest = hashlib.sha256()
+    app_dir = Path(__file__).parent
+    for path in sorted((app_dir / "models").glob("*.py")) + [Path(__file__)]:
+        digest.update(path.read_bytes())
+    return Path(cache_dir) / f"seed-{date.today():%Y%m%d}-{digest.hexdigest()[:16]}.sql.gz"
+
+
+async def run_pg_tool(*args: str, stdin: Optional[bytes] = None) -> bytes:
+    """Run a PostgreSQL client tool against the app database"""
+    url = make_url(str(settings.DATABASE_URL))
+    # Connection parts as separate options and the password through the
+    # environment, so it never shows up in the process list
+    connection_args = []
+    for option, value in (
+        ("--host", url.host), ("--port", url.port), ("--username", url.username), ("--dbname", url.database)
+    ):
+        if value:
+            connection_args += [option, str(value)]
+    env = dict(os.environ)
+    if url.password:
+        env["PGPASSWORD"] = url.password
+    
+    process = await asyncio.create_subprocess_exec(
+        *args, *connection_args,
+        stdin=asyncio.subprocess.PIPE if stdin is not None else None,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env
+    )
+    stdout, stderr = await process.communicate(stdin)
+    if process.returncode != 0:
+        raise RuntimeError(f"{args[0]} failed: {stderr.decode().strip()}")
+    return stdout
+
+
+async def save_seed_dump(dump_path: Path):
+    """Snapshot the freshly seeded data with pg_dump"""
+    dump = await run_pg_tool("pg_dump", "--data-only", "--exclude-table=alembic_version")
+    dump_path.parent.mkdir(parents=True, exist_ok=True)
+    # The key changes daily, so earlier dumps can never be hit again
+    for stale in dump_path.parent.glob("seed-*.sql.gz"):
+        stale.unlink(missing_ok=True)
+    dump_path.write_bytes(gzip.compress(dump))
+
+
+async def restore_seed_dump(dump_path: Path):
+    """Load a cached seed dump instead of regenerating the data"""
+    # The dump is data-only; the sample tables aren't part of the ORM schema
+    async with SeedSessionLocal() as db, db.begin():
+        await create_sample_tables(db)
+    
+    await run_pg_tool(
+        "psql", "--quiet", "--single-transaction", "--set", "ON_ERROR_STOP=1",
+        stdin=gzip.decompress(dump_path.read_bytes())
+    )
     
-    await db.commit()
+    async with SeedSessionLocal() as db, db.begin():
+        await index_and_analyze_sample_tables(db)
+
+
+async def is_seeded(db: AsyncSession) -> bool:
+    """Every seed run creates permissions, so one probe tells a seeded database apart"""
+    async with db.begin():
+        return await db.scalar(text("SELECT 1 FROM permissions LIMIT 1")) is not None
 
 
-async def seed_database():
-    """Main function to seed the database"""
-    async with AsyncSessionLocal() as db:
+async def truncate_seed_tables(db: AsyncSession):
+    """Empty the application and sample tables ahead of a forced reseed"""
+    async with db.begin():
+        await create_sample_tables(db)
+        table_names = ", ".join(
+            t.name for t in [*Base.metadata.sorted_tables, *sample_metadata.sorted_tables]
+        )
+        await db.execute(text(f"TRUNCATE {table_names} RESTART IDENTITY CASCADE"))
+
+
+async def seed_database(force: bool = False):
+    """
+    Main function to seed the database (one transaction for the whole run)
+    Does nothing if the database is already seeded unless force is set, in
+    which case all existing data is truncated first
+    """
+    async with SeedSessionLocal() as db:
         try:
-            print("Starting database seeding...")
-            
-            # Create permissions
-            print("Creating permissions...")
-            permissions = await create_permissions(db)
-            print(f"Created {len(permissions)} permissions")
-            
-            # Create roles
-            print("Creating roles...")
-            roles = await create_roles(db, permissions)
-            print(f"Created {len(roles)} roles")
+            if force:
+                print("Truncating existing data...")
+                await truncate_seed_tables(db)
+            elif await is_seeded(db):
+                print("Database already seeded, skipping (use --force to reseed)")
+                return
             
-            # Create groups
-            print("Creating groups...")
-            groups = await create_groups(db, roles)
-            print(f"Created {len(groups)} groups")
+            # Opt-in: reuse a pg_dump of a previous seed run when nothing changed
+            dump_path = seed_cache_path(SEED_CACHE_DIR) if SEED_CACHE_DIR else None
+            if dump_path and dump_path.exists():
+                print(f"Restoring cached seed data from {dump_path}...")
+                await restore_seed_dump(dump_path)
+                print("\nDatabase seeding completed successfully!")
+                return
             
-            # Create users
-            print("Creating users...")
-            users = await create_users(db, groups)
-            print(f"Created {len(users)} users")
-            
-            # Create data sources
-            print("Creating data sources...")
-            data_sources = await create_data_sources(db)
-            print(f"Created {len(data_sources)} data sources")
-            
-            # Create data tables
-            print("Creating data tables...")
-            tables = await create_data_tables(db, data_sources)
-            print(f"Created {len(tables)} tables")
-            
-            # Create fields
-            print("Creating fields...")
-            fields = await create_fields(db, tables)
-            print(f"Created {len(fields)} fields")
-            
-            # Create field relationships
-            print("Creating field relationships...")
-            await create_field_relationships(db, fields)
+            print("Starting database seeding...")
             
-            # Create folders
-            print("Creating folders...")
-            folders = await create_folders(db, users)
-            print(f"Created {len(folders)} folders")
+            # Password hashing doesn't touch the database, so start it now and
+            # let it run while the permissions, roles and groups are inserted
+            password_hashes = asyncio.create_task(hash_user_passwords())
             
-            # Create reports
-            print("Creating reports...")
-            reports = await create_reports(db, users, folders, fields)
-            print(f"Created {len(reports)} reports")
+            async with db.begin():
+                # Create permissions
+                print("Creating permissions...")
+                permissions = await create_permissions(db)
+                print(f"Created {len(permissions)} permissions")
+                
+                # Create roles
+                print("Creating roles...")
+                roles = await create_roles(db, permissions)
+                print(f"Created {len(roles)} roles")
+                
+                # Create groups
+                print("Creating groups...")
+                groups = await create_groups(db, roles)
+                print(f"Created {len(groups)} groups")
+                
+                # Create users
+                print("Creating users...")
+                users = await create_users(db, groups, await password_hashes)
+                print(f"Created {len(users)} users")
+                
+                # Create data sources
+                print("Creating data sources...")
+                data_sources = await create_data_sources(db)
+                print(f"Created {len(data_sources)} data sources")
+                
+                # Create data tables
+                print("Creating data tables...")
+                tables = await create_data_tables(db, data_sources)
+                print(f"Created {len(tables)} tables")
+                
+                # Create fields
+                print("Creating fields...")
+                field_ids = await create_fields(db, tables)
+                print(f"Created {len(field_ids)} fields")
+                
+                # Create field relationships
+                print("Creating field relationships...")
+                await create_field_relationships(db, field_ids, tables)
+                
+                # Create folders
+                print("Creating folders...")
+                folders = await create_folders(db, users)
+                print(f"Created {len(folders)} folders")
+                
+                # Create reports
+                print("Creating reports...")
+                reports = await create_reports(db, users, folders, field_ids)
+                print(f"Created {len(reports)} reports")
+                
+                # Create actual data tables with sample data
+                print("Creating actual data tables...")
+                await create_actual_data_tables(db)
+                print("Created actual data tables with sample data")
             
-            # Create actual data tables with sample data
-            print("Creating actual data tables...")
-            await create_actual_data_tables(db)
-            print("Created actual data tables with sample data")
+            if dump_path:
+                await save_seed_dump(dump_path)
+                print(f"Cached seed data in {dump_path}")
             
             print("\nDatabase seeding completed successfully!")
             print("\nTest Users:")
@@ -717,10 +928,15 @@ async def seed_database():
             print("  Viewer: viewer@boe-system.local / viewer123")
             
         except Exception as e:
+            # db.begin() has already rolled the transaction back
             print(f"Error seeding database: {e}")
-            await db.rollback()
             raise
+        finally:
+            await seed_engine.dispose()
 
 
 if __name__ == "__main__":
-    asyncio.run(seed_database())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Seed the database with test data")
+    parser.add_argument("--force", action="store_true", help="truncate all existing data and reseed")
+    args = parser.parse_args()
+    asyncio.run(seed_database(force=args.force))
\ No newline at end of file
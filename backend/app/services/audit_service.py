@@ -3,17 +3,266 @@ Audit Service for logging user actions
 Supports both database and external logging (ElasticSearch)
 """
 
-from typing import Optional, Dict, Any
+import asyncio
+import random
+from contextlib import suppress
+from typing import Optional, Dict, Any, List, Tuple
 from uuid import UUID
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from sqlalchemy import event, insert, text
 from sqlalchemy.ext.asyncio import AsyncSession
-import json
+from sqlalchemy.orm import Session
 import logging
 from app.models import AuditLog, User
+from app.models.user import USER_AGENT_MAX_LENGTH
 from app.core.config import settings
+from app.core.database import AsyncSessionLocal
 
 logger = logging.getLogger(__name__)
 
+# Monthly audit_logs partitions are named audit_logs_pYYYYMM
+AUDIT_PARTITION_PREFIX = "audit_logs_p"
+# Catch-all partition for rows outside every monthly range
+AUDIT_DEFAULT_PARTITION = "audit_logs_default"
+
+# Session.info key holding audit entries that wait for the caller's commit
+DEFERRED_AUDIT_KEY = "deferred_audit_entries"
+
+
+def _add_months(month: date, months: int) -> date:
+    """First day of the month `months` after the given month"""
+    years, month_index = divmod(month.month - 1 + months, 12)
+    return date(month.year + years, month_index + 1, 1)
+
+
+async def bulk_index(es_client, actions: List[Dict[str, Any]]) -> None:
+    """Send audit documents to ElasticSearch through the bulk helper"""
+    from elasticsearch.helpers import async_bulk
+    
+    _, errors = await async_bulk(
+        es_client,
+        actions,
+        chunk_size=settings.ELASTICSEARCH_BULK_BATCH_SIZE,
+        max_chunk_bytes=settings.ELASTICSEARCH_BULK_MAX_BYTES,
+        raise_on_error=False
+    )
+    if errors:
+        logger.error(f"ElasticSearch bulk indexing failed for {len(errors)} audit documents")
+
+
+class AuditWriter:
+    """
+    Buffers audit entries in memory and writes them in bulk from a background
+    task: one INSERT for the database rows and one bulk request per
+    ElasticSearch client, so logging an action doesn't cost a round trip
+    Entries reach the writer only once the caller's transaction has committed
+    (see defer_until_commit), so rolled-back actions are never audited
+    """
+    
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        batch_size: int = settings.AUDIT_BULK_SIZE,
+        flush_interval: float = settings.AUDIT_FLUSH_MS / 1000,
+        max_queue_size: int = settings.AUDIT_QUEUE_MAX_SIZE
+    ):
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # (row, es_action, es_client) entries taken off the queue but whose
+        # rows are not yet committed; survives cancellation
+        self._pending: List[tuple] = []
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def has_room(self, count: int) -> bool:
+        """True if the writer is running and can queue `count` more entries"""
+        return self.running and (
+            self._queue.maxsize <= 0 or self._queue.maxsize - self._queue.qsize() >= count
+        )
+    
+    def start(self) -> None:
+        """Start the background writer on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the background writer and write out anything still buffered"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        
+        while not self._queue.empty():
+            self._pending.append(self._queue.get_nowait())
+        if self._pending:
+            await self._write_pending()
+    
+    def submit(
+        self,
+        row: Optional[Dict[str, Any]] = None,
+        es_action: Optional[Dict[str, Any]] = None,
+        es_client=None
+    ) -> bool:
+        """
+        Queue an audit_logs row and/or an ElasticSearch bulk action for the next batch
+        Returns False if the writer isn't running or the buffer is full
+        """
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait((row, es_action, es_client))
+        except asyncio.QueueFull:
+            return False
+        return True
+    
+    async def _run(self) -> None:
+        while True:
+            await self._fill_batch()
+            await self._write_pending()
+    
+    async def _fill_batch(self) -> None:
+        """Wait for a first row, then collect until batch_size or flush_interval"""
+        loop = asyncio.get_running_loop()
+        self._pending.append(await self._queue.get())
+        deadline = loop.time() + self.flush_interval
+        
+        while len(self._pending) < self.batch_size:
+            if not self._queue.empty():
+                self._pending.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                self._pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+    
+    async def _write_pending(self) -> None:
+        """
+        Write out the buffered entries. _pending is cleared as soon as the rows
+        are committed, so a cancellation during the ElasticSearch requests can't
+        make stop() insert them twice (those documents are dropped instead)
+        """
+        rows = []
+        actions_by_client = {}
+        for row, es_action, es_client in self._pending:
+            if row is not None:
+                rows.append(row)
+            if es_action is not None:
+                actions_by_client.setdefault(es_client, []).append(es_action)
+        
+        if rows:
+            await self._insert_rows(rows)
+        self._pending = []
+        
+        for es_client, actions in actions_by_client.items():
+            try:
+                await bulk_index(es_client, actions)
+            except Exception as e:
+                logger.error(f"Failed to index {len(actions)} buffered audit entries: {e}")
+    
+    async def _insert_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert a batch; if it fails, retry row by row so one bad row only loses itself"""
+        try:
+            async with self._session_factory() as session, session.begin():
+                # Don't wait for the WAL fsync on these commits: a crash can
+                # lose the last few hundred ms of buffered audit rows (which
+                # an in-memory buffer risks anyway, and the ElasticSearch
+                # copy covers), never corrupt them. Scoped to this transaction
+                await session.execute(text("SET LOCAL synchronous_commit = OFF"))
+                # executemany form - batched into multi-VALUES statements by the engine
+                await session.execute(insert(AuditLog), rows)
+            return
+        except Exception as e:
+            if len(rows) == 1:
+                logger.error(f"Failed to write buffered audit entry: {e}")
+                return
+            logger.warning(f"Bulk write of {len(rows)} audit entries failed, retrying row by row: {e}")
+        
+        failed = 0
+        try:
+            async with self._session_factory() as session, session.begin():
+                await session.execute(text("SET LOCAL synchronous_commit = OFF"))
+                for row in rows:
+                    try:
+                        # A savepoint per row keeps the good rows of the batch
+                        async with session.begin_nested():
+                            await session.execute(insert(AuditLog), row)
+                    except Exception as e:
+                        failed += 1
+                        logger.error(f"Dropping audit entry {row.get('action')!r}: {e}")
+        except Exception as e:
+            logger.error(f"Failed to write {len(rows)} buffered audit entries: {e}")
+            return
+        if failed:
+            logger.error(f"Dropped {failed} of {len(rows)} buffered audit entries")
+
+
+# Global instance, started and stopped by the application lifespan
+audit_writer = AuditWriter()
+
+
+def defer_until_commit(
+    db: AsyncSession,
+    row: Optional[Dict[str, Any]] = None,
+    es_action: Optional[Dict[str, Any]] = None,
+    es_client=None
+) -> None:
+    """
+    Hold an audit entry on the caller's session and hand it to the writer when
+    the session's transaction commits; a rollback (or closing the session
+    without committing) discards it
+    """
+    session = getattr(db, "sync_session", db)
+    if not session.in_transaction():
+        # Tie the entry to a transaction now, so a rollback before any other
+        # statement still discards it (no connection is acquired yet)
+        session.begin()
+    session.info.setdefault(DEFERRED_AUDIT_KEY, []).append((row, es_action, es_client))
+
+
+@event.listens_for(Session, "before_commit")
+def _write_deferred_rows_inline(session: Session) -> None:
+    """If the writer can't take the entries, insert the rows in the committing transaction"""
+    entries = session.info.get(DEFERRED_AUDIT_KEY)
+    if not entries or audit_writer.has_room(len(entries)):
+        return
+    rows = [row for row, _, _ in entries if row is not None]
+    if rows:
+        # Runs inside the AsyncSession's greenlet, so the sync API can emit SQL
+        session.execute(insert(AuditLog), rows)
+    session.info[DEFERRED_AUDIT_KEY] = [
+        (None, es_action, es_client) for _, es_action, es_client in entries if es_action is not None
+    ]
+
+
+@event.listens_for(Session, "after_commit")
+def _submit_deferred(session: Session) -> None:
+    entries = session.info.pop(DEFERRED_AUDIT_KEY, None)
+    if not entries:
+        return
+    dropped = sum(not audit_writer.submit(*entry) for entry in entries)
+    if dropped:
+        logger.error(f"Audit buffer full, dropped {dropped} committed audit entries")
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_deferred(session: Session, transaction) -> None:
+    # Still present when the outermost transaction ends: it was rolled back
+    if transaction.parent is None:
+        session.info.pop(DEFERRED_AUDIT_KEY, None)
+
 
 class AuditService:
     """
@@ -47,7 +296,7 @@ class AuditService:
         details: Optional[Dict[str, Any]] = None,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None
-    ) -> Optional[AuditLog]:
+    ) -> None:
         """
         Log a user action
         
@@ -59,82 +308,98 @@ class AuditService:
             details: Additional details about the action
             ip_address: Client IP address
             user_agent: Client user agent
-            
-        Returns:
-            Created audit log entry (if DB logging enabled)
         """
-        audit_entry = None
-        
-        # Prepare log data
-        log_data = {
-            "user_id": str(user.id),
-            "username": user.username,
-            "action": action,
-            "resource_type": resource_type,
-            "resource_id": str(resource_id) if resource_id else None,
-            "details": details or {},
-            "ip_address": ip_address,
-            "user_agent": user_agent,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        # One clock read shared by the database row and the ElasticSearch document
+        now = datetime.utcnow()
         
-        # Log to database
+        # Log to database - buffered for a bulk INSERT after the caller commits
+        # when the writer is running, otherwise (Celery workers, scripts) inline
         if self.enable_db_logging:
-            try:
-                audit_entry = AuditLog(
-                    user_id=user.id,
-                    action=action,
-                    resource_type=resource_type,
-                    resource_id=resource_id,
-                    details=json.dumps(details) if details else None,
-                    ip_address=ip_address,
-                    user_agent=user_agent,
-                    timestamp=datetime.utcnow()
-                )
-                self.db.add(audit_entry)
-                # Note: Don't commit here, let the calling service handle transaction
-                await self.db.flush()
-                
-            except Exception as e:
-                logger.error(f"Failed to log audit to database: {e}")
-        
-        # Log to ElasticSearch
+            row = {
+                "user_id": user.id,
+                "action": action,
+                "resource_type": resource_type,
+                "resource_id": resource_id,
+                "details": details or None,
+                "ip_address": ip_address,
+                "user_agent": user_agent[:USER_AGENT_MAX_LENGTH] if user_agent else None,
+                # Stamped now; the buffered INSERT may run a little later
+                "timestamp": now
+            }
+            if audit_writer.running:
+                defer_until_commit(self.db, row=row)
+            else:
+                try:
+                    # Core INSERT on the caller's transaction - no ORM object,
+                    # identity map entry or unit-of-work flush
+                    # Note: Don't commit here, let the calling service handle transaction
+                    await self.db.execute(insert(AuditLog), row)
+                    
+                except Exception as e:
+                    logger.error(f"Failed to log audit to database: {e}")
+        
+        # Log to ElasticSearch - buffered into the writer's bulk requests too
         if self.enable_es_logging and self.es_client:
-            try:
-                await self._log_to_elasticsearch(log_data)
-            except Exception as e:
-                logger.error(f"Failed to log audit to ElasticSearch: {e}")
+            log_data = {
+                "user_id": str(user.id),
+                "username": user.username,
+                "action": action,
+                "resource_type": resource_type,
+                "resource_id": str(resource_id) if resource_id else None,
+                "details": details or {},
+                "ip_address": ip_address,
+                "user_agent": user_agent
+            }
+            es_action = self._elasticsearch_action(log_data, now)
+            if audit_writer.running:
+                defer_until_commit(self.db, es_action=es_action, es_client=self.es_client)
+            else:
+                try:
+                    await self._log_to_elasticsearch(es_action)
+                except Exception as e:
+                    logger.error(f"Failed to log audit to ElasticSearch: {e}")
+        
+        # Also log to application logger for debugging - sampled, and only
+        # formatted when INFO is actually enabled
+        if logger.isEnabledFor(logging.INFO) and (
+            settings.AUDIT_LOG_SAMPLE_RATE >= 1.0 or random.random() < settings.AUDIT_LOG_SAMPLE_RATE
+        ):
+            logger.info(
+                "Audit: User %s performed %s on %s:%s",
+                user.username, action, resource_type, resource_id
+            )
+    
+    def _elasticsearch_action(self, log_data: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        """
+        Build the bulk action for an audit document
         
-        # Also log to application logger for debugging
-        logger.info(f"Audit: User {user.username} performed {action} on {resource_type}:{resource_id}")
+        Args:
+            log_data: Audit log data
+            now: Time the action was logged
+        """
+        # Add metadata (one isoformat for both timestamp fields)
+        log_data["timestamp"] = log_data["@timestamp"] = now.isoformat()
+        log_data["environment"] = settings.ENVIRONMENT  # dev/staging/prod
+        log_data["application"] = "boe-backend"
         
-        return audit_entry
+        return {
+            # Index name with date for automatic rotation
+            "_index": f"boe-audit-{now.year}.{now.month:02d}",
+            "_source": log_data
+        }
     
-    async def _log_to_elasticsearch(self, log_data: Dict[str, Any]):
+    async def _log_to_elasticsearch(self, es_action: Dict[str, Any]):
         """
-        Log audit data to ElasticSearch
+        Index an audit document right away (when the audit writer can't take it)
         
         Args:
-            log_data: Audit log data
+            es_action: Bulk action from _elasticsearch_action
         """
         if not self.es_client:
             return
         
         try:
-            # Index name with date for automatic rotation
-            index_name = f"boe-audit-{datetime.utcnow().strftime('%Y.%m')}"
-            
-            # Add metadata
-            log_data["@timestamp"] = datetime.utcnow().isoformat()
-            log_data["environment"] = settings.ENVIRONMENT  # dev/staging/prod
-            log_data["application"] = "boe-backend"
-            
-            # Index document
-            await self.es_client.index(
-                index=index_name,
-                body=log_data
-            )
-            
+            await bulk_index(self.es_client, [es_action])
         except Exception as e:
             logger.error(f"ElasticSearch indexing failed: {e}")
     
@@ -146,10 +411,11 @@ class AuditService:
         resource_id: Optional[UUID] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        limit: int = 100
+        limit: int = 100,
+        before: Optional[Tuple[datetime, UUID]] = None
     ) -> list:
         """
-        Query audit logs with filters
+        Query audit logs with filters, newest first
         
         Args:
             user_id: Filter by user
@@ -159,11 +425,13 @@ class AuditService:
             start_date: Start date filter
             end_date: End date filter
             limit: Maximum results
+            before: (timestamp, id) of the last entry of the previous page;
+                the next page starts right after it
             
         Returns:
             List of audit log entries
         """
-        from sqlalchemy import select, and_
+        from sqlalchemy import select, and_, or_
         
         query = select(AuditLog)
         filters = []
@@ -186,10 +454,21 @@ class AuditService:
         if end_date:
             filters.append(AuditLog.timestamp <= end_date)
         
+        # Keyset pagination: seek past the previous page through the timestamp
+        # indexes instead of reading and discarding the rows before it; id
+        # breaks ties between entries logged at the same instant
+        if before:
+            before_timestamp, before_id = before
+            filters.append(AuditLog.timestamp <= before_timestamp)
+            filters.append(or_(
+                AuditLog.timestamp < before_timestamp,
+                AuditLog.id < before_id
+            ))
+        
         if filters:
             query = query.where(and_(*filters))
         
-        query = query.order_by(AuditLog.timestamp.desc()).limit(limit)
+        query = query.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).limit(limit)
         
         result = await self.db.execute(query)
         return result.scalars().all()
@@ -209,37 +488,34 @@ class AuditService:
         Returns:
             Activity summary
         """
-        from sqlalchemy import select, func
+        from sqlalchemy import select, func, and_
         from datetime import timedelta
         
-        start_date = datetime.utcnow() - timedelta(days=days)
+        end_date = datetime.utcnow()
+        start_date = end_date - timedelta(days=days)
         
-        # Count actions by type
+        # Count actions by type, with ROLLUP adding the grand total (the row
+        # with a NULL action) - one pass over the index instead of two queries
         query = (
             select(
                 AuditLog.action,
-                func.count(AuditLog.id).label("count")
+                func.count().label("count")
             )
             .where(and_(
                 AuditLog.user_id == user_id,
                 AuditLog.timestamp >= start_date
             ))
-            .group_by(AuditLog.action)
+            .group_by(func.rollup(AuditLog.action))
         )
         
         result = await self.db.execute(query)
-        action_counts = {row.action: row.count for row in result}
-        
-        # Get total actions
-        total_query = (
-            select(func.count(AuditLog.id))
-            .where(and_(
-                AuditLog.user_id == user_id,
-                AuditLog.timestamp >= start_date
-            ))
-        )
-        
-        total_actions = await self.db.scalar(total_query)
+        action_counts = {}
+        total_actions = 0
+        for row in result:
+            if row.action is None:
+                total_actions = row.count
+            else:
+                action_counts[row.action] = row.count
         
         return {
             "user_id": str(user_id),
@@ -247,31 +523,131 @@ class AuditService:
             "total_actions": total_actions or 0,
             "actions_by_type": action_counts,
             "start_date": start_date.isoformat(),
-            "end_date": datetime.utcnow().isoformat()
+            "end_date": end_date.isoformat()
         }
     
+    async def create_partitions(
+        self,
+        months_ahead: int = settings.AUDIT_PARTITION_MONTHS_AHEAD
+    ) -> int:
+        """
+        Make sure the monthly audit_logs partitions exist through months_ahead
+        
+        Args:
+            months_ahead: Months after the current one to create
+            
+        Returns:
+            Number of partitions created
+        """
+        existing = {name for name, _ in await self._list_partitions()}
+        has_default = await self._has_default_partition()
+        month = datetime.utcnow().date().replace(day=1)
+        created = 0
+        
+        for _ in range(months_ahead + 1):
+            next_month = _add_months(month, 1)
+            name = f"{AUDIT_PARTITION_PREFIX}{month:%Y%m}"
+            if name not in existing:
+                try:
+                    async with self.db.begin_nested():
+                        await self._create_partition(name, month, next_month, has_default)
+                    created += 1
+                except Exception as e:
+                    logger.error(f"Failed to create audit partition {name}: {e}")
+            month = next_month
+        
+        await self.db.commit()
+        return created
+    
+    async def _create_partition(self, name: str, month: date, next_month: date, has_default: bool) -> None:
+        """
+        Create one monthly partition. Postgres refuses to create it while the
+        default partition holds rows in its range (a DB built from metadata
+        starts with only the default one), so those rows are moved over with
+        the default partition detached, then it is re-attached
+        """
+        bounds = f"timestamp >= '{month}' AND timestamp < '{next_month}'"
+        move_rows = False
+        if has_default:
+            stranded = await self.db.execute(text(
+                f"SELECT EXISTS (SELECT 1 FROM {AUDIT_DEFAULT_PARTITION} WHERE {bounds})"
+            ))
+            move_rows = stranded.scalar()
+        
+        if move_rows:
+            await self.db.execute(text(f"ALTER TABLE audit_logs DETACH PARTITION {AUDIT_DEFAULT_PARTITION}"))
+        await self.db.execute(text(
+            f"CREATE TABLE {name} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month}') TO ('{next_month}')"
+        ))
+        if move_rows:
+            await self.db.execute(text(
+                f"INSERT INTO {name} SELECT * FROM {AUDIT_DEFAULT_PARTITION} WHERE {bounds}"
+            ))
+            await self.db.execute(text(f"DELETE FROM {AUDIT_DEFAULT_PARTITION} WHERE {bounds}"))
+            await self.db.execute(text(f"ALTER TABLE audit_logs ATTACH PARTITION {AUDIT_DEFAULT_PARTITION} DEFAULT"))
+    
+    async def _has_default_partition(self) -> bool:
+        result = await self.db.execute(text("""
+            SELECT EXISTS (
+                SELECT 1 FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'audit_logs'::regclass AND c.relname = :name
+            )
+        """), {"name": AUDIT_DEFAULT_PARTITION})
+        return result.scalar()
+    
+    async def _list_partitions(self) -> List[Tuple[str, date]]:
+        """(name, first day of month) for each monthly audit_logs partition"""
+        result = await self.db.execute(text("""
+            SELECT c.relname
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'audit_logs'::regclass
+        """))
+        partitions = []
+        for name in result.scalars():
+            suffix = name[len(AUDIT_PARTITION_PREFIX):]
+            if name.startswith(AUDIT_PARTITION_PREFIX) and len(suffix) == 6 and suffix.isdigit():
+                partitions.append((name, date(int(suffix[:4]), int(suffix[4:]), 1)))
+        return partitions
+    
     async def cleanup_old_logs(
         self,
-        retention_days: int = 90
+        retention_days: int = settings.AUDIT_RETENTION_DAYS
     ) -> int:
         """
-        Clean up old audit logs
+        Clean up old audit logs by dropping monthly partitions that are
+        entirely older than the retention period (no row-level DELETE, so
+        it's instant and leaves no bloat); rows in a partially expired
+        month stay until the whole month ages out. Expired rows that landed
+        in the default partition are deleted with the same month boundary
         
         Args:
             retention_days: Number of days to retain logs
             
         Returns:
-            Number of deleted entries
+            Number of partitions dropped
         """
-        from sqlalchemy import delete
-        
         cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
         
-        stmt = delete(AuditLog).where(AuditLog.timestamp < cutoff_date)
-        result = await self.db.execute(stmt)
+        dropped = []
+        for name, month in await self._list_partitions():
+            if datetime.combine(_add_months(month, 1), datetime.min.time()) <= cutoff_date:
+                await self.db.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+        
+        deleted = 0
+        if await self._has_default_partition():
+            # Start of the month the cutoff falls in, the first one not entirely expired
+            cutoff_month = datetime.combine(cutoff_date.date().replace(day=1), datetime.min.time())
+            result = await self.db.execute(
+                text(f"DELETE FROM {AUDIT_DEFAULT_PARTITION} WHERE timestamp < :cutoff"),
+                {"cutoff": cutoff_month}
+            )
+            deleted = result.rowcount
         await self.db.commit()
         
-        deleted_count = result.rowcount
-        logger.info(f"Cleaned up {deleted_count} audit logs older than {retention_days} days")
+        logger.info(f"Dropped audit log partitions older than {retention_days} days: {dropped}")
+        if deleted:
+            logger.info(f"Deleted {deleted} expired audit entries from {AUDIT_DEFAULT_PARTITION}")
         
-        return deleted_count
\ No newline at end of file
+        return len(dropped)
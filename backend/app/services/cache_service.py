@@ -2,11 +2,15 @@
 Caching service for improving performance of frequently accessed data
 """
 
-import json
+import asyncio
+import fnmatch
+import heapq
 import logging
-from typing import Optional, Any, Dict, List, Callable
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from typing import Optional, Any, Dict, List, Callable, Tuple
 import hashlib
+import orjson
 import redis.asyncio as redis
 from functools import wraps
 
@@ -14,13 +18,39 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Max entries in the in-process cache before LRU eviction
+LOCAL_CACHE_MAX_SIZE = 10000
+
+# Seconds a value read from or written to Redis is also kept in-process, so
+# hot keys skip the Redis round trip (bounds staleness across workers:
+# deletes only clear the local L1, so caches that are invalidated on writes
+# set l1_ttl = 0)
+L1_TTL = 5
+
+# Sentinel for a local cache miss (None is a cacheable value)
+_MISSING = object()
+
+
+def _serialize(value: Any) -> bytes:
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
 
 class CacheService:
     """Service for caching frequently accessed data with Redis"""
     
+    # Seconds values stay in the in-process L1 in front of Redis
+    l1_ttl = L1_TTL
+    
     def __init__(self):
         self._redis_client = None
-        self._local_cache = {}  # Fallback in-memory cache
+        # In-process cache - the L1 in front of Redis, or the whole cache when
+        # Redis is unavailable: key -> (value, expires), in LRU order, plus
+        # a min-heap of (expires, key) so expiry never scans the whole cache
+        self._local_cache: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # cache_result computations in progress, so concurrent misses on the
+        # same key wait for one result instead of all running the function
+        self._inflight: Dict[str, asyncio.Future] = {}
         self._cache_stats = {
             'hits': 0,
             'misses': 0,
@@ -31,10 +61,10 @@ class CacheService:
         """Get or create Redis connection"""
         if not self._redis_client:
             try:
+                # Values are orjson bytes both ways, so no str decoding
                 self._redis_client = await redis.from_url(
                     settings.REDIS_URL,
-                    encoding="utf-8",
-                    decode_responses=True
+                    decode_responses=False
                 )
             except Exception as e:
                 logger.error(f"Redis connection failed for cache: {e}")
@@ -43,16 +73,20 @@ class CacheService:
     
     def _generate_cache_key(self, prefix: str, params: Dict[str, Any]) -> str:
         """Generate a cache key from prefix and parameters"""
-        # Sort params for consistent key generation
-        sorted_params = sorted(params.items())
-        param_str = json.dumps(sorted_params, sort_keys=True, default=str)
+        # Sorted keys (nested ones too) for consistent key generation
+        param_bytes = orjson.dumps(
+            params,
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
         
-        # Create hash for long parameter strings
-        if len(param_str) > 200:
-            param_hash = hashlib.md5(param_str.encode()).hexdigest()
+        # Hash long parameter strings - not a security boundary, so a fast
+        # 128-bit BLAKE2b rather than MD5
+        if len(param_bytes) > 200:
+            param_hash = hashlib.blake2b(param_bytes, digest_size=16).hexdigest()
             return f"{prefix}:{param_hash}"
         
-        return f"{prefix}:{param_str}"
+        return f"{prefix}:{param_bytes.decode()}"
     
     async def get(
         self, 
@@ -60,24 +94,30 @@ class CacheService:
         default: Any = None,
         deserialize: bool = True
     ) -> Any:
-        """Get value from cache"""
-        client = await self._get_redis()
-        
+        """Get value from cache (raw bytes from Redis if deserialize is False)"""
         try:
+            if deserialize:
+                value = self._get_local(key)
+                if value is not _MISSING:
+                    self._cache_stats['hits'] += 1
+                    return value
+            
+            client = await self._get_redis()
             if client:
                 value = await client.get(key)
                 if value is not None:
                     self._cache_stats['hits'] += 1
-                    return json.loads(value) if deserialize else value
-            else:
-                # Fallback to local cache
-                if key in self._local_cache:
-                    entry = self._local_cache[key]
-                    if entry['expires'] > datetime.utcnow():
-                        self._cache_stats['hits'] += 1
-                        return entry['value']
-                    else:
-                        del self._local_cache[key]
+                    if not deserialize:
+                        return value
+                    value = orjson.loads(value)
+                    self._set_l1(key, value, self.l1_ttl)
+                    return value
+            elif not deserialize:
+                # Without Redis the local cache holds values as they were set
+                value = self._get_local(key)
+                if value is not _MISSING:
+                    self._cache_stats['hits'] += 1
+                    return value
             
             self._cache_stats['misses'] += 1
             return default
@@ -98,27 +138,19 @@ class CacheService:
         client = await self._get_redis()
         
         try:
-            value_str = json.dumps(value, default=str) if serialize else value
-            
             if client:
-                await client.setex(key, ttl, value_str)
+                if serialize:
+                    data = _serialize(value)
+                    await client.setex(key, ttl, data)
+                    # L1 keeps the round-tripped copy: same shape as a Redis
+                    # read, and nothing shared with the caller's object
+                    self._set_l1(key, orjson.loads(data), ttl)
+                else:
+                    await client.setex(key, ttl, value)
+                    self._local_cache.pop(key, None)
             else:
                 # Fallback to local cache
-                self._local_cache[key] = {
-                    'value': value,
-                    'expires': datetime.utcnow() + timedelta(seconds=ttl)
-                }
-                
-                # Limit local cache size
-                if len(self._local_cache) > 1000:
-                    # Remove expired entries
-                    now = datetime.utcnow()
-                    expired_keys = [
-                        k for k, v in self._local_cache.items()
-                        if v['expires'] < now
-                    ]
-                    for k in expired_keys:
-                        del self._local_cache[k]
+                self._set_local(key, value, ttl)
             
             return True
             
@@ -127,6 +159,105 @@ class CacheService:
             self._cache_stats['errors'] += 1
             return False
     
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several values in one round trip (MGET); missing keys are left out"""
+        if not keys:
+            return {}
+        
+        try:
+            found = {}
+            remote_keys = []
+            for key in keys:
+                value = self._get_local(key)
+                if value is not _MISSING:
+                    found[key] = value
+                else:
+                    remote_keys.append(key)
+            
+            client = await self._get_redis() if remote_keys else None
+            if client:
+                for key, value in zip(remote_keys, await client.mget(remote_keys)):
+                    if value is not None:
+                        found[key] = value = orjson.loads(value)
+                        self._set_l1(key, value, self.l1_ttl)
+            
+            self._cache_stats['hits'] += len(found)
+            self._cache_stats['misses'] += len(keys) - len(found)
+            return found
+            
+        except Exception as e:
+            logger.error(f"Cache get_many error for {len(keys)} keys: {e}")
+            self._cache_stats['errors'] += 1
+            return {}
+    
+    async def set_many(self, items: List[Tuple[str, Any, int]]) -> bool:
+        """Set several (key, value, ttl) entries in one pipelined round trip"""
+        if not items:
+            return True
+        client = await self._get_redis()
+        
+        try:
+            if client:
+                encoded = [(key, _serialize(value), ttl) for key, value, ttl in items]
+                async with client.pipeline(transaction=False) as pipe:
+                    for key, data, ttl in encoded:
+                        pipe.setex(key, ttl, data)
+                    await pipe.execute()
+                for key, data, ttl in encoded:
+                    self._set_l1(key, orjson.loads(data), ttl)
+            else:
+                for key, value, ttl in items:
+                    self._set_local(key, value, ttl)
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Cache set_many error for {len(items)} keys: {e}")
+            self._cache_stats['errors'] += 1
+            return False
+    
+    def _get_local(self, key: str) -> Any:
+        entry = self._local_cache.get(key)
+        if entry is None:
+            return _MISSING
+        value, expires = entry
+        if expires <= time.monotonic():
+            del self._local_cache[key]
+            return _MISSING
+        self._local_cache.move_to_end(key)
+        return value
+    
+    def _set_l1(self, key: str, value: Any, ttl: int) -> None:
+        """Keep a value that is in Redis in-process for at most l1_ttl seconds"""
+        if self.l1_ttl > 0:
+            self._set_local(key, value, min(ttl, self.l1_ttl))
+        else:
+            self._local_cache.pop(key, None)
+    
+    def _set_local(self, key: str, value: Any, ttl: int) -> None:
+        now = time.monotonic()
+        expires = now + ttl
+        self._local_cache[key] = (value, expires)
+        self._local_cache.move_to_end(key)
+        heapq.heappush(self._expiry_heap, (expires, key))
+        
+        # Drop expired entries from the front of the heap; a heap entry whose
+        # key was since re-set or deleted is stale and just discarded
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            heap_expires, heap_key = heapq.heappop(self._expiry_heap)
+            entry = self._local_cache.get(heap_key)
+            if entry is not None and entry[1] == heap_expires:
+                del self._local_cache[heap_key]
+        
+        # Limit local cache size - evict least recently used
+        while len(self._local_cache) > LOCAL_CACHE_MAX_SIZE:
+            self._local_cache.popitem(last=False)
+        
+        # Keep stale heap entries from piling up when keys are rewritten
+        if len(self._expiry_heap) > 2 * LOCAL_CACHE_MAX_SIZE:
+            self._expiry_heap = [(expires, k) for k, (_, expires) in self._local_cache.items()]
+            heapq.heapify(self._expiry_heap)
+    
     async def delete(self, key: str) -> bool:
         """Delete value from cache"""
         client = await self._get_redis()
@@ -135,8 +266,7 @@ class CacheService:
             if client:
                 await client.delete(key)
             
-            if key in self._local_cache:
-                del self._local_cache[key]
+            self._local_cache.pop(key, None)
             
             return True
             
@@ -151,28 +281,33 @@ class CacheService:
         
         try:
             if client:
-                # Use SCAN instead of KEYS for production safety
-                cursor = 0
-                while True:
-                    cursor, keys = await client.scan(
-                        cursor, 
-                        match=pattern,
-                        count=100
-                    )
-                    if keys:
-                        deleted += await client.delete(*keys)
-                    if cursor == 0:
-                        break
+                # Use SCAN instead of KEYS for production safety; UNLINK frees
+                # the values in the background instead of blocking Redis, and
+                # the UNLINKs ride one pipeline sent after the scan finishes
+                async with client.pipeline(transaction=False) as pipe:
+                    cursor = 0
+                    while True:
+                        cursor, keys = await client.scan(
+                            cursor, 
+                            match=pattern,
+                            count=1000
+                        )
+                        if keys:
+                            pipe.unlink(*keys)
+                        if cursor == 0:
+                            break
+                    deleted += sum(await pipe.execute())
             
-            # Also clear from local cache
-            pattern_prefix = pattern.replace('*', '')
+            # Also clear from local cache (fnmatch globs match Redis MATCH
+            # patterns closely enough for the key shapes used here)
             local_deleted = [
                 k for k in self._local_cache.keys()
-                if k.startswith(pattern_prefix)
+                if fnmatch.fnmatchcase(k, pattern)
             ]
             for k in local_deleted:
                 del self._local_cache[k]
-                deleted += 1
+            if not client:
+                deleted += len(local_deleted)
             
             return deleted
             
@@ -219,13 +354,32 @@ class CacheService:
                 if cached_value is not None:
                     return cached_value
                 
-                # Execute function
-                result = await func(*args, **kwargs)
-                
-                # Cache result
-                await self.set(cache_key, result, ttl)
+                # Another caller is already computing this key - share its
+                # result (shielded so a cancelled waiter can't cancel it)
+                inflight = self._inflight.get(cache_key)
+                if inflight is not None:
+                    return await asyncio.shield(inflight)
                 
-                return result
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[cache_key] = future
+                try:
+                    # Execute function
+                    result = await func(*args, **kwargs)
+                    
+                    # Cache result
+                    await self.set(cache_key, result, ttl)
+                    future.set_result(result)
+                    return result
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except Exception as e:
+                    future.set_exception(e)
+                    # Mark it retrieved so a miss without waiters doesn't log
+                    future.exception()
+                    raise
+                finally:
+                    del self._inflight[cache_key]
             
             return wrapper
         return decorator
@@ -235,6 +389,11 @@ class CacheService:
 class ScheduleCacheService(CacheService):
     """Specialized cache service for schedule data"""
     
+    # No L1: these entries are invalidated on every schedule write, and
+    # delete_pattern can only clear this process's L1, so another worker
+    # would keep serving the old list after the user's own change
+    l1_ttl = 0
+    
     async def cache_schedule_list(
         self,
         user_id: str,
@@ -286,6 +445,9 @@ class ScheduleCacheService(CacheService):
 class MonitoringCacheService(CacheService):
     """Specialized cache service for monitoring data"""
     
+    # Realtime metrics are only cached for 10 seconds in Redis
+    l1_ttl = 1
+    
     async def cache_metrics(
         self,
         metric_type: str,
@@ -6,47 +6,108 @@ import os
 import base64
 import logging
 import secrets
+from functools import cached_property
 from typing import Optional, Dict, Any, Tuple
-from cryptography.fernet import Fernet
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.backends import default_backend
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
-import json
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects.postgresql import insert
+import orjson
 
 from app.core.config import settings
 from app.models.user import User
+from app.models.schedule import ScheduleSecret
 
 logger = logging.getLogger(__name__)
 
+# Credential fields per distribution channel
+SENSITIVE_DISTRIBUTION_FIELDS = {
+    "email": frozenset({"smtp_password", "smtp_user", "auth_token", "api_key"}),
+    "webhook": frozenset({"auth_value"}),
+    "cloud": frozenset({"access_key", "secret_key", "password", "token"}),
+}
+
+# Credential fields of a schedule's export_config
+SENSITIVE_EXPORT_FIELDS = frozenset({"password"})
+
+REDACTED = "***REDACTED***"
+
+# Stored layout: base64url(version byte + 16-byte salt + 12-byte nonce + AES-GCM
+# ciphertext and tag). Version 1 records hold a Fernet token after the salt;
+# records without a version byte are the original salt + Fernet token layout,
+# whose key was stretched with PBKDF2 per record
+SALT_SIZE = 16
+NONCE_SIZE = 12
+HKDF_FERNET_VERSION = b"\x01"
+AES_GCM_VERSION = b"\x02"
+# Bound into the GCM tag so ciphertexts can't be replayed into another context
+AES_GCM_AAD = b"boe-credentials-v2"
+
+# The master key is stretched once per process into a root key; per-record
+# keys are then derived from it with a single HKDF call
+ROOT_KEY_SALT = b"boe-credential-root-key-v1"
+ROOT_KEY_ITERATIONS = 600000
+LEGACY_KEY_ITERATIONS = 100000
+
 
 class CredentialService:
     """Service for secure storage and retrieval of sensitive credentials"""
     
-    def __init__(self):
-        """Initialize the credential service with encryption key"""
-        self._cipher_suite = self._get_cipher_suite()
+    @staticmethod
+    def _master_key() -> bytes:
+        # Use environment variable or derive from secret key
+        return os.getenv("CREDENTIAL_ENCRYPTION_KEY", settings.SECRET_KEY).encode()
+    
+    @cached_property
+    def _root_key(self) -> bytes:
+        """Master key stretched with PBKDF2 - computed on first use, once per process"""
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=ROOT_KEY_SALT,
+            iterations=ROOT_KEY_ITERATIONS,
+            backend=default_backend()
+        )
+        return kdf.derive(self._master_key())
     
-    def _get_cipher_suite(self, salt: Optional[bytes] = None) -> Tuple[Fernet, bytes]:
-        """Generate encryption key with unique salt for each encryption"""
+    def _derive_key(self, salt: bytes, info: bytes) -> bytes:
+        """Derive a per-record key from the root key with the record's salt"""
+        hkdf = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=salt,
+            info=info,
+            backend=default_backend()
+        )
+        return hkdf.derive(self._root_key)
+    
+    def _get_cipher_suite(self, salt: Optional[bytes] = None) -> Tuple[AESGCM, bytes]:
+        """AES-GCM cipher keyed with a unique salt for each encryption"""
         # Generate new salt if not provided
         if salt is None:
-            salt = secrets.token_bytes(16)  # 128-bit salt
-        
-        # Use environment variable or derive from secret key
-        master_key = os.getenv("CREDENTIAL_ENCRYPTION_KEY", settings.SECRET_KEY)
-        
-        # Derive key from master key with unique salt
+            salt = secrets.token_bytes(SALT_SIZE)  # 128-bit salt
+        return AESGCM(self._derive_key(salt, b"aes-gcm-v2")), salt
+    
+    def _get_fernet_cipher_suite(self, salt: bytes) -> Fernet:
+        """Cipher for version 1 records (Fernet keyed from the root key)"""
+        return Fernet(base64.urlsafe_b64encode(self._derive_key(salt, b"fernet-v1")))
+    
+    def _get_legacy_cipher_suite(self, salt: bytes) -> Fernet:
+        """Cipher for records written before the root key (full PBKDF2 per record)"""
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
             salt=salt,
-            iterations=100000,
+            iterations=LEGACY_KEY_ITERATIONS,
             backend=default_backend()
         )
-        key = base64.urlsafe_b64encode(kdf.derive(master_key.encode()))
-        return Fernet(key), salt
+        return Fernet(base64.urlsafe_b64encode(kdf.derive(self._master_key())))
     
     def encrypt_credentials(self, credentials: Dict[str, Any]) -> str:
         """Encrypt sensitive credentials for storage with unique salt"""
@@ -54,16 +115,17 @@ class CredentialService:
             # Get cipher with new salt
             cipher, salt = self._get_cipher_suite()
             
-            # Convert to JSON string
-            json_str = json.dumps(credentials)
-            
-            # Encrypt
-            encrypted = cipher.encrypt(json_str.encode())
+            # Convert to JSON (orjson writes bytes directly)
+            plaintext = orjson.dumps(credentials)
             
-            # Combine salt and encrypted data
-            combined = salt + encrypted
+            # Encrypt - AES-GCM needs a unique nonce per key; the key is
+            # already unique per record, the random nonce is belt and braces
+            nonce = secrets.token_bytes(NONCE_SIZE)
+            encrypted = cipher.encrypt(nonce, plaintext, AES_GCM_AAD)
             
-            # Return base64 encoded string
+            # Combine version, salt, nonce and encrypted data in one copy and
+            # base64 encode once
+            combined = b"".join((AES_GCM_VERSION, salt, nonce, encrypted))
             return base64.urlsafe_b64encode(combined).decode()
         except Exception as e:
             logger.error(f"Failed to encrypt credentials: {e}")
@@ -73,20 +135,33 @@ class CredentialService:
         """Decrypt stored credentials using embedded salt"""
         try:
             # Decode from base64
-            combined = base64.urlsafe_b64decode(encrypted_data.encode())
+            combined = base64.urlsafe_b64decode(encrypted_data)
             
-            # Extract salt (first 16 bytes) and encrypted data
-            salt = combined[:16]
-            encrypted = combined[16:]
+            version, salt = combined[:1], combined[1:SALT_SIZE + 1]
+            decrypted = None
+            if version == AES_GCM_VERSION:
+                cipher, _ = self._get_cipher_suite(salt)
+                nonce_end = SALT_SIZE + 1 + NONCE_SIZE
+                try:
+                    decrypted = cipher.decrypt(combined[SALT_SIZE + 1:nonce_end], combined[nonce_end:], AES_GCM_AAD)
+                except InvalidTag:
+                    # A legacy record whose random salt starts with the version byte
+                    pass
+            elif version == HKDF_FERNET_VERSION:
+                cipher = self._get_fernet_cipher_suite(salt)
+                try:
+                    decrypted = cipher.decrypt(combined[SALT_SIZE + 1:])
+                except InvalidToken:
+                    # A legacy record whose random salt starts with the version byte
+                    pass
             
-            # Get cipher with extracted salt
-            cipher, _ = self._get_cipher_suite(salt)
-            
-            # Decrypt
-            decrypted = cipher.decrypt(encrypted)
+            if decrypted is None:
+                # Legacy layout: salt (first 16 bytes) and encrypted data
+                cipher = self._get_legacy_cipher_suite(combined[:SALT_SIZE])
+                decrypted = cipher.decrypt(combined[SALT_SIZE:])
             
             # Parse JSON
-            return json.loads(decrypted.decode())
+            return orjson.loads(decrypted)
         except Exception as e:
             logger.error(f"Failed to decrypt credentials: {e}")
             raise ValueError("Failed to decrypt credentials")
@@ -146,33 +221,161 @@ class CredentialService:
             logger.error(f"Failed to retrieve SMTP credentials for user {user_id}: {e}")
             return None
     
-    def sanitize_distribution_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Remove sensitive data from distribution config before sending to frontend"""
+    @staticmethod
+    def _pop_secrets(
+        config: Dict[str, Any],
+        sensitive_fields: frozenset
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """(config without the sensitive fields, the non-empty values removed)"""
+        present = config.keys() & sensitive_fields
+        if not present:
+            return config, {}
+        public = {key: value for key, value in config.items() if key not in present}
+        return public, {field: config[field] for field in present if config[field] is not None}
+    
+    def split_distribution_secrets(
+        self,
+        config: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """Split a distribution config into (dispatch metadata, credentials per channel)"""
+        if not config:
+            return config, {}
+        
+        public = config.copy()
+        secrets_by_channel = {}
+        
+        for channel, sensitive_fields in SENSITIVE_DISTRIBUTION_FIELDS.items():
+            channel_config = public.get(channel)
+            if not isinstance(channel_config, dict):
+                continue
+            public[channel], channel_secrets = self._pop_secrets(channel_config, sensitive_fields)
+            if channel_secrets:
+                secrets_by_channel[channel] = channel_secrets
+        
+        return public, secrets_by_channel
+    
+    def split_export_secrets(self, config: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Split an export config into (generation options, credentials)"""
         if not config:
+            return config, {}
+        return self._pop_secrets(config, SENSITIVE_EXPORT_FIELDS)
+    
+    def merge_distribution_secrets(
+        self,
+        config: Dict[str, Any],
+        secrets_by_channel: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Inverse of split_distribution_secrets - used right before dispatch"""
+        if not secrets_by_channel:
             return config
         
-        sanitized = config.copy()
+        merged = dict(config or {})
+        for channel, channel_secrets in secrets_by_channel.items():
+            merged[channel] = {**merged.get(channel, {}), **channel_secrets}
+        return merged
+    
+    @staticmethod
+    def _secret_parts(stored: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Stored secrets as {"distribution": ..., "export": ...}; rows written
+        before export credentials were split out hold the channels directly
+        """
+        if "distribution" in stored or "export" in stored:
+            return stored
+        return {"distribution": stored}
+    
+    async def store_schedule_secrets(
+        self,
+        db: AsyncSession,
+        schedule_id,
+        distribution_secrets: Optional[Dict[str, Dict[str, Any]]] = None,
+        export_secrets: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Upsert (or clear) the encrypted credentials row for a schedule
+        A part passed as None keeps what is already stored for it
+        """
+        if distribution_secrets is None or export_secrets is None:
+            stored = await db.scalar(
+                select(ScheduleSecret.secret).where(ScheduleSecret.schedule_id == schedule_id)
+            )
+            parts = self._secret_parts(self.decrypt_credentials(stored)) if stored else {}
+            if distribution_secrets is None:
+                distribution_secrets = parts.get("distribution", {})
+            if export_secrets is None:
+                export_secrets = parts.get("export", {})
         
-        # Remove sensitive email fields
-        if "email" in sanitized:
-            email_config = sanitized["email"].copy() if isinstance(sanitized["email"], dict) else {}
-            sensitive_fields = ["smtp_password", "smtp_user", "auth_token", "api_key"]
-            for field in sensitive_fields:
-                if field in email_config:
-                    # Replace with placeholder
-                    email_config[field] = "***REDACTED***"
-            sanitized["email"] = email_config
+        parts = {
+            name: part
+            for name, part in (("distribution", distribution_secrets), ("export", export_secrets))
+            if part
+        }
+        if not parts:
+            await db.execute(delete(ScheduleSecret).where(ScheduleSecret.schedule_id == schedule_id))
+            return
         
-        # Remove sensitive cloud storage fields
-        if "cloud" in sanitized:
-            cloud_config = sanitized["cloud"].copy() if isinstance(sanitized["cloud"], dict) else {}
-            sensitive_fields = ["access_key", "secret_key", "password", "token"]
-            for field in sensitive_fields:
-                if field in cloud_config:
-                    cloud_config[field] = "***REDACTED***"
-            sanitized["cloud"] = cloud_config
+        encrypted = self.encrypt_credentials(parts)
+        stmt = insert(ScheduleSecret).values(schedule_id=schedule_id, secret=encrypted)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ScheduleSecret.schedule_id],
+                set_={"secret": stmt.excluded.secret, "updated_at": func.now()}
+            )
+        )
+    
+    def _load_secret_parts(self, schedule) -> Dict[str, Dict[str, Any]]:
+        # Requires schedule.secret to have been loaded explicitly (it is lazy='noload')
+        if schedule.secret is None:
+            return {}
+        return self._secret_parts(self.decrypt_credentials(schedule.secret.secret))
+    
+    def resolve_distribution_config(self, schedule) -> Dict[str, Any]:
+        """
+        Full distribution config for dispatch
+        Requires schedule.secret to have been loaded explicitly (it is lazy='noload')
+        """
+        return self.merge_distribution_secrets(
+            schedule.distribution_config,
+            self._load_secret_parts(schedule).get("distribution")
+        )
+    
+    def resolve_export_config(self, schedule) -> Dict[str, Any]:
+        """Full export config (with the export password) for generation"""
+        export_secrets = self._load_secret_parts(schedule).get("export")
+        if not export_secrets:
+            return schedule.export_config
+        return {**(schedule.export_config or {}), **export_secrets}
+    
+    def sanitize_distribution_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Remove sensitive data from distribution config before sending to frontend"""
+        if not config:
+            return config
+        
+        # Replace any credentials still stored inline with a placeholder; the
+        # config is only copied when there is something to redact
+        sanitized = config
+        for channel, sensitive_fields in SENSITIVE_DISTRIBUTION_FIELDS.items():
+            if channel not in config:
+                continue
+            channel_config = config[channel]
+            if isinstance(channel_config, dict):
+                present = channel_config.keys() & sensitive_fields
+                if not present:
+                    continue
+                channel_config = {**channel_config, **dict.fromkeys(present, REDACTED)}
+            else:
+                channel_config = {}
+            if sanitized is config:
+                sanitized = config.copy()
+            sanitized[channel] = channel_config
         
         return sanitized
+    
+    def sanitize_export_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Redact an export password still stored inline before sending to frontend"""
+        if not config or config.get("password") is None:
+            return config
+        return {**config, "password": REDACTED}
 
 
 # Global instance
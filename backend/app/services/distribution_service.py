@@ -2,27 +2,147 @@
 Distribution service for handling export delivery to various channels
 """
 
+import asyncio
+import errno
 import os
-import shutil
+import re
+import stat
+import string
+import sys
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Callable, Dict, Any, Optional, Set, Tuple
 import logging
+import aiofiles
+import httpx
 from itsdangerous import URLSafeTimedSerializer
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.export import Export
 from app.core.config import settings
+from app.core.validators import is_valid_email
+from app.services.enhanced_security_service import enhanced_security_service
 
 logger = logging.getLogger(__name__)
 
+# Destination validation pattern, compiled once at import
+_URL_RE = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+# Characters stripped from generated filenames - anything but letters, digits
+# and "._-" (\w is exactly str.isalnum() plus "_")
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w.-]')
+
+# Webhooks may only target public http(s) endpoints
+WEBHOOK_SCHEMES = ("http", "https")
+
+# Bytes per os.sendfile call / buffered read when copying exports
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# os.sendfile only accepts a regular file as the output on Linux
+_USE_SENDFILE = sys.platform.startswith("linux")
+
+# Connection pool and timeouts for webhook delivery
+WEBHOOK_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=16, keepalive_expiry=30)
+WEBHOOK_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+
+def _fast_copy(source_path: Path, out_fd: int) -> int:
+    """
+    Copy a file's contents into an open descriptor, in-kernel with
+    os.sendfile where the platform and filesystems allow it.
+    Returns the number of bytes copied.
+    """
+    with open(source_path, "rb") as source:
+        in_fd = source.fileno()
+        copied = 0
+        if _USE_SENDFILE:
+            try:
+                while True:
+                    sent = os.sendfile(out_fd, in_fd, copied, COPY_CHUNK_SIZE)
+                    if sent == 0:
+                        return copied
+                    copied += sent
+            except OSError as e:
+                # Unsupported for this pair of files - fall back to a buffered
+                # copy, unless part of the file has already been written
+                if copied or e.errno not in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTSOCK):
+                    raise
+        
+        with open(out_fd, "wb", closefd=False) as out:
+            while chunk := source.read(COPY_CHUNK_SIZE):
+                out.write(chunk)
+                copied += len(chunk)
+        return copied
+
+
+@lru_cache(maxsize=256)
+def _compile_filename_pattern(pattern: str) -> Callable[..., str]:
+    """
+    Parse a filename pattern once - a schedule fires with the same pattern
+    every run. Plain {field} patterns render as a join over the literal
+    parts and values; anything else (format specs, conversions, indexing,
+    positional fields) falls back to str.format.
+    """
+    parts = []
+    for literal, field, format_spec, conversion in string.Formatter().parse(pattern):
+        if field is not None and (format_spec or conversion or not field.isidentifier()):
+            return pattern.format
+        parts.append((literal, field))
+    
+    def render(**values: Any) -> str:
+        return "".join([
+            literal if field is None else literal + str(values[field])
+            for literal, field in parts
+        ])
+    
+    return render
+
+
+def _pin_address(url: str, address: str, headers: Dict[str, str]) -> Tuple[httpx.URL, Dict[str, Any]]:
+    """
+    Point a webhook request at an address that was already checked, so the
+    connection doesn't resolve the host a second time (the answer could
+    change to an internal address in between - DNS rebinding). The Host
+    header and, for https, the TLS server name and certificate check keep
+    using the original host. Sets headers["Host"]; returns the URL and the
+    request extensions to send.
+    """
+    target = httpx.URL(url)
+    headers["Host"] = target.netloc.decode("ascii")
+    extensions = {"sni_hostname": target.raw_host.decode("ascii")} if target.scheme == "https" else {}
+    return target.copy_with(host=address), extensions
+
+
+async def _file_chunks(path: Path, chunk_size: int = COPY_CHUNK_SIZE):
+    """Read a file as an async stream of chunks (request bodies)"""
+    async with aiofiles.open(path, "rb") as file:
+        while chunk := await file.read(chunk_size):
+            yield chunk
+
 
 class DistributionService:
     """Service for distributing exports to various channels"""
     
+    # Target directories already created by this process; dated subdirs only
+    # change once a day, so repeat distributions skip the mkdir syscalls
+    _created_dirs: Set[str] = set()
+    
+    # Shared webhook client of the API process and the event loop it belongs to
+    _http_client: Optional[httpx.AsyncClient] = None
+    _http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+    
     def __init__(self, db: AsyncSession):
         self.db = db
+        self._export_base = Path(settings.EXPORT_DIR)
         # Initialize URL serializer for signed URLs
         self.url_serializer = URLSafeTimedSerializer(
             settings.SECRET_KEY,
@@ -79,37 +199,37 @@ class DistributionService:
             return {"error": "Export not found or file not available"}
         
         # Construct source file path
-        source_path = Path(settings.EXPORT_DIR) / export.file_path
-        if not source_path.exists():
+        source_path = self._export_base / export.file_path
+        if not await asyncio.to_thread(source_path.exists):
             return {"error": f"Export file not found: {source_path}"}
         
-        # Process each distribution channel
-        if "local" in config:
-            results["local"] = await self._distribute_local(
-                source_path, 
-                config["local"],
-                export,
-                schedule_name,
-                report_name
-            )
-        
-        if "email" in config:
-            results["email"] = await self._distribute_email(
-                source_path,
-                config["email"],
-                export,
-                schedule_name,
-                report_name
-            )
+        # Process the distribution channels concurrently - they only share the
+        # read-only source file, and only the email channel touches the session
+        channels = {
+            "local": self._distribute_local,
+            "email": self._distribute_email,
+            "webhook": self._distribute_webhook,
+        }
+        requested = [channel for channel in channels if channel in config]
+        outcomes = await asyncio.gather(
+            *(
+                channels[channel](source_path, config[channel], export, schedule_name, report_name)
+                for channel in requested
+            ),
+            return_exceptions=True
+        )
         
-        if "webhook" in config:
-            results["webhook"] = await self._distribute_webhook(
-                source_path,
-                config["webhook"],
-                export,
-                schedule_name,
-                report_name
-            )
+        for channel, outcome in zip(requested, outcomes):
+            if isinstance(outcome, BaseException):
+                # The channel methods report their own failures; this only
+                # catches anything that escaped them
+                logger.error(f"Error in {channel} distribution: {outcome}")
+                outcome = {
+                    "status": "failed",
+                    "error": str(outcome),
+                    "timestamp": datetime.now().isoformat()
+                }
+            results[channel] = outcome
         
         # Note: SFTP and Cloud storage will be implemented later
         
@@ -127,6 +247,9 @@ class DistributionService:
         Distribute export to local file system.
         Organizes files in a structured directory hierarchy.
         """
+        # One clock read, so the dated subdirectory, the filename and the
+        # result all refer to the same instant
+        now = datetime.now()
         try:
             # Get configuration
             base_path = config.get("base_path", "/exports/scheduled")
@@ -134,60 +257,41 @@ class DistributionService:
             filename_pattern = config.get("filename_pattern", "{report_name}_{timestamp}.{format}")
             overwrite = config.get("overwrite", False)
             
-            # Create base directory if it doesn't exist
             base_dir = Path(base_path)
-            base_dir.mkdir(parents=True, exist_ok=True)
             
-            # Create subdirectories if requested
+            # Use subdirectories if requested
             if create_subdirs:
                 # Organize by year/month/day
-                now = datetime.now()
-                subdir = base_dir / str(now.year) / f"{now.month:02d}" / f"{now.day:02d}"
-                subdir.mkdir(parents=True, exist_ok=True)
-                target_dir = subdir
+                target_dir = base_dir / str(now.year) / f"{now.month:02d}" / f"{now.day:02d}"
             else:
                 target_dir = base_dir
             
             # Generate filename from pattern
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = filename_pattern.format(
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
+            filename = _compile_filename_pattern(filename_pattern)(
                 report_name=report_name.replace(" ", "_"),
                 schedule_name=schedule_name.replace(" ", "_"),
                 timestamp=timestamp,
                 format=export.format,
-                date=datetime.now().strftime("%Y-%m-%d")
+                date=now.strftime("%Y-%m-%d")
             )
             
             # Ensure filename is safe
-            filename = "".join(c for c in filename if c.isalnum() or c in "._-")
-            
-            # Construct target path
-            target_path = target_dir / filename
+            filename = _UNSAFE_FILENAME_RE.sub("", filename)
             
-            # Check if file exists and handle accordingly
-            if target_path.exists() and not overwrite:
-                # Add counter to filename
-                counter = 1
-                base_name = target_path.stem
-                extension = target_path.suffix
-                while target_path.exists():
-                    new_name = f"{base_name}_{counter}{extension}"
-                    target_path = target_dir / new_name
-                    counter += 1
-            
-            # Copy file to target location
-            shutil.copy2(source_path, target_path)
-            
-            # Set appropriate permissions
-            os.chmod(target_path, 0o644)
+            # Directory creation, name probing and the copy all block - run
+            # them in a worker thread so the event loop keeps serving others
+            target_path, size = await asyncio.to_thread(
+                self._copy_to_local, source_path, target_dir, filename, overwrite
+            )
             
             logger.info(f"Successfully distributed export to local storage: {target_path}")
             
             return {
                 "status": "success",
                 "path": str(target_path),
-                "size": target_path.stat().st_size,
-                "timestamp": datetime.now().isoformat()
+                "size": size,
+                "timestamp": now.isoformat()
             }
             
         except Exception as e:
@@ -195,9 +299,70 @@ class DistributionService:
             return {
                 "status": "failed",
                 "error": str(e),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now.isoformat()
             }
     
+    @classmethod
+    def _copy_to_local(
+        cls,
+        source_path: Path,
+        target_dir: Path,
+        filename: str,
+        overwrite: bool
+    ) -> Tuple[Path, int]:
+        """
+        Blocking part of _distribute_local, run in a worker thread.
+        Returns the path written and its size.
+        """
+        # Create the target directory (and any parents) if it doesn't exist;
+        # set.add is atomic, and a racing duplicate mkdir is harmless
+        if str(target_dir) not in cls._created_dirs:
+            target_dir.mkdir(parents=True, exist_ok=True)
+            cls._created_dirs.add(str(target_dir))
+        
+        # Claim the target name; a directory removed after it was remembered
+        # is recreated once
+        try:
+            target_path, target_fd = cls._open_target(target_dir, filename, overwrite)
+        except FileNotFoundError:
+            target_dir.mkdir(parents=True, exist_ok=True)
+            target_path, target_fd = cls._open_target(target_dir, filename, overwrite)
+        
+        try:
+            # Set appropriate permissions (the create mode is subject to umask)
+            os.fchmod(target_fd, 0o644)
+            size = _fast_copy(source_path, target_fd)
+        except BaseException:
+            os.close(target_fd)
+            target_path.unlink(missing_ok=True)
+            raise
+        os.close(target_fd)
+        
+        return target_path, size
+    
+    @staticmethod
+    def _open_target(target_dir: Path, filename: str, overwrite: bool) -> Tuple[Path, int]:
+        """
+        Open the file a local distribution is written to.
+        Without overwrite, a counter is added to the name until an O_EXCL
+        create succeeds - one atomic syscall per candidate, so concurrent
+        distributions can never claim the same name.
+        """
+        target_path = target_dir / filename
+        if overwrite:
+            return target_path, os.open(target_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        
+        counter = 0
+        base_name = target_path.stem
+        extension = target_path.suffix
+        while True:
+            try:
+                return target_path, os.open(target_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                # Add counter to filename
+                counter += 1
+                target_path = target_dir / f"{base_name}_{counter}{extension}"
+    
     async def _distribute_email(
         self,
         source_path: Path,
@@ -210,6 +375,7 @@ class DistributionService:
         Distribute export via email using the EmailService.
         Supports both direct attachment and download links for large files.
         """
+        now = datetime.now()
         try:
             from app.services.email_service import EmailService
             
@@ -224,8 +390,8 @@ class DistributionService:
             subject = subject_template.format(
                 report_name=report_name,
                 schedule_name=schedule_name,
-                date=datetime.now().strftime("%Y-%m-%d"),
-                time=datetime.now().strftime("%H:%M")
+                date=now.strftime("%Y-%m-%d"),
+                time=now.strftime("%H:%M")
             )
             
             # Validate recipients
@@ -233,7 +399,7 @@ class DistributionService:
                 return {
                     "status": "failed",
                     "error": "No email recipients specified",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now.isoformat()
                 }
             
             # Initialize email service
@@ -246,7 +412,7 @@ class DistributionService:
                     "status": "failed",
                     "error": "Email service not configured",
                     "message": "SMTP settings not properly configured",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now.isoformat()
                 }
             
             # Get user_id from export if available
@@ -295,7 +461,7 @@ class DistributionService:
                     "subject": subject,
                     "method": "download_link" if use_download_link else "attachment",
                     "file_size": file_size,
-                    "timestamp": result.get("timestamp", datetime.now().isoformat())
+                    "timestamp": result.get("timestamp", now.isoformat())
                 }
             else:
                 logger.error(f"Email send failed: {result.get('error', 'Unknown error')}")
@@ -304,7 +470,7 @@ class DistributionService:
                     "error": result.get("error", "Email send failed"),
                     "message": result.get("message", ""),
                     "retry": result.get("retry", False),
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now.isoformat()
                 }
             
         except Exception as e:
@@ -312,7 +478,7 @@ class DistributionService:
             return {
                 "status": "failed",
                 "error": str(e),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now.isoformat()
             }
     
     async def _distribute_webhook(
@@ -325,31 +491,153 @@ class DistributionService:
     ) -> Dict[str, Any]:
         """
         Distribute export via webhook.
-        This is a placeholder for webhook distribution implementation.
+        Sends the export file (or just its metadata) to the configured URL
+        over HTTP (pooled connections inside the API process).
         """
+        now = datetime.now()
         try:
-            # Webhook implementation will be added later
             url = config.get("url")
-            method = config.get("method", "POST")
+            method = config.get("method", "POST").upper()
+            if not url:
+                return {
+                    "status": "failed",
+                    "error": "No webhook URL specified",
+                    "timestamp": now.isoformat()
+                }
             
-            logger.info(f"Webhook distribution placeholder: Would {method} to {url}")
+            url_error, address = await self._check_webhook_url(url)
+            if url_error:
+                logger.error(f"Refusing webhook delivery to {url}: {url_error}")
+                return {
+                    "status": "failed",
+                    "error": url_error,
+                    "url": url,
+                    "timestamp": now.isoformat()
+                }
             
+            headers = dict(config.get("headers") or {})
+            auth = None
+            auth_type = config.get("auth_type")
+            auth_value = config.get("auth_value")
+            if auth_value:
+                if auth_type == "bearer":
+                    headers["Authorization"] = f"Bearer {auth_value}"
+                elif auth_type == "basic":
+                    username, _, password = auth_value.partition(":")
+                    auth = httpx.BasicAuth(username, password)
+                elif auth_type == "api_key":
+                    headers["X-API-Key"] = auth_value
+            
+            target, extensions = _pin_address(url, address, headers)
+            
+            async with self._webhook_client() as client:
+                if config.get("include_file", True):
+                    headers.setdefault("Content-Type", "application/octet-stream")
+                    headers["Content-Disposition"] = f'attachment; filename="{source_path.name}"'
+                    # Streamed in chunks so memory stays flat however large the
+                    # export is; a known length avoids chunked transfer encoding
+                    headers["Content-Length"] = str((await asyncio.to_thread(source_path.stat)).st_size)
+                    response = await client.request(
+                        method, target, content=_file_chunks(source_path), headers=headers, auth=auth,
+                        follow_redirects=False, extensions=extensions
+                    )
+                else:
+                    response = await client.request(
+                        method,
+                        target,
+                        json={
+                            "export_id": str(export.id),
+                            "report_name": report_name,
+                            "schedule_name": schedule_name,
+                            "format": export.format
+                        },
+                        headers=headers,
+                        auth=auth,
+                        follow_redirects=False,
+                        extensions=extensions
+                    )
+            
+            if response.is_success:
+                logger.info(f"Successfully delivered export to webhook: {method} {url}")
+                return {
+                    "status": "success",
+                    "url": url,
+                    "method": method,
+                    "status_code": response.status_code,
+                    "timestamp": now.isoformat()
+                }
+            
+            logger.error(f"Webhook {method} {url} returned {response.status_code}")
             return {
-                "status": "pending",
-                "message": "Webhook distribution not yet implemented",
+                "status": "failed",
+                "error": f"Webhook returned HTTP {response.status_code}",
                 "url": url,
                 "method": method,
-                "timestamp": datetime.now().isoformat()
+                "status_code": response.status_code,
+                "retry": response.status_code >= 500,
+                "timestamp": now.isoformat()
             }
             
+        except httpx.TransportError as e:
+            logger.error(f"Error in webhook distribution: {str(e)}")
+            return {
+                "status": "failed",
+                "error": str(e),
+                "retry": True,
+                "timestamp": now.isoformat()
+            }
         except Exception as e:
             logger.error(f"Error in webhook distribution: {str(e)}")
             return {
                 "status": "failed",
                 "error": str(e),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now.isoformat()
             }
     
+    @staticmethod
+    async def _check_webhook_url(url: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Reject webhook targets that are not public http(s) endpoints (SSRF).
+        The host is resolved here and the request is sent to the checked
+        address (see _pin_address); redirects are never followed, so a
+        public URL cannot bounce the request to an internal address.
+        Returns (error, address to connect to).
+        """
+        addresses, error = await asyncio.to_thread(
+            enhanced_security_service.resolve_url, url, WEBHOOK_SCHEMES
+        )
+        return error, (addresses[0] if addresses else None)
+    
+    @classmethod
+    @asynccontextmanager
+    async def _webhook_client(cls) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        HTTP client for one webhook delivery. Inside the API process this is
+        the shared pooled client opened by open_http_client(), so repeat
+        deliveries reuse TCP/TLS connections. Celery tasks each run on their own
+        short-lived loop and get a client that is closed when the call ends.
+        """
+        client = cls._http_client
+        if client is not None and not client.is_closed and cls._http_client_loop is asyncio.get_running_loop():
+            yield client
+        else:
+            async with httpx.AsyncClient(limits=WEBHOOK_LIMITS, timeout=WEBHOOK_TIMEOUT) as client:
+                yield client
+    
+    @classmethod
+    def open_http_client(cls) -> None:
+        """Create the shared webhook client on the running loop (application startup)"""
+        cls._http_client = httpx.AsyncClient(limits=WEBHOOK_LIMITS, timeout=WEBHOOK_TIMEOUT)
+        cls._http_client_loop = asyncio.get_running_loop()
+    
+    @classmethod
+    async def close_http_client(cls) -> None:
+        """Close the shared webhook client (application shutdown)"""
+        if cls._http_client is not None:
+            await cls._http_client.aclose()
+            cls._http_client = None
+            cls._http_client_loop = None
+    
     async def test_distribution_channel(
         self,
         channel_type: str,
@@ -373,43 +661,61 @@ class DistributionService:
     
     async def _test_local_distribution(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Test local file system distribution configuration"""
+        # The checks (and possible mkdir) block - keep them off the event loop
+        return await asyncio.to_thread(self._check_local_directory, config)
+    
+    @staticmethod
+    def _check_local_directory(config: Dict[str, Any]) -> Dict[str, Any]:
+        """Blocking part of _test_local_distribution, run in a worker thread"""
         try:
             base_path = config.get("base_path", "/exports/scheduled")
-            base_dir = Path(base_path)
             
-            # Check if directory exists and is writable
-            if base_dir.exists():
-                if os.access(base_dir, os.W_OK):
-                    return {
-                        "valid": True,
-                        "writable": True,
-                        "path": str(base_dir),
-                        "message": "Directory exists and is writable"
-                    }
-                else:
-                    return {
-                        "valid": False,
-                        "writable": False,
-                        "path": str(base_dir),
-                        "error": "Directory exists but is not writable"
-                    }
-            else:
+            # Check if directory exists and is writable - one stat, plus an
+            # access check when it does
+            try:
+                is_dir = stat.S_ISDIR(os.stat(base_path).st_mode)
+            except FileNotFoundError:
+                is_dir = None
+            
+            if is_dir is None:
                 # Try to create the directory
                 try:
-                    base_dir.mkdir(parents=True, exist_ok=True)
+                    Path(base_path).mkdir(parents=True, exist_ok=True)
                     return {
                         "valid": True,
                         "writable": True,
-                        "path": str(base_dir),
+                        "path": base_path,
                         "message": "Directory created successfully"
                     }
                 except Exception as e:
                     return {
                         "valid": False,
                         "writable": False,
-                        "path": str(base_dir),
+                        "path": base_path,
                         "error": f"Cannot create directory: {str(e)}"
                     }
+            
+            if not is_dir:
+                return {
+                    "valid": False,
+                    "writable": False,
+                    "path": base_path,
+                    "error": "Path exists but is not a directory"
+                }
+            
+            if os.access(base_path, os.W_OK):
+                return {
+                    "valid": True,
+                    "writable": True,
+                    "path": base_path,
+                    "message": "Directory exists and is writable"
+                }
+            return {
+                "valid": False,
+                "writable": False,
+                "path": base_path,
+                "error": "Directory exists but is not writable"
+            }
                     
         except Exception as e:
             return {
@@ -427,17 +733,22 @@ class DistributionService:
                 "error": "No recipients specified"
             }
         
-        # Basic email validation
-        import re
-        email_pattern = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
-        
-        invalid_emails = [email for email in recipients if not email_pattern.match(email)]
-        
-        if invalid_emails:
-            return {
-                "valid": False,
-                "error": f"Invalid email addresses: {', '.join(invalid_emails)}"
-            }
+        # Basic email validation - stops at the first bad address unless the
+        # caller asks for all of them
+        if config.get("verbose"):
+            invalid_emails = [email for email in recipients if not is_valid_email(email)]
+            if invalid_emails:
+                return {
+                    "valid": False,
+                    "error": f"Invalid email addresses: {', '.join(invalid_emails)}"
+                }
+        else:
+            first_invalid = next((email for email in recipients if not is_valid_email(email)), None)
+            if first_invalid is not None:
+                return {
+                    "valid": False,
+                    "error": f"Invalid email address: {first_invalid}"
+                }
         
         return {
             "valid": True,
@@ -455,21 +766,19 @@ class DistributionService:
             }
         
         # Basic URL validation
-        import re
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-        
-        if not url_pattern.match(url):
+        if not _URL_RE.match(url):
             return {
                 "valid": False,
                 "error": "Invalid webhook URL format"
             }
         
+        url_error, _ = await self._check_webhook_url(url)
+        if url_error:
+            return {
+                "valid": False,
+                "error": url_error
+            }
+        
         return {
             "valid": True,
             "url": url,
@@ -2,11 +2,12 @@
 Email service for sending reports and notifications via SMTP
 """
 
+import asyncio
 import os
 import re
 import logging
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Tuple, Union
 from datetime import datetime, timedelta
 import mimetypes
 
@@ -26,6 +27,26 @@ from app.models.schedule import ScheduleExecution
 
 logger = logging.getLogger(__name__)
 
+# SMTP connection config, FastMail client and template environment, built from
+# settings once per process and shared by every EmailService (a service is
+# created per distribution; a fresh Jinja environment re-parsed the templates)
+_mail_setup: Optional[Tuple[ConnectionConfig, FastMail, Optional[Environment]]] = None
+
+# Caps concurrent SMTP sessions now that distributions and their channels run
+# concurrently; asyncio primitives belong to one event loop, and Celery tasks
+# each run on a fresh one
+_send_semaphore: Optional[asyncio.Semaphore] = None
+_send_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_send_semaphore() -> asyncio.Semaphore:
+    global _send_semaphore, _send_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _send_semaphore is None or _send_semaphore_loop is not loop:
+        _send_semaphore = asyncio.Semaphore(settings.MAIL_MAX_CONCURRENT_SENDS)
+        _send_semaphore_loop = loop
+    return _send_semaphore
+
 
 class SimpleRateLimiter:
     """Rate limiter for email sending using Redis (required)"""
@@ -95,6 +116,11 @@ class EmailService:
     
     def _setup_mail_config(self):
         """Setup FastMail configuration"""
+        global _mail_setup
+        if _mail_setup is not None:
+            self._config, self._fastmail, self._templates_env = _mail_setup
+            return
+        
         try:
             self._config = ConnectionConfig(
                 MAIL_USERNAME=settings.MAIL_USERNAME,
@@ -119,6 +145,8 @@ class EmailService:
                 )
             else:
                 logger.warning(f"Email template directory not found: {template_path}")
+            
+            _mail_setup = (self._config, self._fastmail, self._templates_env)
                 
         except Exception as e:
             logger.error(f"Failed to setup email configuration: {str(e)}")
@@ -129,9 +157,13 @@ class EmailService:
         return self._fastmail is not None
     
     def validate_email_address(self, email: str) -> bool:
-        """Validate an email address"""
+        """
+        Validate an email address before sending, including a DNS check that
+        the domain accepts mail (schemas only check the syntax, see
+        app.core.validators.is_valid_email)
+        """
         try:
-            validate_email(email)
+            validate_email(email, check_deliverability=True)
             return True
         except EmailNotValidError:
             return False
@@ -293,8 +325,9 @@ class EmailService:
             if reply_to:
                 message.headers["Reply-To"] = reply_to
             
-            # Send email
-            await self._fastmail.send_message(message)
+            # Send email - waits for a free SMTP slot first
+            async with _get_send_semaphore():
+                await self._fastmail.send_message(message)
             
             logger.info(
                 f"Email sent successfully to {len(recipients)} recipients "
@@ -3,10 +3,10 @@ Enhanced Cache Service with Proper Key Design
 Implements Gemini's caching recommendations
 """
 
-import json
 import hashlib
 from typing import Any, Dict, Optional, List
 from datetime import datetime, timedelta
+import orjson
 import redis
 from functools import wraps
 import logging
@@ -29,7 +29,8 @@ class EnhancedCacheService:
         try:
             self.redis_client = redis.from_url(
                 settings.REDIS_URL,
-                decode_responses=True,
+                # Values are orjson bytes both ways, so no str decoding
+                decode_responses=False,
                 socket_connect_timeout=5,
                 socket_timeout=5
             )
@@ -62,9 +63,9 @@ class EnhancedCacheService:
         try:
             value = self.redis_client.get(key)
             if value:
-                return json.loads(value)
+                return orjson.loads(value)
             return None
-        except (redis.RedisError, json.JSONDecodeError) as e:
+        except (redis.RedisError, orjson.JSONDecodeError) as e:
             logger.error(f"Cache get failed for {key}: {e}")
             return None
     
@@ -76,10 +77,10 @@ class EnhancedCacheService:
             return False
         
         try:
-            serialized = json.dumps(value, default=str)
+            serialized = orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
             self.redis_client.setex(key, ttl, serialized)
             return True
-        except (redis.RedisError, json.JSONEncodeError) as e:
+        except (redis.RedisError, orjson.JSONEncodeError) as e:
             logger.error(f"Cache set failed for {key}: {e}")
             return False
     
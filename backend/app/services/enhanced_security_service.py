@@ -6,8 +6,10 @@ Implements Gemini's recommendations for critical security fixes
 import os
 import base64
 import hashlib
+import ipaddress
 import secrets
-from typing import Optional, Dict, Any
+import socket
+from typing import Optional, Dict, Any, Iterable, List
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2
@@ -17,11 +19,19 @@ import redis
 from functools import wraps
 import json
 from email_validator import validate_email, EmailNotValidError
-from croniter import croniter
 
+from app.core import cron_cache
 from app.core.config import settings
 
 
+def _is_public_address(address: str) -> bool:
+    """True if the IP address is globally routable (not private, loopback, link-local, ...)"""
+    ip = ipaddress.ip_address(address.split('%', 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
 class EnhancedSecurityService:
     """
     Production-ready security service addressing critical vulnerabilities:
@@ -149,10 +159,9 @@ class EnhancedSecurityService:
         Per Gemini: Use dedicated library for cron validation
         """
         try:
-            # Validate by attempting to parse
-            croniter(cron)
+            # Validate by attempting to parse (cached per expression)
+            cron_obj = cron_cache.parsed(cron)
             # Also check for reasonable intervals (not too frequent)
-            cron_obj = croniter(cron, datetime.now())
             next_run = cron_obj.get_next(datetime)
             next_next_run = cron_obj.get_next(datetime)
             
@@ -182,30 +191,73 @@ class EnhancedSecurityService:
         except Exception as e:
             return False, f"Invalid path: {str(e)}"
     
-    def validate_url(self, url: str) -> tuple[bool, Optional[str]]:
+    def validate_url(
+        self,
+        url: str,
+        allowed_schemes: Iterable[str] = ('http', 'https', 'ftps', 'sftp'),
+        resolve: bool = False
+    ) -> tuple[bool, Optional[str]]:
         """
-        Validate URL format and protocol
+        Validate URL format and protocol, and refuse internal destinations.
+        With resolve=True the hostname is looked up and every address it
+        resolves to must be public (blocking - run it off the event loop).
+        """
+        _, error = self._check_url(url, allowed_schemes, resolve)
+        return error is None, error
+    
+    def resolve_url(
+        self,
+        url: str,
+        allowed_schemes: Iterable[str] = ('http', 'https', 'ftps', 'sftp')
+    ) -> tuple[List[str], Optional[str]]:
         """
+        validate_url(resolve=True) that also returns the addresses it checked.
+        Connecting to one of those instead of resolving the host again means
+        a DNS answer that changes in between can't redirect the request to
+        an internal address (DNS rebinding). Blocking, like validate_url.
+        """
+        return self._check_url(url, allowed_schemes, True)
+    
+    def _check_url(
+        self,
+        url: str,
+        allowed_schemes: Iterable[str],
+        resolve: bool
+    ) -> tuple[List[str], Optional[str]]:
+        """(addresses checked, error or None) for validate_url / resolve_url"""
         from urllib.parse import urlparse
         
         try:
             result = urlparse(url)
             
             # Check basic structure
-            if not all([result.scheme, result.netloc]):
-                return False, "Invalid URL format"
+            if not (result.scheme and result.netloc and result.hostname):
+                return [], "Invalid URL format"
             
             # Only allow specific protocols
-            if result.scheme not in ['http', 'https', 'ftps', 'sftp']:
-                return False, f"Unsupported protocol: {result.scheme}"
+            if result.scheme not in allowed_schemes:
+                return [], f"Unsupported protocol: {result.scheme}"
             
-            # Prevent local file access
-            if result.netloc in ['localhost', '127.0.0.1', '0.0.0.0']:
-                return False, "Local URLs not allowed"
+            # Prevent local / internal network access
+            host = result.hostname
+            if host == 'localhost' or host.endswith('.localhost'):
+                return [], "Local URLs not allowed"
+            try:
+                addresses = [str(ipaddress.ip_address(host))]
+            except ValueError:
+                addresses = []
+                if resolve:
+                    try:
+                        infos = socket.getaddrinfo(host, result.port or 0, type=socket.SOCK_STREAM)
+                    except socket.gaierror as e:
+                        return [], f"Cannot resolve host {host}: {e}"
+                    addresses = [info[4][0] for info in infos]
+            if not all(_is_public_address(address) for address in addresses):
+                return [], "Private, loopback and link-local addresses are not allowed"
             
-            return True, None
+            return addresses, None
         except Exception as e:
-            return False, f"Invalid URL: {str(e)}"
+            return [], f"Invalid URL: {str(e)}"
     
     def rate_limit_check(self, key: str, limit: int, window: int) -> tuple[bool, Dict[str, Any]]:
         """
@@ -3,12 +3,13 @@ User Service
 Handles user authentication and management
 """
 
-from typing import Optional
+from typing import Optional, List
+from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from passlib.context import CryptContext
 
-from app.models.user import User
+from app.models.user import User, AuditLog
 from app.schemas.auth import UserCreate
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -36,7 +37,6 @@ class UserService:
     
     async def get_user(self, user_id: str) -> Optional[User]:
         """Get user by ID"""
-        from uuid import UUID
         # Convert string to UUID if needed
         if isinstance(user_id, str):
             try:
@@ -89,4 +89,15 @@ class UserService:
         user = await self.get_user(user_id)
         if user:
             user.last_login = datetime.utcnow()
-            await self.db.commit()
\ No newline at end of file
+            await self.db.commit()
+    
+    async def list_audit_logs(self, user_id: UUID, skip: int = 0, limit: int = 50) -> List[AuditLog]:
+        """Get a page of a user's audit log, newest first (User.audit_logs is not loadable)"""
+        result = await self.db.execute(
+            select(AuditLog)
+            .where(AuditLog.user_id == user_id)
+            .order_by(AuditLog.timestamp.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
@@ -8,10 +8,12 @@ from app.tasks import export_tasks
 from app.tasks import schedule_tasks
 from app.tasks import email_tasks
 from app.tasks import distribution_tasks
+from app.tasks import audit_tasks
 
 __all__ = [
     'export_tasks',
     'schedule_tasks',
     'email_tasks',
-    'distribution_tasks'
+    'distribution_tasks',
+    'audit_tasks'
 ]
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""
+Celery tasks for audit log maintenance
+"""
+
+import asyncio
+import logging
+
+from celery import shared_task
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.audit_service import AuditService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="app.tasks.audit_tasks.maintain_audit_partitions")
+def maintain_audit_partitions():
+    """
+    Create upcoming monthly audit_logs partitions and drop expired ones.
+    This task runs daily via Celery Beat.
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    result = loop.run_until_complete(_maintain_audit_partitions())
+    loop.close()
+    return result
+
+
+async def _maintain_audit_partitions():
+    """Async implementation of audit partition maintenance"""
+    async with AsyncSessionLocal() as db:
+        try:
+            audit_service = AuditService(db)
+            created = await audit_service.create_partitions()
+            dropped = await audit_service.cleanup_old_logs(settings.AUDIT_RETENTION_DAYS)
+            
+            logger.info(f"Audit partitions: created {created}, dropped {dropped}")
+            return {"created": created, "dropped": dropped}
+            
+        except Exception as e:
+            logger.error(f"Error maintaining audit partitions: {str(e)}")
+            return {"error": str(e)}
@@ -14,6 +14,7 @@ from sqlalchemy.orm import sessionmaker
 from asgiref.sync import async_to_sync
 
 from app.core.config import settings
+from app.core.database import json_serializer, json_deserializer
 from app.services.email_service import EmailService
 from app.services.distribution_service import DistributionService
 from app.models.schedule import ScheduleExecution
@@ -22,7 +23,10 @@ from app.models.export import Export
 logger = logging.getLogger(__name__)
 
 # Create async engine for Celery tasks
-engine = create_async_engine(str(settings.DATABASE_URL))
+engine = create_async_engine(
+    str(settings.DATABASE_URL),
+    json_serializer=json_serializer, json_deserializer=json_deserializer
+)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -4,7 +4,7 @@ Celery tasks for schedule management and execution
 
 import asyncio
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
 import uuid
 import logging
@@ -13,21 +13,25 @@ from pathlib import Path
 from celery import shared_task
 from sqlalchemy import select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-import pytz
+from sqlalchemy.orm import sessionmaker, joinedload, selectinload, raiseload
 
+from app.core import cron_cache
 from app.core.config import settings
+from app.core.database import json_serializer, json_deserializer
 from app.models.schedule import ExportSchedule, ScheduleExecution
 from app.models.export import Export
-from app.models.report import Report
 from app.services.export_service import ExportService
 from app.services.distribution_service import DistributionService
+from app.services.credential_service import credential_service
 from app.tasks.task_config import get_task_retry_delay
 
 logger = logging.getLogger(__name__)
 
 # Create async engine for Celery tasks
-engine = create_async_engine(str(settings.DATABASE_URL), echo=False)
+engine = create_async_engine(
+    str(settings.DATABASE_URL), echo=False,
+    json_serializer=json_serializer, json_deserializer=json_deserializer
+)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -55,10 +59,10 @@ async def _check_and_execute_schedules():
     async with AsyncSessionLocal() as db:
         try:
             # Find all active schedules that should run now
-            now = datetime.now(pytz.UTC)
+            now = datetime.now(timezone.utc)
             
             # Query for schedules that are due
-            query = select(ExportSchedule).where(
+            query = select(ExportSchedule).options(raiseload('*')).where(
                 and_(
                     ExportSchedule.is_active == True,
                     ExportSchedule.is_paused == False,
@@ -123,28 +127,36 @@ async def _execute_scheduled_export(schedule_id: str, task_id: str) -> Dict[str,
     async with AsyncSessionLocal() as db:
         execution = None
         try:
-            # Get the schedule
-            schedule = await db.get(ExportSchedule, schedule_id)
+            # Get the schedule with its report and (send-time only) credentials
+            result = await db.execute(
+                select(ExportSchedule)
+                .options(
+                    joinedload(ExportSchedule.report),
+                    selectinload(ExportSchedule.secret),
+                    raiseload('*')
+                )
+                .where(ExportSchedule.id == schedule_id)
+            )
+            schedule = result.scalar_one_or_none()
             if not schedule:
                 raise ValueError(f"Schedule {schedule_id} not found")
             
             # Create execution record
             execution = ScheduleExecution(
                 schedule_id=schedule_id,
-                started_at=datetime.now(pytz.UTC),
+                started_at=datetime.now(timezone.utc),
                 status="running",
                 task_id=task_id
             )
             db.add(execution)
             await db.commit()
             
-            # Get the report
-            report = await db.get(Report, schedule.report_id)
+            report = schedule.report
             if not report:
                 raise ValueError(f"Report {schedule.report_id} not found")
             
             # Create export configuration
-            export_config = schedule.export_config or {}
+            export_config = credential_service.resolve_export_config(schedule) or {}
             export_format = export_config.get("format", "excel")
             
             # Create export record
@@ -176,7 +188,7 @@ async def _execute_scheduled_export(schedule_id: str, task_id: str) -> Dict[str,
             distribution_service = DistributionService(db)
             distribution_results = await distribution_service.distribute(
                 export_id=export_id,
-                config=schedule.distribution_config,
+                config=credential_service.resolve_distribution_config(schedule),
                 schedule_name=schedule.name,
                 report_name=report.name
             )
@@ -188,7 +200,7 @@ async def _execute_scheduled_export(schedule_id: str, task_id: str) -> Dict[str,
             )
             
             # Update schedule statistics
-            schedule.update_after_execution(success=True)
+            await db.execute(schedule.record_execution(success=True))
             
             await db.commit()
             
@@ -209,7 +221,7 @@ async def _execute_scheduled_export(schedule_id: str, task_id: str) -> Dict[str,
                 )
             
             if schedule:
-                schedule.update_after_execution(success=False)
+                await db.execute(schedule.record_execution(success=False))
             
             await db.commit()
             
@@ -237,7 +249,7 @@ async def _update_next_run_times():
     async with AsyncSessionLocal() as db:
         try:
             # Get all active schedules
-            query = select(ExportSchedule).where(
+            query = select(ExportSchedule).options(raiseload('*')).where(
                 and_(
                     ExportSchedule.is_active == True,
                     ExportSchedule.is_paused == False
@@ -282,8 +294,6 @@ def test_schedule_configuration(schedule_config: Dict[str, Any], distribution_co
 async def _test_schedule_configuration(schedule_config: Dict[str, Any], distribution_config: Dict[str, Any]):
     """Async implementation of schedule configuration testing"""
     try:
-        from croniter import croniter
-        
         # Test cron expression
         cron_expr = schedule_config.get("cron")
         timezone_str = schedule_config.get("timezone", "UTC")
@@ -295,9 +305,7 @@ async def _test_schedule_configuration(schedule_config: Dict[str, Any], distribu
             }
         
         # Calculate next 5 runs
-        tz = pytz.timezone(timezone_str)
-        base_time = datetime.now(tz)
-        cron = croniter(cron_expr, base_time)
+        cron = cron_cache.parsed(cron_expr, timezone_str)
         
         next_runs = []
         for _ in range(5):
@@ -0,0 +1,153 @@
+"""
+Tests for the buffered audit writer and the audit_logs partition maintenance.
+"""
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.user import AuditLog
+from app.services.audit_service import (
+    AUDIT_DEFAULT_PARTITION,
+    AUDIT_PARTITION_PREFIX,
+    AuditService,
+    AuditWriter,
+    DEFERRED_AUDIT_KEY,
+    defer_until_commit,
+)
+
+
+@pytest.fixture
+def writer():
+    """Audit writer with the database insert mocked out, installed as the global writer"""
+    writer = AuditWriter(session_factory=Mock(), batch_size=10, flush_interval=10, max_queue_size=1)
+    writer._insert_rows = AsyncMock()
+    with patch('app.services.audit_service.audit_writer', writer):
+        yield writer
+
+
+class TestAuditWriter:
+    """Test deferring audit entries to the caller's commit."""
+
+    @pytest.mark.asyncio
+    async def test_deferred_rows_written_after_commit(self, writer):
+        """Test rows wait for the commit, then reach the writer's bulk insert."""
+        writer.max_queue_size = 10
+        writer.start()
+        row = {"action": "create_report"}
+        session = Session()
+
+        defer_until_commit(session, row=row)
+        assert writer._queue.qsize() == 0
+
+        session.commit()
+        assert writer._queue.qsize() == 1
+        assert DEFERRED_AUDIT_KEY not in session.info
+
+        await writer.stop()
+        writer._insert_rows.assert_awaited_once_with([row])
+
+    @pytest.mark.asyncio
+    async def test_deferred_rows_dropped_on_rollback(self, writer):
+        """Test a rolled-back transaction never audits its actions."""
+        writer.start()
+        session = Session()
+
+        defer_until_commit(session, row={"action": "delete_report"})
+        session.rollback()
+        assert DEFERRED_AUDIT_KEY not in session.info
+
+        # A later commit on the same session doesn't resurrect them
+        session.commit()
+        assert writer._queue.qsize() == 0
+
+        await writer.stop()
+        writer._insert_rows.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_falls_back_to_inline_insert(self, writer):
+        """Test rows are inserted in the committing transaction when the buffer is full."""
+        writer.start()
+        assert writer.submit(row={"action": "login"})
+        row = {"action": "create_report"}
+        session = Session()
+
+        defer_until_commit(session, row=row)
+        with patch.object(session, 'execute') as mock_execute:
+            session.commit()
+
+        mock_execute.assert_called_once()
+        assert mock_execute.call_args[0][1] == [row]
+        # Nothing was queued on top of the full buffer
+        assert writer._queue.qsize() == 1
+
+        await writer.stop()
+        writer._insert_rows.assert_awaited_once_with([{"action": "login"}])
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_buffer(self, writer):
+        """Test stopping the writer writes out everything still queued."""
+        writer.max_queue_size = 10
+        writer.start()
+        rows = [{"action": f"action_{i}"} for i in range(3)]
+        for row in rows:
+            assert writer.submit(row=row)
+
+        await writer.stop()
+
+        writer._insert_rows.assert_awaited_once_with(rows)
+        assert not writer.running
+        assert not writer.submit(row={"action": "late"})
+
+
+async def _partition_of(db: AsyncSession, action: str) -> str:
+    result = await db.execute(
+        text("SELECT tableoid::regclass::text FROM audit_logs WHERE action = :action"),
+        {"action": action}
+    )
+    return result.scalar()
+
+
+class TestAuditPartitions:
+    """Test monthly partition maintenance on a metadata-built audit_logs."""
+
+    @pytest.mark.asyncio
+    async def test_create_partitions_moves_rows_out_of_default(self, db_session: AsyncSession):
+        """Test creating the current month's partition when the default one already holds its rows."""
+        db_session.add(AuditLog(action="current_month", timestamp=datetime.utcnow()))
+        await db_session.commit()
+        assert await _partition_of(db_session, "current_month") == AUDIT_DEFAULT_PARTITION
+
+        service = AuditService(db_session)
+        assert await service.create_partitions(months_ahead=1) == 2
+
+        current = f"{AUDIT_PARTITION_PREFIX}{datetime.utcnow():%Y%m}"
+        assert await _partition_of(db_session, "current_month") == current
+        assert await service._has_default_partition()
+        # Already there: nothing to create on the next run
+        assert await service.create_partitions(months_ahead=1) == 0
+
+    @pytest.mark.asyncio
+    async def test_cleanup_drops_expired_partitions_and_default_rows(self, db_session: AsyncSession):
+        """Test retention drops expired monthly partitions and expired rows in the default one."""
+        await db_session.execute(text(
+            f"CREATE TABLE {AUDIT_PARTITION_PREFIX}200001 PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('2000-01-01') TO ('2000-02-01')"
+        ))
+        now = datetime.utcnow()
+        db_session.add_all([
+            AuditLog(action="expired_partitioned", timestamp=datetime(2000, 1, 15)),
+            AuditLog(action="expired_default", timestamp=datetime(2001, 6, 1)),
+            AuditLog(action="recent", timestamp=now - timedelta(days=1)),
+        ])
+        await db_session.commit()
+
+        service = AuditService(db_session)
+        assert await service.cleanup_old_logs(retention_days=365) == 1
+
+        result = await db_session.execute(text("SELECT action FROM audit_logs"))
+        assert list(result.scalars()) == ["recent"]
+        assert [name for name, _ in await service._list_partitions()] == []
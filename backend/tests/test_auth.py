@@ -114,7 +114,29 @@ class TestAuthentication:
         assert data["username"] == test_user.username
         assert data["full_name"] == test_user.full_name
         assert "hashed_password" not in data
-    
+
+    @pytest.mark.asyncio
+    async def test_get_my_audit_logs(self, client: AsyncClient, auth_headers: dict, db_session: AsyncSession, test_user: User):
+        """Test reading the current user's audit history, newest first."""
+        from app.models.user import AuditLog
+
+        now = datetime.utcnow()
+        db_session.add_all([
+            AuditLog(user_id=test_user.id, action="create_report", timestamp=now - timedelta(minutes=5)),
+            AuditLog(user_id=test_user.id, action="delete_report", timestamp=now)
+        ])
+        await db_session.commit()
+
+        response = await client.get(
+            "/api/v1/auth/me/audit-logs",
+            params={"limit": 1},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [entry["action"] for entry in data] == ["delete_report"]
+
     @pytest.mark.asyncio
     async def test_get_current_user_no_token(self, client: AsyncClient):
         """Test accessing protected endpoint without token."""
@@ -19,7 +19,7 @@ from app.main import app
 from app.core.config import settings
 from app.models.user import User
 from app.models.report import Report
-from app.models.schedule import ExportSchedule, ScheduleExecution
+from app.models.schedule import ExportSchedule, ScheduleExecution, ScheduleSecret
 from app.core.security import get_password_hash
 from app.core.auth import create_access_token
 
@@ -480,6 +480,57 @@ class TestScheduleAPIFunctionality:
         assert schedule is not None
         assert schedule.name == "Daily Report"
     
+    async def test_create_schedule_stores_credentials_encrypted(
+        self, test_client: AsyncClient, test_db: AsyncSession, test_users, test_report
+    ):
+        """Test that webhook auth and export passwords go to schedule_secrets, not the schedule row."""
+        from app.services.credential_service import credential_service, REDACTED
+        
+        schedule_data = {
+            "report_id": str(test_report.id),
+            "name": "Webhook Schedule",
+            "schedule_config": {
+                "frequency": "daily",
+                "cron_expression": "0 9 * * *",
+                "timezone": "UTC"
+            },
+            "distribution_config": {
+                "webhook": {
+                    "url": "https://hooks.example.com/boe",
+                    "auth_type": "bearer",
+                    "auth_value": "webhook-token-123"
+                }
+            },
+            "export_config": {"format": "csv", "password_protect": True, "password": "zip-pass"}
+        }
+        
+        response = await test_client.post(
+            "/api/v1/schedules/",
+            json=schedule_data,
+            headers={"Authorization": f"Bearer {test_users['owner'].token}"}
+        )
+        
+        assert response.status_code == 201
+        data = response.json()
+        assert data["distribution_config"]["webhook"].get("auth_value") in (None, REDACTED)
+        assert data["export_config"].get("password") in (None, REDACTED)
+        assert "webhook-token-123" not in response.text
+        assert "zip-pass" not in response.text
+        
+        # Not on the schedule row
+        schedule = await test_db.get(ExportSchedule, data["id"])
+        assert "auth_value" not in schedule.distribution_config["webhook"]
+        assert "password" not in schedule.export_config
+        
+        # Encrypted in schedule_secrets
+        secret = await test_db.get(ScheduleSecret, schedule.id)
+        assert secret is not None
+        assert "webhook-token-123" not in secret.secret
+        assert credential_service.decrypt_credentials(secret.secret) == {
+            "distribution": {"webhook": {"auth_value": "webhook-token-123"}},
+            "export": {"password": "zip-pass"}
+        }
+    
     async def test_create_schedule_with_invalid_cron(
         self, test_client: AsyncClient, test_users, test_report
     ):
@@ -3,6 +3,8 @@ Comprehensive unit tests for Phase 5 scheduling functionality.
 Tests cover schedule CRUD, distribution, and execution logic.
 """
 
+import errno
+import os
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock, AsyncMock
@@ -29,7 +31,7 @@ from app.api.schedule.schedule import (
     delete_schedule, pause_schedule, resume_schedule,
     test_schedule, get_schedule_history
 )
-from app.services.distribution_service import DistributionService
+from app.services.distribution_service import DistributionService, _compile_filename_pattern, _fast_copy, _pin_address
 from app.tasks.schedule_tasks import check_and_execute_schedules, execute_scheduled_report
 
 
@@ -368,6 +370,105 @@ class TestDistributionService:
         assert mock_sleep.call_count == 2  # Sleep between retries
 
 
+
+class TestLocalCopy:
+    """Test claiming the target file and copying an export into it."""
+    
+    @pytest.fixture
+    def source_file(self, tmp_path):
+        """Create an export file to copy."""
+        source = tmp_path / "source.csv"
+        source.write_bytes(b"a,b\n1,2\n")
+        return source
+    
+    def test_open_target_adds_counter_when_file_exists(self, tmp_path):
+        """Test that an existing file gets a numbered sibling instead of being replaced."""
+        (tmp_path / "report.csv").write_text("first")
+        (tmp_path / "report_1.csv").write_text("second")
+        
+        target_path, fd = DistributionService._open_target(tmp_path, "report.csv", overwrite=False)
+        os.close(fd)
+        
+        assert target_path == tmp_path / "report_2.csv"
+        assert (tmp_path / "report.csv").read_text() == "first"
+        assert (tmp_path / "report_1.csv").read_text() == "second"
+    
+    def test_open_target_overwrite_truncates(self, tmp_path, source_file):
+        """Test that overwrite reuses the name and leaves no bytes of the old, longer file."""
+        target = tmp_path / "report.csv"
+        target.write_bytes(b"x" * 100)
+        
+        target_path, size = DistributionService._copy_to_local(source_file, tmp_path, "report.csv", overwrite=True)
+        
+        assert target_path == target
+        assert size == len(source_file.read_bytes())
+        assert target.read_bytes() == source_file.read_bytes()
+    
+    def test_fast_copy_without_sendfile(self, tmp_path, source_file):
+        """Test the buffered copy used where sendfile isn't available."""
+        target = tmp_path / "copy.csv"
+        fd = os.open(target, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            with patch('app.services.distribution_service._USE_SENDFILE', False), \
+                 patch('os.sendfile') as mock_sendfile:
+                copied = _fast_copy(source_file, fd)
+        finally:
+            os.close(fd)
+        
+        mock_sendfile.assert_not_called()
+        assert copied == len(source_file.read_bytes())
+        assert target.read_bytes() == source_file.read_bytes()
+    
+    def test_fast_copy_falls_back_when_sendfile_unsupported(self, tmp_path, source_file):
+        """Test that a filesystem rejecting sendfile falls back to the buffered copy."""
+        target = tmp_path / "copy.csv"
+        fd = os.open(target, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            with patch('app.services.distribution_service._USE_SENDFILE', True), \
+                 patch('os.sendfile', side_effect=OSError(errno.EINVAL, "Invalid argument")):
+                copied = _fast_copy(source_file, fd)
+        finally:
+            os.close(fd)
+        
+        assert copied == len(source_file.read_bytes())
+        assert target.read_bytes() == source_file.read_bytes()
+
+
+class TestFilenamePattern:
+    """Test compiling and rendering distribution filename patterns."""
+    
+    values = dict(report_name="Quarterly", schedule_name="Daily", timestamp="20240102_030405", format="csv", date="2024-01-02")
+    
+    def test_renders_plain_fields(self):
+        """Test that plain {field} patterns render like str.format."""
+        pattern = "{report_name}_{timestamp}.{format}"
+        
+        render = _compile_filename_pattern(pattern)
+        
+        assert render is not pattern.format
+        assert render(**self.values) == "Quarterly_20240102_030405.csv"
+        assert render(**self.values) == pattern.format(**self.values)
+        assert _compile_filename_pattern("static.csv")(**self.values) == "static.csv"
+    
+    def test_unknown_placeholder_raises(self):
+        """Test that an unknown field fails the same way str.format does."""
+        render = _compile_filename_pattern("{report_name}_{owner}.csv")
+        
+        with pytest.raises(KeyError, match="owner"):
+            render(**self.values)
+    
+    @pytest.mark.parametrize("pattern,expected", [
+        ("{report_name:.3}_{date}.csv", "Qua_2024-01-02.csv"),
+        ("{report_name!r}.csv", "'Quarterly'.csv"),
+        ("{date[0]}_{report_name}.csv", "2_Quarterly.csv"),
+    ])
+    def test_falls_back_to_str_format(self, pattern, expected):
+        """Test that format specs, conversions and indexing use str.format."""
+        render = _compile_filename_pattern(pattern)
+        
+        assert render == pattern.format
+        assert render(**self.values) == expected
+
 class TestScheduleTasks:
     """Test Celery schedule tasks."""
     
@@ -474,6 +575,15 @@ class TestScheduleTasks:
         assert execution.status == "failed"
         assert "Export failed" in execution.error_message
 
+    def test_beat_schedule_tasks_are_registered(self):
+        """Test that every periodic task in the beat schedule is registered."""
+        import app.tasks  # noqa: F401 - registers the task modules
+        from app.core.celery_app import celery_app
+
+        assert "app.tasks.audit_tasks.maintain_audit_partitions" in celery_app.tasks
+        for entry in celery_app.conf.beat_schedule.values():
+            assert entry["task"] in celery_app.tasks
+
 
 class TestEnhancedSecurity:
     """Test enhanced security service."""
@@ -559,6 +669,163 @@ class TestEnhancedSecurity:
         assert security_service.validate_cron("60 * * * *") == False  # Invalid minute
         assert security_service.validate_cron("* * * *") == False  # Too few fields
 
+    def test_validate_url_rejects_internal_addresses(self, security_service):
+        """Test that webhook-style URLs cannot target internal hosts."""
+        schemes = ("http", "https")
+        assert security_service.validate_url("https://8.8.8.8/hook", schemes, True)[0] == True
+
+        assert security_service.validate_url("http://localhost:8000/", schemes, True)[0] == False
+        assert security_service.validate_url("http://127.0.0.2/", schemes, True)[0] == False
+        assert security_service.validate_url("http://10.0.0.5/", schemes, True)[0] == False
+        assert security_service.validate_url("http://169.254.169.254/latest", schemes, True)[0] == False
+        assert security_service.validate_url("http://[::1]/", schemes, True)[0] == False
+        assert security_service.validate_url("ftp://8.8.8.8/", schemes, True)[0] == False
+
+    def test_resolve_url_returns_checked_addresses(self, security_service):
+        """Test that resolve_url hands back the addresses it validated, and none on rejection."""
+        schemes = ("http", "https")
+        public = [(2, 1, 6, "", ("93.184.216.34", 443))]
+        with patch('socket.getaddrinfo', return_value=public):
+            assert security_service.resolve_url("https://hooks.example.com/x", schemes) == (["93.184.216.34"], None)
+        
+        internal = public + [(2, 1, 6, "", ("10.0.0.5", 443))]
+        with patch('socket.getaddrinfo', return_value=internal):
+            addresses, error = security_service.resolve_url("https://hooks.example.com/x", schemes)
+        assert addresses == []
+        assert error is not None
+
+    def test_pin_address_keeps_host_and_tls_name(self):
+        """Test that a webhook request connects to the checked address but still names the original host."""
+        headers = {}
+        target, extensions = _pin_address("https://hooks.example.com:8443/in?a=1", "93.184.216.34", headers)
+        
+        assert str(target) == "https://93.184.216.34:8443/in?a=1"
+        assert headers["Host"] == "hooks.example.com:8443"
+        assert extensions == {"sni_hostname": "hooks.example.com"}
+        
+        headers = {}
+        target, extensions = _pin_address("http://hooks.example.com/in", "2606:2800:220:1::1", headers)
+        assert target.host == "2606:2800:220:1::1"
+        assert headers["Host"] == "hooks.example.com"
+        assert extensions == {}
+
+
+class TestCredentialService:
+    """Test credential encryption in the credential service."""
+    
+    @pytest.fixture
+    def credential_service(self):
+        """Create credential service instance."""
+        from app.services.credential_service import CredentialService
+        return CredentialService()
+    
+    def test_encrypt_decrypt_round_trip(self, credential_service):
+        """Test credentials survive an encrypt/decrypt round trip."""
+        original = {"smtp_user": "user@example.com", "smtp_password": "secret"}
+        
+        encrypted = credential_service.encrypt_credentials(original)
+        
+        assert "secret" not in encrypted
+        assert credential_service.decrypt_credentials(encrypted) == original
+    
+    def test_decrypt_fernet_layout(self, credential_service):
+        """Test version 1 (HKDF-keyed Fernet) records still decrypt."""
+        import base64
+        import secrets
+        
+        original = {"smtp_password": "v1-secret"}
+        salt = secrets.token_bytes(16)
+        cipher = credential_service._get_fernet_cipher_suite(salt)
+        token = cipher.encrypt(json.dumps(original).encode())
+        encrypted = base64.urlsafe_b64encode(b"\x01" + salt + token).decode()
+        
+        assert credential_service.decrypt_credentials(encrypted) == original
+    
+    def test_decrypt_legacy_layout(self, credential_service):
+        """Test records written before the versioned layout still decrypt."""
+        import base64
+        import secrets
+        
+        original = {"api_key": "legacy-key"}
+        salt = secrets.token_bytes(16)
+        cipher = credential_service._get_legacy_cipher_suite(salt)
+        legacy = base64.urlsafe_b64encode(salt + cipher.encrypt(json.dumps(original).encode())).decode()
+        
+        assert credential_service.decrypt_credentials(legacy) == original
+    
+    def test_split_and_sanitize_webhook_auth(self, credential_service):
+        """Test webhook auth_value is split out of the config and redacted when inline."""
+        from app.services.credential_service import REDACTED
+        
+        config = {"webhook": {"url": "https://hooks.example.com", "auth_type": "bearer", "auth_value": "tok"}}
+        public, secrets_by_channel = credential_service.split_distribution_secrets(config)
+        
+        assert public == {"webhook": {"url": "https://hooks.example.com", "auth_type": "bearer"}}
+        assert secrets_by_channel == {"webhook": {"auth_value": "tok"}}
+        assert credential_service.merge_distribution_secrets(public, secrets_by_channel) == config
+        assert credential_service.sanitize_distribution_config(config)["webhook"]["auth_value"] == REDACTED
+        
+        # Unset credentials leave nothing to store
+        _, secrets_by_channel = credential_service.split_distribution_secrets(
+            {"webhook": {"url": "https://hooks.example.com", "auth_value": None}}
+        )
+        assert secrets_by_channel == {}
+    
+    def test_split_export_password(self, credential_service):
+        """Test the export password is split out of export_config."""
+        public, export_secrets = credential_service.split_export_secrets(
+            {"format": "csv", "password_protect": True, "password": "zip-pass"}
+        )
+        
+        assert public == {"format": "csv", "password_protect": True}
+        assert export_secrets == {"password": "zip-pass"}
+
+
+class TestCronCache:
+    """Test the parsed cron expression cache."""
+
+    def test_parsed_returns_independent_iterators(self):
+        """Cached templates must not share iteration state between callers."""
+        from app.core import cron_cache
+        cron_cache.clear_cache()
+
+        start = pytz.UTC.localize(datetime(2025, 1, 1, 0, 0))
+        first = cron_cache.parsed("0 9 * * *", "UTC", start)
+        second = cron_cache.parsed("0 9 * * *", "UTC", start)
+
+        assert first.get_next(datetime) == pytz.UTC.localize(datetime(2025, 1, 1, 9, 0))
+        assert first.get_next(datetime) == pytz.UTC.localize(datetime(2025, 1, 2, 9, 0))
+        # The second iterator is unaffected by the first one advancing
+        assert second.get_next(datetime) == pytz.UTC.localize(datetime(2025, 1, 1, 9, 0))
+        assert cron_cache._parsed_template.cache_info().misses == 1
+
+    def test_parsed_localizes_naive_start_time(self):
+        """Naive start times are interpreted in the schedule's timezone."""
+        from app.core import cron_cache
+
+        cron = cron_cache.parsed("0 9 * * *", "America/New_York", datetime(2025, 1, 1, 0, 0))
+        next_run = cron.get_next(datetime)
+
+        assert next_run.tzinfo is not None
+        assert (next_run.hour, next_run.day) == (9, 1)
+
+    def test_parsed_rejects_invalid_expression(self):
+        """Invalid expressions raise and are not cached."""
+        from app.core import cron_cache
+
+        with pytest.raises(Exception):
+            cron_cache.parsed("60 * * * *")
+
+    def test_is_valid_caches_result(self):
+        """Syntax checks are memoized per expression."""
+        from app.core import cron_cache
+        cron_cache.clear_cache()
+
+        assert cron_cache.is_valid("*/5 * * * *")
+        assert cron_cache.is_valid("*/5 * * * *")
+        assert not cron_cache.is_valid("not a cron")
+        assert cron_cache.is_valid.cache_info().hits == 1
+
 
 class TestCacheService:
     """Test enhanced cache service."""
@@ -636,6 +903,45 @@ class TestCacheService:
         assert all("user123" in key for key in deleted_keys)
 
 
+class TestLocalCacheLayer:
+    """Test the in-process L1 in front of Redis in the plain cache service."""
+    
+    @pytest.fixture
+    def cache_service(self):
+        """Create cache service instance with a mocked Redis client."""
+        from app.services.cache_service import CacheService
+        service = CacheService()
+        service._redis_client = AsyncMock()
+        return service
+    
+    @pytest.mark.asyncio
+    async def test_l1_holds_round_tripped_copy(self, cache_service):
+        """Test that L1 hits return the same shape as Redis reads, not the caller's object."""
+        created = datetime(2024, 1, 2, 3, 4, 5)
+        value = {"created_at": created, "tags": ["a"]}
+        assert await cache_service.set("report:1", value, ttl=60)
+        value["tags"].append("b")
+
+        cached = await cache_service.get("report:1")
+        assert cached == {"created_at": "2024-01-02T03:04:05", "tags": ["a"]}
+        cache_service._redis_client.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_schedule_cache_skips_l1(self):
+        """Test schedule lists are always read from Redis, so other workers' invalidations apply."""
+        from app.services.cache_service import ScheduleCacheService
+        service = ScheduleCacheService()
+        service._redis_client = AsyncMock()
+        service._redis_client.get.return_value = b'{"schedules":[],"total":0}'
+
+        await service.cache_schedule_list("user123", 0, 20, [], 0)
+        cached = await service.get_cached_schedule_list("user123", 0, 20)
+
+        assert cached == {"schedules": [], "total": 0}
+        service._redis_client.get.assert_awaited_once_with("schedules:list:user123:0:20")
+        assert not service._local_cache
+
+
 class TestReliableTasks:
     """Test reliable task execution with retries and DLQ."""
     